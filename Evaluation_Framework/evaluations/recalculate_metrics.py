@@ -5,53 +5,83 @@ import argparse
 import json
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Any
 
 # Add src to path
 sys.path.append(os.path.join(os.path.dirname(__file__), ''))
 
-from src.metrics.metrics import calculate_metrics
+from src.metrics.metrics import calculate_metrics, MetricsAggregator
+from src.utils.results_io import iter_results, read_metrics, write_metrics
 
 
-def find_result_files(directory: str) -> List[Path]:
-    """Find all result JSON files in directory."""
-    result_files = []
-
-    for root, dirs, files in os.walk(directory):
-        for file in files:
-            if file.endswith('_results.json'):
-                result_files.append(Path(root) / file)
-
+def find_result_files(directory: str, pattern: str = '*_results.json*') -> List[Path]:
+    """Find all result files (JSON or JSONL) in directory."""
+    result_files = [
+        path for path in Path(directory).rglob(pattern)
+        if path.suffix in ('.json', '.jsonl')
+    ]
     return sorted(result_files)
 
 
 def process_file(file_path: Path, metrics_list: List[str], update: bool = True) -> Dict[str, Any]:
     """Process a single result file."""
-    print(f"\nProcessing: {file_path}")
+    # Collect the report and print it at once so parallel workers don't interleave lines
+    report = [f"\nProcessing: {file_path}"]
+    try:
+        if file_path.suffix == '.jsonl':
+            metrics = _process_jsonl(file_path, metrics_list, update, report)
+        else:
+            metrics = _process_json(file_path, metrics_list, update, report)
+    except Exception as e:
+        report.append(f"  Error: {e}")
+        metrics = {}
+    print('\n'.join(report), flush=True)
+    return metrics
+
+
+def _process_jsonl(file_path: Path, metrics_list: List[str], update: bool, report: List[str]) -> Dict[str, Any]:
+    """Stream a JSONL result file line by line; memory does not depend on the file size."""
+    aggregator = MetricsAggregator(metrics_list)
+    aggregator.update(iter_results(str(file_path)))
+
+    if aggregator.num_results == 0:
+        report.append(f"  Warning: Empty results in {file_path}")
+        return {}
+
+    metrics = aggregator.result()
+    stored = read_metrics(str(file_path)) or {}
+    dataset_name = stored.get('dataset', file_path.name[:-len('_results.jsonl')])
+
+    _report_metrics(report, dataset_name, aggregator.num_results, metrics)
+
+    if update:
+        write_metrics(str(file_path), dataset_name, aggregator.num_results, metrics)
+        _report_changes(report, stored.get('metrics', {}), metrics)
+
+    return metrics
 
-    # Load data
+
+def _process_json(file_path: Path, metrics_list: List[str], update: bool, report: List[str]) -> Dict[str, Any]:
+    """Legacy single-document result file; loaded whole since it is rewritten in place."""
     with open(file_path, 'r') as f:
         data = json.load(f)
 
     # Get results
     if 'results' not in data:
-        print(f"  Warning: No 'results' field found in {file_path}")
+        report.append(f"  Warning: No 'results' field found in {file_path}")
         return {}
 
     results = data['results']
     if not results:
-        print(f"  Warning: Empty results in {file_path}")
+        report.append(f"  Warning: Empty results in {file_path}")
         return {}
 
     # Calculate metrics
     metrics = calculate_metrics(results, metrics_list)
 
-    # Print metrics
-    print(f"  Dataset: {data.get('dataset', 'unknown')}")
-    print(f"  Samples: {len(results)}")
-    for metric, value in metrics.items():
-        print(f"  {metric:20s}: {value:.4f}")
+    _report_metrics(report, data.get('dataset', 'unknown'), len(results), metrics)
 
     # Update file if requested
     if update:
@@ -62,17 +92,27 @@ def process_file(file_path: Path, metrics_list: List[str], update: bool = True)
         with open(file_path, 'w') as f:
             json.dump(data, f, indent=2)
 
-        # Report changes
-        if old_metrics:
-            print("  Changes:")
-            for metric, new_value in metrics.items():
-                old_value = old_metrics.get(metric, 0.0)
-                if abs(new_value - old_value) > 0.0001:
-                    print(f"    {metric}: {old_value:.4f} -> {new_value:.4f}")
+        _report_changes(report, old_metrics, metrics)
 
     return metrics
 
 
+def _report_metrics(report: List[str], dataset_name: str, num_samples: int, metrics: Dict[str, float]):
+    report.append(f"  Dataset: {dataset_name}")
+    report.append(f"  Samples: {num_samples}")
+    for metric, value in metrics.items():
+        report.append(f"  {metric:20s}: {value:.4f}")
+
+
+def _report_changes(report: List[str], old_metrics: Dict[str, float], metrics: Dict[str, float]):
+    if old_metrics:
+        report.append("  Changes:")
+        for metric, new_value in metrics.items():
+            old_value = old_metrics.get(metric, 0.0)
+            if abs(new_value - old_value) > 0.0001:
+                report.append(f"    {metric}: {old_value:.4f} -> {new_value:.4f}")
+
+
 def main():
     """Main function."""
     parser = argparse.ArgumentParser(description='Batch recalculate metrics for evaluation results')
@@ -82,8 +122,10 @@ def main():
                        help='Metrics to calculate (default: exact_match f1)')
     parser.add_argument('--no-update', action='store_true',
                        help='Do not update files, only print metrics')
-    parser.add_argument('--pattern', default='*_results.json',
-                       help='File pattern to match (default: *_results.json)')
+    parser.add_argument('--pattern', default='*_results.json*',
+                       help='File pattern to match (default: *_results.json*, i.e. JSON and JSONL)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                       help='Files processed in parallel (default: CPU count)')
 
     args = parser.parse_args()
 
@@ -95,7 +137,7 @@ def main():
         process_file(path, args.metrics, update)
     elif path.is_dir():
         # Process directory
-        result_files = find_result_files(path)
+        result_files = find_result_files(path, args.pattern)
 
         if not result_files:
             print(f"No result files found in {path}")
@@ -105,8 +147,16 @@ def main():
         print("=" * 60)
 
         all_metrics = {}
-        for file_path in result_files:
-            metrics = process_file(file_path, args.metrics, update)
+        workers = max(1, min(args.workers, len(result_files)))
+        if workers == 1:
+            file_metrics = [process_file(file_path, args.metrics, update) for file_path in result_files]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                file_metrics = list(executor.map(
+                    process_file, result_files,
+                    [args.metrics] * len(result_files), [update] * len(result_files)
+                ))
+        for file_path, metrics in zip(result_files, file_metrics):
             if metrics:
                 all_metrics[str(file_path)] = metrics
 
@@ -22,8 +22,10 @@ from src.search.tag_search import TagBasedSearch
 from src.search.function_search import FunctionSearchHandler
 from src.inference.tag_based_inference import TagBasedInference
 from src.inference.function_inference import FunctionInference
-from src.metrics.metrics import calculate_metrics
-from src.utils.thread_manager import MultiThreadEvaluator, BatchProcessor
+from src.metrics.metrics import MetricsAggregator
+from src.utils.thread_manager import MultiThreadEvaluator, BatchProcessor, build_result, iter_checkpoint, load_checkpoint, open_checkpoint
+from src.utils.async_evaluator import AsyncEvaluator
+from src.utils.results_io import RESULTS_FORMATS, results_path, write_json_results, write_results, write_metrics
 
 
 def load_config(config_dir: str) -> Dict[str, Any]:
@@ -143,6 +145,10 @@ def main():
     parser.add_argument('--max_workers', type=int, default=4, help='Maximum number of worker threads')
     parser.add_argument('--use_multithreading', action='store_true', help='Enable multi-threading')
     parser.add_argument('--disable_multithreading', action='store_true', help='Disable multi-threading (default)')
+    parser.add_argument('--use_async', action='store_true', help='Use the asyncio evaluation engine (takes precedence over threads)')
+    parser.add_argument('--max_concurrency', type=int, default=None, help='Questions in flight for the asyncio engine (overrides config)')
+    parser.add_argument('--results_format', choices=RESULTS_FORMATS, default=None,
+                        help='jsonl: streamed {dataset}_results.jsonl + {dataset}_metrics.json; json: single {dataset}_results.json (overrides config)')
 
     args = parser.parse_args()
 
@@ -175,10 +181,20 @@ def main():
     
     max_workers = args.max_workers if args.max_workers != 4 else config_max_workers
 
+    # Asyncio engine: one shared model / search client, concurrency bounded per endpoint
+    evaluation_config = configs['datasets'].get('evaluation', {})
+    use_async = args.use_async or evaluation_config.get('use_async', False)
+    max_concurrency = args.max_concurrency or evaluation_config.get('max_concurrency', 32)
+    if use_async:
+        use_multithreading = False
+    results_format = args.results_format or evaluation_config.get('results_format', 'jsonl')
+
     print(f"Checkpoint every: {checkpoint_every} examples")
     print(f"Multi-threading: {'Enabled' if use_multithreading else 'Disabled'}")
     if use_multithreading:
         print(f"Max workers: {max_workers}")
+    if use_async:
+        print(f"Async engine: max concurrency {max_concurrency}")
 
     print(f"Model: {model_name}")
     print(f"Method: {search_method}")
@@ -235,8 +251,32 @@ def main():
 
         print(f"Loaded {len(data)} examples")
 
-        # Evaluate using multi-threading or single-threading
-        if use_multithreading:
+        # Results stream into the metrics as they complete; the transcripts themselves are
+        # only kept in the checkpoint and read back lazily for the result file
+        aggregator = MetricsAggregator(dataset_config['metrics'])
+
+        # Evaluate using the asyncio engine, multi-threading or single-threading
+        if use_async:
+            evaluator = AsyncEvaluator(
+                model=model,
+                search_handler=search_handler,
+                prompt_config=prompt_config,
+                search_method=search_method,
+                max_concurrency=max_concurrency,
+                model_concurrency=evaluation_config.get('model_concurrency'),
+                search_concurrency=evaluation_config.get('search_concurrency'),
+                checkpoint_every=checkpoint_every
+            )
+
+            checkpoint_file = evaluator.evaluate_dataset(
+                dataset_name=dataset_name,
+                data=data,
+                output_dir=run_dir,
+                resume_from_checkpoint=True,
+                on_result=aggregator.add
+            )
+
+        elif use_multithreading:
             print(f"Using multi-threading with {max_workers} workers...")
             
             # Create multi-threaded evaluator
@@ -250,84 +290,59 @@ def main():
             )
             
             # Evaluate dataset
-            results = evaluator.evaluate_dataset(
+            checkpoint_file = evaluator.evaluate_dataset(
                 dataset_name=dataset_name,
                 data=data,
                 output_dir=run_dir,
-                resume_from_checkpoint=True
+                resume_from_checkpoint=True,
+                on_result=aggregator.add
             )
             
         else:
             print("Using single-threading...")
     
             # Single-threaded evaluation (original logic)
-            results = []
             checkpoint_file = os.path.join(run_dir, f"{dataset_name}_checkpoint.jsonl")
 
             # Load checkpoint if exists
-            if os.path.exists(checkpoint_file):
-                with open(checkpoint_file, 'r') as f:
-                    for line in f:
-                        results.append(json.loads(line))
-                print(f"Resumed from checkpoint: {len(results)} completed")
-
-            for i in tqdm(range(len(results), len(data)), desc=f"Evaluating {dataset_name}"):
-                item = data[i]
-
-                # Evaluate
-                result = evaluate_single(
-                    item['question'],
-                    model,
-                    search_handler,
-                    prompt_config,
-                    search_method
-                )
-
-                # Add metadata
-                # Simplified result format
-                simplified_result = {
-                    'id': item['id'],
-                    'question': item['question'],
-                    'gold_answer': item['answers'][0] if item['answers'] else '',  # Use first answer as gold
-                    'prediction': result.get('answer', '')
-                }
-
-                # Add method-specific data
-                if search_method == 'tag':
-                    simplified_result['response'] = result.get('response', '')
-                elif search_method == 'function':
-                    simplified_result['messages'] = result.get('messages', [])
-
-                result = simplified_result
-
-                results.append(result)
-
-                # Save checkpoint
-                if (i + 1) % checkpoint_every == 0:
-                    with open(checkpoint_file, 'a') as f:
-                        for r in results[-checkpoint_every:]:
-                            f.write(json.dumps(r) + '\n')
-                    print(f"\nCheckpoint saved at {i + 1}")
-
-            # Save final checkpoint
-            with open(checkpoint_file, 'w') as f:
-                for r in results:
-                    f.write(json.dumps(r) + '\n')
-
-        # Calculate metrics
-        metrics = calculate_metrics(results, dataset_config['metrics'])
-
-        # Save results
-        dataset_results = {
-            'dataset': dataset_name,
-            'num_examples': len(results),
-            'metrics': metrics,
-            'results': results
-        }
-
-        # Save detailed results
-        with open(os.path.join(run_dir, f"{dataset_name}_results.json"), 'w') as f:
-            json.dump(dataset_results, f, indent=2)
+            completed = load_checkpoint(checkpoint_file, aggregator.add, {item['id'] for item in data})
+            if completed:
+                print(f"Resumed from checkpoint: {len(completed)} completed")
+
+            with open_checkpoint(checkpoint_file) as f:
+                remaining = [item for item in data if item['id'] not in completed]
+                for i, item in enumerate(tqdm(remaining, desc=f"Evaluating {dataset_name}")):
+                    # Evaluate
+                    result = evaluate_single(
+                        item['question'],
+                        model,
+                        search_handler,
+                        prompt_config,
+                        search_method
+                    )
+
+                    # Simplified result format (first answer as gold, method-specific transcript)
+                    result = build_result(item, result, search_method)
+                    aggregator.add(result)
+                    f.write(json.dumps(result, ensure_ascii=False) + '\n')
+
+                    # Save checkpoint
+                    if (i + 1) % checkpoint_every == 0:
+                        f.flush()
+                        os.fsync(f.fileno())
+                        print(f"\nCheckpoint saved at {len(completed) + i + 1}")
+
+        metrics = aggregator.result()
+        num_examples = aggregator.num_results
+        result_file = results_path(run_dir, dataset_name, results_format)
+        results = iter_checkpoint(checkpoint_file, data)
+        if results_format == 'jsonl':
+            # Stream results one per line, in dataset order
+            write_results(result_file, results)
+            write_metrics(result_file, dataset_name, num_examples, metrics)
+        else:
+            # Save detailed results
+            write_json_results(result_file, dataset_name, num_examples, metrics, results)
 
         all_results[dataset_name] = metrics
 
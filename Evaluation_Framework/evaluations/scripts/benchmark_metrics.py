@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Benchmark and equivalence check: per-item EM/F1 functions vs. the batch metrics engine.
+
+Run from the Evaluation_Framework root:
+    python evaluations/scripts/benchmark_metrics.py --num_items 20000 --answers_per_item 1 20 --runs 10
+    python evaluations/scripts/benchmark_metrics.py --results evaluations/results
+
+Every item's EM / F1 / search counts from the batch engine are checked for exact
+equality against exact_match, f1_score and extract_search_stats; the script exits
+non-zero on any mismatch.
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.metrics.metrics import (
+    exact_match, f1_score, extract_search_stats, ground_truths_of, item_search_stats,
+    analyze_answer, count_search_tags, batch_scores, batch_search_stats, calculate_metrics, MetricsAggregator
+)
+from src.utils.results_io import iter_results
+
+
+WORDS = (
+    "the a an of in new york city paris london barack obama united states 1990 1999 river "
+    "king queen john smith war world first second film album song band football club"
+).split()
+PUNCTUATION = ["", "", "", ",", ".", "!", "'s", "?"]
+
+
+def random_answer(rng: random.Random, max_words: int = 5) -> str:
+    words = [rng.choice(WORDS) + rng.choice(PUNCTUATION) for _ in range(rng.randint(1, max_words))]
+    text = ' '.join(words)
+    return text.title() if rng.random() < 0.3 else text
+
+
+def synthetic_results(num_items: int, answers_per_item: int, seed: int = 0):
+    """Result items with `ground_truths`, predictions that often match, and tag / function transcripts."""
+    rng = random.Random(seed)
+    results = []
+    for i in range(num_items):
+        answers = [random_answer(rng) for _ in range(rng.randint(1, answers_per_item))]
+        roll = rng.random()
+        if roll < 0.3:
+            prediction = rng.choice(answers).upper()
+        elif roll < 0.4:
+            prediction = ''
+        else:
+            prediction = random_answer(rng, 8)
+        item = {'id': str(i), 'question': f'q{i}', 'prediction': prediction, 'ground_truths': answers}
+        if rng.random() < 0.5:
+            searches = rng.randint(0, 4)
+            item['response'] = ''.join(f"<search>{random_answer(rng)}</search>\n<information>...</information>"
+                                       for _ in range(searches)) + f"<answer>{prediction}</answer>"
+        else:
+            item['messages'] = [{'role': rng.choice(['assistant', 'tool'])} for _ in range(rng.randint(1, 8))]
+        results.append(item)
+    return results
+
+
+def repeated_runs(results, runs: int, seed: int = 1):
+    """The same questions evaluated `runs` times (e.g. several models / result files); about half the predictions change per run."""
+    rng = random.Random(seed)
+    combined = []
+    for run in range(runs):
+        for item in results:
+            item = dict(item, id=f"{run}_{item['id']}")
+            if run and rng.random() < 0.5:
+                item['prediction'] = random_answer(rng, 8)
+            combined.append(item)
+    return combined
+
+
+def reference_metrics(results, metrics_list):
+    """The per-item path: exact_match / f1_score / extract_search_stats on every item."""
+    scores = {metric: [] for metric in metrics_list}
+    search_counts, iteration_counts = [], []
+    for item in results:
+        prediction = item.get('prediction', '')
+        ground_truths = ground_truths_of(item)
+        if 'exact_match' in scores:
+            scores['exact_match'].append(exact_match(prediction, ground_truths))
+        if 'f1' in scores:
+            scores['f1'].append(f1_score(prediction, ground_truths))
+        searches, iterations = extract_search_stats(item)
+        search_counts.append(len(item['search_queries']) if 'search_queries' in item else searches)
+        iteration_counts.append(item['iterations'] if 'iterations' in item else iterations)
+    metrics = {metric: sum(values) / len(values) if values else 0.0 for metric, values in scores.items()}
+    metrics['avg_searches'] = sum(search_counts) / len(search_counts) if search_counts else 0.0
+    metrics['avg_iterations'] = sum(iteration_counts) / len(iteration_counts) if iteration_counts else 0.0
+    return metrics
+
+
+def check_equivalence(results) -> int:
+    """Compare every item's scores and search counts; returns the number of mismatches."""
+    predictions = [item.get('prediction', '') for item in results]
+    answers = [ground_truths_of(item) for item in results]
+    em, f1 = batch_scores(predictions, answers)
+    searches, iterations = batch_search_stats(results)
+
+    mismatches = 0
+    for i, item in enumerate(results):
+        expected = (exact_match(predictions[i], answers[i]), f1_score(predictions[i], answers[i]))
+        if (em[i], f1[i]) != expected:
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"  score mismatch on item {item.get('id', i)}: {(em[i], f1[i])} != {expected}")
+        if 'response' in item:
+            # The regex extract_search_stats used before count_search_tags
+            if count_search_tags(item['response']) != len(re.findall(r'<search>.*?</search>', item['response'], re.DOTALL)):
+                mismatches += 1
+        if (searches[i], iterations[i]) != item_search_stats(item):
+            mismatches += 1
+    return mismatches
+
+
+def timed(fn, repeats: int):
+    best = float('inf')
+    out = None
+    for _ in range(repeats):
+        analyze_answer.cache_clear()
+        start = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, out
+
+
+def benchmark(name: str, results, metrics_list, repeats: int) -> bool:
+    print(f"\n{name}: {len(results)} items")
+    mismatches = check_equivalence(results)
+    print(f"  per-item equivalence: {'OK' if mismatches == 0 else f'{mismatches} MISMATCHES'}")
+
+    ref_time, ref = timed(lambda: reference_metrics(results, metrics_list), repeats)
+    new_time, new = timed(lambda: calculate_metrics(results, metrics_list), repeats)
+
+    def streaming():
+        aggregator = MetricsAggregator(metrics_list)
+        for item in results:
+            aggregator.add(item)
+        return aggregator.result()
+
+    stream_time, streamed = timed(streaming, repeats)
+    same = ref == new == streamed
+    print(f"  aggregate metrics identical: {same}")
+    print(f"  {'per-item functions':24s} {ref_time * 1000:9.1f} ms")
+    print(f"  {'calculate_metrics':24s} {new_time * 1000:9.1f} ms  ({ref_time / new_time:5.1f}x)")
+    print(f"  {'MetricsAggregator.add':24s} {stream_time * 1000:9.1f} ms  ({ref_time / stream_time:5.1f}x)")
+    return mismatches == 0 and same
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the batch metrics engine')
+    parser.add_argument('--results', nargs='*', default=None,
+                        help='Result files or directories (*_results.json / *_results.jsonl) instead of synthetic data')
+    parser.add_argument('--num_items', type=int, default=20000, help='Synthetic items per run')
+    parser.add_argument('--answers_per_item', type=int, nargs='+', default=[1, 20],
+                        help='Maximum ground truths per synthetic item, one run per value')
+    parser.add_argument('--runs', type=int, default=10,
+                        help='Synthetic result files over the same questions for the repeated-dataset run')
+    parser.add_argument('--metrics', nargs='+', default=['exact_match', 'f1'])
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    ok = True
+    if args.results:
+        for path in map(Path, args.results):
+            files = sorted(p for p in path.rglob('*_results.json*') if p.suffix in ('.json', '.jsonl')) \
+                if path.is_dir() else [path]
+            for file_path in files:
+                ok &= benchmark(str(file_path), list(iter_results(str(file_path))), args.metrics, args.repeats)
+    else:
+        for answers_per_item in args.answers_per_item:
+            results = synthetic_results(args.num_items, answers_per_item)
+            ok &= benchmark(f"synthetic, up to {answers_per_item} answer(s) per item",
+                            results, args.metrics, args.repeats)
+        if args.runs > 1:
+            results = repeated_runs(synthetic_results(args.num_items // args.runs, max(args.answers_per_item)), args.runs)
+            ok &= benchmark(f"synthetic, {args.runs} result files over the same "
+                            f"{args.num_items // args.runs} questions", results, args.metrics, args.repeats)
+
+    if not ok:
+        print("\nEquivalence check FAILED")
+        sys.exit(1)
+    print("\nAll checks passed")
+
+
+if __name__ == "__main__":
+    main()
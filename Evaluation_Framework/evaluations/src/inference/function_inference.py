@@ -1,14 +1,17 @@
 """Function-based inference implementation."""
 
+import asyncio
 import json
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from ..search.function_search import FunctionSearchHandler
+from ..utils.concurrency import bounded
 
 
 class FunctionInference:
     """Handle function-based inference with multiple tool support."""
 
-    def __init__(self, model, search_handler: FunctionSearchHandler, prompt_config: Dict):
+    def __init__(self, model, search_handler: FunctionSearchHandler, prompt_config: Dict,
+                 model_limit: Optional[asyncio.Semaphore] = None, search_limit: Optional[asyncio.Semaphore] = None):
         """
         Initialize function inference.
 
@@ -16,25 +19,18 @@ class FunctionInference:
             model: Language model instance
             search_handler: Function search handler
             prompt_config: Prompt configuration
+            model_limit: Optional semaphore bounding concurrent model calls in arun()
+            search_limit: Optional semaphore bounding concurrent search calls in arun()
         """
         self.model = model
         self.search_handler = search_handler
         self.prompt_config = prompt_config
+        self.model_limit = model_limit
+        self.search_limit = search_limit
         self.max_iterations = 10
 
-    def run(self, question: str) -> Dict[str, Any]:
-        """
-        Run inference with function tools.
-
-        Args:
-            question: Input question
-
-        Returns:
-            Dictionary containing answer and messages
-        """
-        tools = self.search_handler.get_tool_schemas()
-
-        # Initialize message history
+    def _initial_messages(self, question: str, tools: List[Dict]) -> List[Dict[str, Any]]:
+        """Build the system and user messages."""
         messages = []
 
         is_open_source = 'open_source' in str(self.prompt_config).lower() or '{{TOOLS_PLACEHOLDER}}' in self.prompt_config.get('system', '')
@@ -55,6 +51,74 @@ class FunctionInference:
             "role": "user",
             "content": self.prompt_config['user'].format(question=question)
         })
+        return messages
+
+    @staticmethod
+    def _assistant_message(response: Dict[str, Any]) -> Dict[str, Any]:
+        """Assistant message for a turn that made function calls."""
+        if 'tool_calls' in response and response['tool_calls']:
+            # Closed source models (OpenAI, DeepSeek) - preserve tool_calls field
+            return {
+                "role": "assistant",
+                "content": response.get('content', ''),
+                "tool_calls": response['tool_calls']
+            }
+        # Open source models with XML format - content only
+        return {
+            "role": "assistant",
+            "content": response.get('content', '')
+        }
+
+    def _append_tool_responses(self, messages: List[Dict[str, Any]], function_calls: List[Dict], results: List[str]):
+        for call, result in zip(function_calls, results):
+            tool_response = self.search_handler.format_tool_response(
+                call['id'],
+                result
+            )
+            messages.append(tool_response)
+
+    def _handle_final(self, response: Dict[str, Any], messages: List[Dict[str, Any]], iterations: int):
+        """
+        Handle a turn without function calls.
+
+        Returns:
+            (stop, answer): whether the loop ends, and the answer found so far
+        """
+        if not response.get('content'):
+            # No content and no function calls - something went wrong
+            return True, None
+
+        # Add final assistant message
+        messages.append({
+            "role": "assistant",
+            "content": response['content']
+        })
+
+        # Try to extract answer
+        final_answer = self.search_handler.extract_final_answer(response['content'])
+        if final_answer:
+            return True, final_answer
+
+        # If no answer found but content exists, continue if we haven't reached max iterations
+        if iterations >= self.max_iterations:
+            # Use the last content as answer if no explicit answer tags
+            return True, response['content']
+        return False, None
+
+    def run(self, question: str) -> Dict[str, Any]:
+        """
+        Run inference with function tools.
+
+        Args:
+            question: Input question
+
+        Returns:
+            Dictionary containing answer and messages
+        """
+        tools = self.search_handler.get_tool_schemas()
+
+        # Initialize message history
+        messages = self._initial_messages(question, tools)
 
         iterations = 0
         final_answer = None
@@ -67,60 +131,15 @@ class FunctionInference:
                 function_calls = self.search_handler.parse_tool_calls(response) # check if <tool_call>...</tool_call> exists in the response
 
                 if function_calls:
-                    # Handle assistant message based on model type
-                    if 'tool_calls' in response and response['tool_calls']:
-                        # Closed source models (OpenAI, DeepSeek) - preserve tool_calls field
-                        messages.append({
-                            "role": "assistant",
-                            "content": response.get('content', ''),
-                            "tool_calls": response['tool_calls']
-                        })
-                    else:
-                        # Open source models with XML format - content only
-                        messages.append({
-                            "role": "assistant",
-                            "content": response.get('content', '')
-                        })
-
-                    # Execute each function call
-                    for call in function_calls:
-                        function_name = call['name']
-                        arguments = call['arguments']
-
-                        result = self.search_handler.call_function(function_name, arguments)
-
-                        tool_response = self.search_handler.format_tool_response(
-                            call['id'],
-                            result
-                        )
-                        messages.append(tool_response)
+                    messages.append(self._assistant_message(response))
+
+                    # Execute all function calls of this turn in one search request
+                    results = self.search_handler.call_functions(function_calls)
+                    self._append_tool_responses(messages, function_calls, results)
 
                 else:
-                    # No function calls, check for final answer
-                    if response.get('content'):
-                        # Add final assistant message
-                        messages.append({
-                            "role": "assistant",
-                            "content": response['content']
-                        })
-
-                        # Try to extract answer
-                        final_answer = self.search_handler.extract_final_answer(response['content'])
-
-                        # If we have an answer, return results
-                        if final_answer:
-                            return {
-                                'answer': final_answer,
-                                'messages': messages
-                            }
-
-                        # If no answer found but content exists, continue if we haven't reached max iterations
-                        if iterations >= self.max_iterations:
-                            # Use the last content as answer if no explicit answer tags
-                            final_answer = response['content']
-                            break
-                    else:
-                        # No content and no function calls - something went wrong
+                    stop, final_answer = self._handle_final(response, messages, iterations)
+                    if stop:
                         break
 
             return {
@@ -136,3 +155,42 @@ class FunctionInference:
                 'messages': messages  # Simplified: only keep messages
             }
 
+    async def arun(self, question: str) -> Dict[str, Any]:
+        """Async run(): awaits the model and the search client on the caller's event loop."""
+        tools = self.search_handler.get_tool_schemas()
+        messages = self._initial_messages(question, tools)
+
+        iterations = 0
+        final_answer = None
+
+        try:
+            while iterations < self.max_iterations:
+                iterations += 1
+
+                async with bounded(self.model_limit):
+                    response = await self.model.agenerate_with_functions(messages, tools)
+                function_calls = self.search_handler.parse_tool_calls(response)
+
+                if function_calls:
+                    messages.append(self._assistant_message(response))
+                    async with bounded(self.search_limit):
+                        results = await self.search_handler.acall_functions(function_calls)
+                    self._append_tool_responses(messages, function_calls, results)
+
+                else:
+                    stop, final_answer = self._handle_final(response, messages, iterations)
+                    if stop:
+                        break
+
+            return {
+                'answer': final_answer,
+                'messages': messages
+            }
+
+        except Exception as e:
+            print(e)
+            return {
+                'answer': None,
+                'error': str(e),
+                'messages': messages
+            }
@@ -1,16 +1,22 @@
 """Tag-based inference implementation."""
 
-from typing import Dict, Any
+import asyncio
+from typing import Dict, Any, Optional
 from ..search.tag_search import TagBasedSearch
+from ..utils.concurrency import bounded
 
 
 class TagBasedInference:
     """Handle tag-based search inference."""
 
-    def __init__(self, model, search_handler: TagBasedSearch, prompt_config: Dict):
+    def __init__(self, model, search_handler: TagBasedSearch, prompt_config: Dict,
+                 model_limit: Optional[asyncio.Semaphore] = None, search_limit: Optional[asyncio.Semaphore] = None):
         self.model = model
         self.search_handler = search_handler
         self.prompt_config = prompt_config
+        # Optional semaphores bounding concurrent model / search calls in arun()
+        self.model_limit = model_limit
+        self.search_limit = search_limit
         self.max_iterations = 10
 
     def run(self, question: str) -> Dict[str, Any]:
@@ -20,6 +26,8 @@ class TagBasedInference:
 
         iterations = 0
         full_response = ""
+        # Per-iteration prompt tokens / latency of the model calls
+        generation_stats = []
 
         # Unified approach for all models using generate_with_tags
         while iterations < self.max_iterations:
@@ -31,11 +39,14 @@ class TagBasedInference:
                 "</answer>", " </answer>"
             ]
 
-            response = self.model.generate_with_tags(
+            # The prompt only ever grows by appending, so a prefix-caching server
+            # re-prefills just the tokens added since the previous iteration
+            response, stats = self.model.generate_with_tags_stats(
                 prompt,
                 stop_sequences=stop_sequences,
                 max_tokens=512
             )
+            generation_stats.append(stats)
 
             full_response += response
             prompt += response
@@ -48,7 +59,8 @@ class TagBasedInference:
                 answer = self.search_handler.extract_answer(full_response)
                 return {
                     'answer': answer,
-                    'response': full_response  # Simplified: only keep the full response
+                    'response': full_response,  # Simplified: only keep the full response
+                    'generation_stats': generation_stats
                 }
 
             elif reason == "search_needed":
@@ -64,5 +76,59 @@ class TagBasedInference:
         # If no answer found after max iterations
         return {
             'answer': None,
-            'response': full_response  # Simplified: only keep the full response
-        }
\ No newline at end of file
+            'response': full_response,  # Simplified: only keep the full response
+            'generation_stats': generation_stats
+        }
+
+    async def arun(self, question: str) -> Dict[str, Any]:
+        """Async run(): awaits the model and the search client on the caller's event loop."""
+        prompt = self.prompt_config['user'].format(question=question)
+
+        iterations = 0
+        full_response = ""
+        # Per-iteration prompt tokens / latency of the model calls
+        generation_stats = []
+
+        while iterations < self.max_iterations:
+            iterations += 1
+
+            stop_sequences = [
+                "</search>", " </search>",
+                "</answer>", " </answer>"
+            ]
+
+            async with bounded(self.model_limit):
+                response, stats = await self.model.agenerate_with_tags_stats(
+                    prompt,
+                    stop_sequences=stop_sequences,
+                    max_tokens=512
+                )
+            generation_stats.append(stats)
+
+            full_response += response
+            prompt += response
+
+            _, reason = self.search_handler.should_continue(full_response)
+
+            if reason == "answer_found":
+                answer = self.search_handler.extract_answer(full_response)
+                return {
+                    'answer': answer,
+                    'response': full_response,
+                    'generation_stats': generation_stats
+                }
+
+            elif reason == "search_needed":
+                query = self.search_handler.extract_search_query(response)
+                if query:
+                    async with bounded(self.search_limit):
+                        results = await self.search_handler.asearch(query)
+                    search_text = self.search_handler.format_search_results(results)
+                    prompt += search_text
+                    full_response += search_text
+
+        return {
+            'answer': None,
+            'response': full_response,
+            'generation_stats': generation_stats
+        }
@@ -1,10 +1,14 @@
 """Metrics calculation for evaluation."""
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Sequence, Tuple
+from functools import lru_cache
+import os
 import re
 import string
 from collections import Counter
 
+import numpy as np
+
 
 def normalize_answer(s: str) -> str:
     """Normalize answer for comparison."""
@@ -68,6 +72,109 @@ def f1_score(prediction: str, ground_truths: List[str]) -> float:
     return max(scores) if scores else 0.0
 
 
+# ---------------------------------------------------------------------------
+# Batch engine
+#
+# exact_match / f1_score above re-normalize the prediction and every ground truth on
+# each call and build two Counters per pair. The functions below give identical scores
+# but analyze each distinct string once (normalized text and tokens, LRU cached across
+# items and files) and score EM and F1 in one pass over the answers, skipping answers
+# that share no token with the prediction.
+# ---------------------------------------------------------------------------
+
+_PUNCTUATION_TABLE = str.maketrans('', '', string.punctuation)
+_ARTICLES_RE = re.compile(r'\b(a|an|the)\b')
+
+
+@lru_cache(maxsize=1 << 17)
+def analyze_answer(s: str) -> Tuple[str, Tuple[str, ...]]:
+    """(normalize_answer(s), its tokens); cached per distinct string."""
+    normalized = ' '.join(_ARTICLES_RE.sub('', s.lower().translate(_PUNCTUATION_TABLE)).split())
+    return normalized, tuple(normalized.split())
+
+
+def score_prediction(prediction: str, ground_truths: Sequence[str]) -> Tuple[float, float]:
+    """(exact_match, f1_score) of one prediction, equal to calling both functions."""
+    if not prediction or not ground_truths:
+        return 0.0, 0.0
+
+    pred_norm, pred_tokens = analyze_answer(prediction)
+    pred_counts = None
+    best_f1 = 0.0
+    for gt in ground_truths:
+        gt_norm, gt_tokens = analyze_answer(gt)
+        if gt_norm == pred_norm:
+            # Same normalized text means same tokens, so F1 is 1.0 as well
+            return 1.0, 1.0
+        if not pred_tokens or not gt_tokens:
+            continue
+
+        if pred_counts is None:
+            pred_counts = {}
+            for token in pred_tokens:
+                pred_counts[token] = pred_counts.get(token, 0) + 1
+        if pred_counts.keys().isdisjoint(gt_tokens):
+            continue
+
+        # Size of the multiset intersection (sum of Counter(pred) & Counter(gt))
+        remaining = dict(pred_counts)
+        num_same = 0
+        for token in gt_tokens:
+            count = remaining.get(token)
+            if count:
+                remaining[token] = count - 1
+                num_same += 1
+
+        precision = 1.0 * num_same / len(pred_tokens)
+        recall = 1.0 * num_same / len(gt_tokens)
+        f1 = (2 * precision * recall) / (precision + recall)
+        if f1 > best_f1:
+            best_f1 = f1
+    return 0.0, best_f1
+
+
+def batch_scores(predictions: Sequence[str], answers: Sequence[Sequence[str]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Exact match and F1 for arrays of predictions and their answer lists.
+
+    Args:
+        predictions: One prediction per item
+        answers: Ground-truth answers per item (any number per item)
+
+    Returns:
+        Tuple of (exact_match, f1) float64 arrays, one score per item
+    """
+    if len(predictions) != len(answers):
+        raise ValueError(f"Got {len(predictions)} predictions for {len(answers)} answer lists")
+    em = np.zeros(len(predictions), dtype=np.float64)
+    f1 = np.zeros(len(predictions), dtype=np.float64)
+    for i, (prediction, ground_truths) in enumerate(zip(predictions, answers)):
+        em[i], f1[i] = score_prediction(prediction, ground_truths)
+    return em, f1
+
+
+def count_search_tags(response: str) -> int:
+    """Number of <search>...</search> spans, as re.findall(r'<search>.*?</search>', DOTALL) counts them."""
+    count = 0
+    start = response.find('<search>')
+    while start != -1:
+        end = response.find('</search>', start + len('<search>'))
+        if end == -1:
+            break
+        count += 1
+        start = response.find('<search>', end + len('</search>'))
+    return count
+
+
+def batch_search_stats(results: Sequence[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+    """(search counts, iteration counts) arrays for a list of result items."""
+    searches = np.zeros(len(results), dtype=np.int64)
+    iterations = np.zeros(len(results), dtype=np.int64)
+    for i, item in enumerate(results):
+        searches[i], iterations[i] = item_search_stats(item)
+    return searches, iterations
+
+
 def extract_search_stats(item: Dict[str, Any]) -> tuple:
     """
     Extract search statistics from messages or response.
@@ -93,72 +200,161 @@ def extract_search_stats(item: Dict[str, Any]) -> tuple:
         # Tag-based: extract from response
         response = item.get('response', '')
         # Count search tags
-        search_count = len(re.findall(r'<search>.*?</search>', response, re.DOTALL))
+        search_count = count_search_tags(response)
         # For tag-based, iterations = search count + 1 (final answer generation)
         iteration_count = search_count + 1
 
     return search_count, iteration_count
 
 
-def calculate_metrics(results: List[Dict[str, Any]], metrics_list: List[str]) -> Dict[str, float]:
-    """Calculate all metrics for results."""
-    metrics_results = {metric: [] for metric in metrics_list}
+def ground_truths_of(item: Dict[str, Any]) -> List[str]:
+    """Ground truths of a result item: `ground_truths` list, else the single `gold_answer`."""
+    ground_truths = item.get('ground_truths', [])
+    if not ground_truths and 'gold_answer' in item:
+        # Convert single gold_answer to list format
+        gold_answer = item.get('gold_answer', '')
+        if gold_answer:
+            ground_truths = [gold_answer]
+    return ground_truths
+
 
-    for item in results:
+def item_search_stats(item: Dict[str, Any]) -> tuple:
+    """
+    Search and iteration counts of a result item.
+
+    Explicit `search_queries` / `iterations` fields take precedence; otherwise the counts
+    are extracted from messages or response, and items with neither count as 0.
+    """
+    extracted = None
+    if 'search_queries' in item:
+        search_count = len(item['search_queries'])
+    elif 'messages' in item or 'response' in item:
+        extracted = extract_search_stats(item)
+        search_count = extracted[0]
+    else:
+        search_count = 0
+
+    if 'iterations' in item:
+        iteration_count = item['iterations']
+    elif 'messages' in item or 'response' in item:
+        if extracted is None:
+            extracted = extract_search_stats(item)
+        iteration_count = extracted[1]
+    else:
+        iteration_count = 0
+
+    return search_count, iteration_count
+
+
+class MetricsAggregator:
+    """
+    Incremental metrics: add() results one at a time as they arrive, read result() at any point.
+
+    Only running sums are kept, so memory does not grow with the number of results.
+    """
+
+    SCORED_METRICS = ('exact_match', 'f1')
+
+    def __init__(self, metrics_list: List[str]):
+        self.metrics_list = list(dict.fromkeys(metrics_list))
+        self.sums = {metric: 0.0 for metric in self.metrics_list}
+        self.counts = {metric: 0 for metric in self.metrics_list}
+        self.scored_metrics = [metric for metric in self.metrics_list if metric in self.SCORED_METRICS]
+        self.num_results = 0
+        self.total_searches = 0
+        self.total_iterations = 0
+        # Model-call stats of tag-based results (per question: summed over iterations)
+        self.generation_totals = {'prompt_tokens': 0, 'cached_prompt_tokens': 0, 'latency': 0.0}
+        self.generation_counts = {'prompt_tokens': 0, 'cached_prompt_tokens': 0, 'latency': 0}
+
+    def add(self, item: Dict[str, Any]):
+        """Update the running metrics with one result."""
         prediction = item.get('prediction', '')
-        # Support both ground_truths (list) and gold_answer (string) fields
-        ground_truths = item.get('ground_truths', [])
-        if not ground_truths and 'gold_answer' in item:
-            # Convert single gold_answer to list format
-            gold_answer = item.get('gold_answer', '')
-            if gold_answer:
-                ground_truths = [gold_answer]
-
-        for metric in metrics_list:
-            if metric == 'exact_match':
-                score = exact_match(prediction, ground_truths)
-            elif metric == 'f1':
-                score = f1_score(prediction, ground_truths)
-            else:
-                continue
-
-            metrics_results[metric].append(score)
-
-    # Calculate averages
-    avg_metrics = {}
-    for metric, scores in metrics_results.items():
-        avg_metrics[metric] = sum(scores) / len(scores) if scores else 0.0
-
-    # Add search statistics
-    # First try to get from explicit fields, then extract from messages/response
-    search_counts = []
-    iteration_counts = []
-
-    for item in results:
-        # Check for explicit fields first
-        if 'search_queries' in item:
-            search_counts.append(len(item['search_queries']))
-        elif 'messages' in item or 'response' in item:
-            # Extract from messages or response
-            searches, iterations = extract_search_stats(item)
-            search_counts.append(searches)
-        else:
-            search_counts.append(0)
-
-        if 'iterations' in item:
-            iteration_counts.append(item['iterations'])
-        elif 'messages' in item or 'response' in item:
-            # Use extracted iteration count if not explicitly provided
-            if len(search_counts) > len(iteration_counts):
-                _, iterations = extract_search_stats(item)
-                iteration_counts.append(iterations)
-        else:
-            iteration_counts.append(0)
-
-    avg_metrics['avg_searches'] = sum(search_counts) / len(search_counts) if search_counts else 0.0
-    avg_metrics['avg_iterations'] = sum(iteration_counts) / len(iteration_counts) if iteration_counts else 0.0
-
-    return avg_metrics
+        ground_truths = ground_truths_of(item)
+
+        if self.scored_metrics:
+            scores = dict(zip(self.SCORED_METRICS, score_prediction(prediction, ground_truths)))
+            for metric in self.scored_metrics:
+                self.sums[metric] += scores[metric]
+                self.counts[metric] += 1
+
+        searches, iterations = item_search_stats(item)
+        self.total_searches += searches
+        self.total_iterations += iterations
+        self.num_results += 1
+
+        for key in self.generation_totals:
+            values = [stats[key] for stats in item.get('generation_stats') or [] if stats.get(key) is not None]
+            if values:
+                self.generation_totals[key] += sum(values)
+                self.generation_counts[key] += 1
+
+    def update(self, results: Iterable[Dict[str, Any]]):
+        for item in results:
+            self.add(item)
+
+    def result(self) -> Dict[str, float]:
+        """Averages over the results added so far."""
+        avg_metrics = {}
+        for metric in self.metrics_list:
+            count = self.counts[metric]
+            avg_metrics[metric] = self.sums[metric] / count if count else 0.0
+
+        n = self.num_results
+        avg_metrics['avg_searches'] = self.total_searches / n if n else 0.0
+        avg_metrics['avg_iterations'] = self.total_iterations / n if n else 0.0
+        # Only present when results carry generation_stats
+        for key, name in (('prompt_tokens', 'avg_prompt_tokens'),
+                          ('cached_prompt_tokens', 'avg_cached_prompt_tokens'),
+                          ('latency', 'avg_generation_latency')):
+            if self.generation_counts[key]:
+                avg_metrics[name] = self.generation_totals[key] / self.generation_counts[key]
+        return avg_metrics
+
+
+def calculate_metrics(results: Iterable[Dict[str, Any]], metrics_list: List[str]) -> Dict[str, float]:
+    """Calculate all metrics for results (any iterable, consumed once)."""
+    aggregator = MetricsAggregator(metrics_list)
+    aggregator.update(results)
+    return aggregator.result()
+
+
+def _recalculate_jsonl(args) -> Dict[str, float]:
+    """Stream a JSONL result file; metrics go to the {dataset}_metrics.json next to it."""
+    import json
+
+    print(f"Streaming results from: {args.result_file}")
+    print(f"Calculating metrics: {args.metrics}")
+    aggregator = MetricsAggregator(args.metrics)
+    with open(args.result_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                aggregator.add(json.loads(line))
+    metrics = aggregator.result()
+
+    if args.print or not args.output:
+        print("\nMetrics:")
+        print("=" * 40)
+        for metric, value in metrics.items():
+            print(f"{metric:20s}: {value:.4f}")
+
+    if args.output:
+        output_file = args.output
+        summary = metrics
+    else:
+        stem = args.result_file[:-len('_results.jsonl')] if args.result_file.endswith('_results.jsonl') \
+            else args.result_file[:-len('.jsonl')]
+        output_file = stem + '_metrics.json'
+        summary = {
+            'dataset': os.path.basename(stem),
+            'num_examples': aggregator.num_results,
+            'metrics': metrics
+        }
+    with open(output_file, 'w') as f:
+        json.dump(summary, f, indent=2)
+    print(f"\nSaved metrics to: {output_file}")
+
+    return metrics
 
 
 def main():
@@ -167,7 +363,7 @@ def main():
     import json
 
     parser = argparse.ArgumentParser(description='Recalculate metrics from evaluation results')
-    parser.add_argument('result_file', help='Path to the result JSON file')
+    parser.add_argument('result_file', help='Path to the result JSON / JSONL file')
     parser.add_argument('--metrics', nargs='+', default=['exact_match', 'f1'],
                        help='Metrics to calculate (default: exact_match f1)')
     parser.add_argument('--output', help='Output file path (default: update original file)')
@@ -175,6 +371,9 @@ def main():
 
     args = parser.parse_args()
 
+    if args.result_file.endswith('.jsonl'):
+        return _recalculate_jsonl(args)
+
     # Load results
     print(f"Loading results from: {args.result_file}")
     with open(args.result_file, 'r') as f:
@@ -1,7 +1,9 @@
 """Base model interface for evaluation."""
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
+import asyncio
+import time
 import yaml
 
 
@@ -38,4 +40,36 @@ class BaseModel(ABC):
         Returns:
             Generated text up to stop sequence
         """
-        pass
\ No newline at end of file
+        pass
+
+    def generate_with_tags_stats(self, prompt: str, stop_sequences: List[str] = None,
+                                 **kwargs) -> Tuple[str, Dict[str, Any]]:
+        """generate_with_tags plus per-call stats.
+
+        Returns:
+            Tuple of (generated text, stats). Stats hold 'latency' (seconds) and, when the
+            backend reports them, 'prompt_tokens', 'cached_prompt_tokens', 'completion_tokens'
+            and 'ttft'; this default only measures latency.
+        """
+        start = time.perf_counter()
+        text = self.generate_with_tags(prompt, stop_sequences, **kwargs)
+        return text, {'latency': round(time.perf_counter() - start, 4)}
+
+    async def agenerate_with_functions(self, messages: List[Dict[str, str]], tools: List[Dict], **kwargs) -> Dict:
+        """Async generate_with_functions; runs the blocking call in a worker thread unless overridden."""
+        return await asyncio.to_thread(self.generate_with_functions, messages, tools, **kwargs)
+
+    async def agenerate_with_tags(self, prompt: str, stop_sequences: List[str] = None, **kwargs) -> str:
+        """Async generate_with_tags; runs the blocking call in a worker thread unless overridden."""
+        return await asyncio.to_thread(self.generate_with_tags, prompt, stop_sequences, **kwargs)
+
+    async def agenerate_with_tags_stats(self, prompt: str, stop_sequences: List[str] = None,
+                                        **kwargs) -> Tuple[str, Dict[str, Any]]:
+        """Async generate_with_tags_stats; times agenerate_with_tags unless overridden."""
+        start = time.perf_counter()
+        text = await self.agenerate_with_tags(prompt, stop_sequences, **kwargs)
+        return text, {'latency': round(time.perf_counter() - start, 4)}
+
+    async def aclose(self):
+        """Release clients bound to the current event loop (they are recreated on next use)."""
+        pass
@@ -222,13 +222,26 @@ class APICaller:
         return None
 
 
+    async def close(self):
+        for info in self.api_keys_info:
+            await info["client"].close()
+
+
 class LLMGenerator:
     def __init__(self, model: str = "anthropic.claude-sonnet-4", retry_attempts: int = 15, retry_delay: int = 60):
+        self.model = model
+        self.retry_attempts = retry_attempts
+        self.retry_delay = retry_delay
         self.api_caller = APICaller(model=model, retry_attempts=retry_attempts, retry_delay=retry_delay)
     
     async def call_api(self, messages: list) -> str:
         return await self.api_caller.generate(messages)
 
+    async def reset(self):
+        """Close the clients and lock bound to the running loop and start over with fresh ones"""
+        await self.api_caller.close()
+        self.api_caller = APICaller(model=self.model, retry_attempts=self.retry_attempts, retry_delay=self.retry_delay)
+
 
 class OpenAIModel(BaseModel):
     """OpenAI GPT-4 implementation with new async approach."""
@@ -301,6 +314,13 @@ class OpenAIModel(BaseModel):
         finally:
             loop.close()
 
+    async def agenerate_with_functions(self, messages: List[Dict[str, str]], tools: List[Dict], **kwargs) -> Dict:
+        """Native async function calling on the caller's event loop (no per-call loop)."""
+        return await self._generate_with_functions_async(messages, tools, **kwargs)
+
+    async def aclose(self):
+        await self.llm_generator.reset()
+
     async def _generate_with_functions_async(self, messages: List[Dict[str, str]], tools: List[Dict], **kwargs) -> Dict:
         """Async implementation of function calling."""
         try:
@@ -403,6 +423,13 @@ class ClaudeModel(BaseModel):
         finally:
             loop.close()
 
+    async def agenerate_with_functions(self, messages: List[Dict[str, str]], tools: List[Dict], **kwargs) -> Dict:
+        """Native async function calling on the caller's event loop (no per-call loop)."""
+        return await self._generate_with_functions_async(messages, tools, **kwargs)
+
+    async def aclose(self):
+        await self.llm_generator.reset()
+
     async def _generate_with_functions_async(self, messages: List[Dict[str, str]], tools: List[Dict], **kwargs) -> Dict:
         """Async implementation of function calling for Claude."""
         try:
@@ -501,6 +528,13 @@ class GrokModel(BaseModel):
         finally:
             loop.close()
 
+    async def agenerate_with_functions(self, messages: List[Dict[str, str]], tools: List[Dict], **kwargs) -> Dict:
+        """Native async function calling on the caller's event loop (no per-call loop)."""
+        return await self._generate_with_functions_async(messages, tools, **kwargs)
+
+    async def aclose(self):
+        await self.llm_generator.reset()
+
     async def _generate_with_functions_async(self, messages: List[Dict[str, str]], tools: List[Dict], **kwargs) -> Dict:
         """Async implementation of function calling for Grok."""
         try:
@@ -600,6 +634,13 @@ class DeepSeekModel(BaseModel):
         finally:
             loop.close()
 
+    async def agenerate_with_functions(self, messages: List[Dict[str, str]], tools: List[Dict], **kwargs) -> Dict:
+        """Native async function calling on the caller's event loop (no per-call loop)."""
+        return await self._generate_with_functions_async(messages, tools, **kwargs)
+
+    async def aclose(self):
+        await self.llm_generator.reset()
+
     async def _generate_with_functions_async(self, messages: List[Dict[str, str]], tools: List[Dict], **kwargs) -> Dict:
         """Async implementation of function calling for DeepSeek."""
         try:
@@ -1,9 +1,11 @@
 """Open source model implementations via vLLM server."""
 
+import asyncio
 import json
 import time
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 import requests
+from requests.adapters import HTTPAdapter
 from .base_model import BaseModel
 
 """
@@ -21,6 +23,76 @@ Chat API vs Completions API:
 
 """
 
+class _TagCompletion:
+    """
+    One /v1/completions call, streamed or not: generated text plus per-call stats.
+
+    When streaming, every chunk is checked for the stop sequences so the stream can be
+    closed as soon as one appears (vLLM normally stops and strips them server-side; this
+    guards servers that don't) and the time to first token is recorded.
+    """
+
+    def __init__(self, stop_sequences: List[str] = None):
+        self.stop_sequences = [stop for stop in (stop_sequences or []) if stop]
+        self.max_stop_len = max((len(stop) for stop in self.stop_sequences), default=0)
+        self.start = time.perf_counter()
+        self.end = None
+        self.ttft = None
+        self.text = ''
+        self.usage = None
+        self.early_stop = False
+
+    def feed(self, line: str) -> bool:
+        """Consume one server-sent-events line; returns False when the stream should be closed."""
+        if not line.startswith('data:'):
+            return True
+        payload = line[len('data:'):].strip()
+        if payload == '[DONE]':
+            return False
+        chunk = json.loads(payload)
+        if chunk.get('usage'):
+            self.usage = chunk['usage']
+        for choice in chunk.get('choices') or []:
+            delta = choice.get('text') or ''
+            if not delta:
+                continue
+            if self.ttft is None:
+                self.ttft = time.perf_counter() - self.start
+            # Only the tail can contain a stop sequence completed by this delta
+            search_from = max(0, len(self.text) - self.max_stop_len)
+            self.text += delta
+            cut = self._find_stop(search_from)
+            if cut is not None:
+                self.text = self.text[:cut]
+                self.early_stop = True
+                return False
+        return True
+
+    def _find_stop(self, search_from: int) -> Optional[int]:
+        positions = [pos for pos in (self.text.find(stop, search_from) for stop in self.stop_sequences) if pos != -1]
+        return min(positions) if positions else None
+
+    def set_result(self, result: Dict):
+        """Non-streaming response body."""
+        self.text = result['choices'][0]['text']
+        self.usage = result.get('usage')
+
+    def stats(self) -> Dict[str, Any]:
+        if self.end is None:
+            self.end = time.perf_counter()
+        usage = self.usage or {}
+        details = usage.get('prompt_tokens_details') or {}
+        return {
+            'prompt_tokens': usage.get('prompt_tokens'),
+            # Reported by vLLM with --enable-prompt-tokens-details (prefix cache hits)
+            'cached_prompt_tokens': details.get('cached_tokens'),
+            'completion_tokens': usage.get('completion_tokens'),
+            'latency': round(self.end - self.start, 4),
+            'ttft': round(self.ttft, 4) if self.ttft is not None else None,
+            'early_stop': self.early_stop
+        }
+
+
 class VLLMModel(BaseModel):
     """vLLM server model implementation."""
 
@@ -29,12 +101,21 @@ class VLLMModel(BaseModel):
         self.server_url = config['server_url']
         self.model_path = config['model_path']
         self.timeout = config.get('timeout', 30)
+        self.pool_size = config.get('pool_size', 64)
+        # Stream tag-based completions (time to first token, client-side stop detection)
+        self.stream = config.get('stream', False)
+        self._async_client = None
 
-    def generate_with_functions(self, messages: List[Dict[str, str]], tools: List[Dict], **kwargs) -> Dict:
-        """Generate response with function/tool calling."""
+        # Keep-alive connection pool for the blocking calls
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def _functions_payload(self, messages: List[Dict[str, str]], **kwargs) -> Dict:
         # For open source models, tools are already injected in system prompt
         # So we don't need to pass them separately
-        data = {
+        return {
             "model": self.model_path,
             "messages": messages,  # Tools already in system prompt
             "max_tokens": kwargs.get('max_tokens', self.max_tokens),
@@ -42,9 +123,39 @@ class VLLMModel(BaseModel):
             "stream": False
         }
 
+    def _tags_payload(self, prompt: str, stop_sequences: List[str] = None, **kwargs) -> Dict:
+        data = {
+            "model": self.model_path,
+            "prompt": prompt,
+            "max_tokens": kwargs.get('max_tokens', self.max_tokens),
+            "temperature": kwargs.get('temperature', self.temperature),
+            "stop": stop_sequences, # ["</search>", "</answer>"]
+            "stream": self.stream
+        }
+        if self.stream:
+            # The last chunk then carries token usage
+            data["stream_options"] = {"include_usage": True}
+        return data
+
+    @staticmethod
+    def _restore_stop_sequence(content: str, stop_sequences: List[str] = None) -> str:
+        # Append the stop sequence that was triggered
+        # vLLM by default also strips stop sequences like OpenAI
+        if stop_sequences and content:
+            # Check for each possible unclosed tag and append the appropriate closing
+            if '<search>' in content and '</search>' not in content:
+                content += '</search>'
+            elif '<answer>' in content and '</answer>' not in content:
+                content += '</answer>'
+        return content
+
+    def generate_with_functions(self, messages: List[Dict[str, str]], tools: List[Dict], **kwargs) -> Dict:
+        """Generate response with function/tool calling."""
+        data = self._functions_payload(messages, **kwargs)
+
         for retry in range(3):
             try:
-                response = requests.post(
+                response = self.session.post(
                     f"{self.server_url}/v1/chat/completions",
                     json=data,
                     timeout=self.timeout
@@ -63,38 +174,96 @@ class VLLMModel(BaseModel):
 
     def generate_with_tags(self, prompt: str, stop_sequences: List[str] = None, **kwargs) -> str:
         """Generate response using tag-based approach with stop sequences."""
-        data = {
-            "model": self.model_path,
-            "prompt": prompt,
-            "max_tokens": kwargs.get('max_tokens', self.max_tokens),
-            "temperature": kwargs.get('temperature', self.temperature),
-            "stop": stop_sequences, # ["</search>", "</answer>"]
-            "stream": False
-        }
+        return self.generate_with_tags_stats(prompt, stop_sequences, **kwargs)[0]
+
+    def generate_with_tags_stats(self, prompt: str, stop_sequences: List[str] = None,
+                                 **kwargs) -> Tuple[str, Dict[str, Any]]:
+        """generate_with_tags plus prompt / cached / completion tokens, latency and time to first token."""
+        data = self._tags_payload(prompt, stop_sequences, **kwargs)
 
         for retry in range(3):
             try:
-                response = requests.post(
+                completion = _TagCompletion(stop_sequences)
+                with self.session.post(
                     f"{self.server_url}/v1/completions",
                     json=data,
-                    timeout=self.timeout
-                )
+                    timeout=self.timeout,
+                    stream=self.stream
+                ) as response:
+                    response.raise_for_status()
+                    if self.stream:
+                        for line in response.iter_lines():
+                            if line and not completion.feed(line.decode('utf-8')):
+                                break
+                    else:
+                        completion.set_result(response.json())
+
+                stats = completion.stats()
+                return self._restore_stop_sequence(completion.text, stop_sequences), stats
+            except Exception as e:
+                if retry == 2:
+                    raise e
+                time.sleep(2 ** retry)
+
+    @property
+    def async_client(self):
+        """Pooled httpx.AsyncClient, created on first use inside the running event loop"""
+        if self._async_client is None:
+            import httpx
+
+            self._async_client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size)
+            )
+        return self._async_client
+
+    async def _apost(self, path: str, data: Dict) -> Dict:
+        for retry in range(3):
+            try:
+                response = await self.async_client.post(f"{self.server_url}{path}", json=data)
                 response.raise_for_status()
+                return response.json()
+            except Exception as e:
+                if retry == 2:
+                    raise e
+                await asyncio.sleep(2 ** retry)
 
-                # Get the response content
-                content = response.json()['choices'][0]['text']
+    async def agenerate_with_functions(self, messages: List[Dict[str, str]], tools: List[Dict], **kwargs) -> Dict:
+        result = await self._apost("/v1/chat/completions", self._functions_payload(messages, **kwargs))
+        return {
+            'content': result['choices'][0]['message'].get('content', '')
+        }
+
+    async def agenerate_with_tags(self, prompt: str, stop_sequences: List[str] = None, **kwargs) -> str:
+        return (await self.agenerate_with_tags_stats(prompt, stop_sequences, **kwargs))[0]
+
+    async def agenerate_with_tags_stats(self, prompt: str, stop_sequences: List[str] = None,
+                                        **kwargs) -> Tuple[str, Dict[str, Any]]:
+        data = self._tags_payload(prompt, stop_sequences, **kwargs)
+        url = f"{self.server_url}/v1/completions"
 
-                # Append the stop sequence that was triggered
-                # vLLM by default also strips stop sequences like OpenAI
-                if stop_sequences and content:
-                    # Check for each possible unclosed tag and append the appropriate closing
-                    if '<search>' in content and '</search>' not in content:
-                        content += '</search>'
-                    elif '<answer>' in content and '</answer>' not in content:
-                        content += '</answer>'
+        for retry in range(3):
+            try:
+                completion = _TagCompletion(stop_sequences)
+                if self.stream:
+                    async with self.async_client.stream("POST", url, json=data) as response:
+                        response.raise_for_status()
+                        async for line in response.aiter_lines():
+                            if line and not completion.feed(line):
+                                break
+                else:
+                    response = await self.async_client.post(url, json=data)
+                    response.raise_for_status()
+                    completion.set_result(response.json())
 
-                return content
+                stats = completion.stats()
+                return self._restore_stop_sequence(completion.text, stop_sequences), stats
             except Exception as e:
                 if retry == 2:
                     raise e
-                time.sleep(2 ** retry)
\ No newline at end of file
+                await asyncio.sleep(2 ** retry)
+
+    async def aclose(self):
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
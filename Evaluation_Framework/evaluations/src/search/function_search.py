@@ -3,7 +3,7 @@
 import json
 import re
 from typing import Dict, List, Any, Optional
-from .search_interface import SearchEngine
+from .search_interface import SearchEngine, AsyncSearchEngine
 
 
 class FunctionSearchHandler:
@@ -13,6 +13,7 @@ class FunctionSearchHandler:
         """Initialize function search handler."""
         self.config = config
         self.search_engine = SearchEngine(config)
+        self._async_search_engine = None
         self.functions = self._load_functions(config)
 
     def _load_functions(self, config: Dict[str, Any]) -> Dict[str, Dict]:
@@ -42,22 +43,10 @@ class FunctionSearchHandler:
             schemas.append(schema)
         return schemas
 
-    def call_function(self, name: str, arguments: Dict[str, Any]) -> str:
-        """
-        Execute a function and return results.
-
-        Args:
-            name: Function name to execute
-            arguments: Function arguments
-
-        Returns:
-            Search results as formatted string
+    def build_query(self, arguments: Dict[str, Any]) -> str:
         """
-        if name not in self.functions:
-            return f"Error: Unknown function '{name}'. Available functions: {list(self.functions.keys())}"
+        Format all function arguments as one search query.
 
-        # Extract query and format all arguments as search query
-        """
         例如，对于以下工具调用：
         arguments = {
             "query": "Einstein's birthplace and education",
@@ -78,16 +67,79 @@ class FunctionSearchHandler:
                     formatted_value = str(param_value)
                 query_parts.append(f"{param_name}: {formatted_value}")
 
-        query = '\n'.join(query_parts) if query_parts else ''
-        print(query)
+        return '\n'.join(query_parts) if query_parts else ''
+
+    def call_function(self, name: str, arguments: Dict[str, Any]) -> str:
+        """
+        Execute a function and return results.
+
+        Args:
+            name: Function name to execute
+            arguments: Function arguments
+
+        Returns:
+            Search results as formatted string
+        """
+        return self.call_functions([{'name': name, 'arguments': arguments}])[0]
+
+    def call_functions(self, calls: List[Dict[str, Any]]) -> List[str]:
+        """
+        Execute all function calls of one turn with a single /retrieve request.
 
-        try:
-            results = self.search_engine.search(query)
-            # results = "This is a placeholder for the search results."
+        Args:
+            calls: Parsed calls with 'name' and 'arguments'
 
-            return results
-        except Exception as e:
-            return f"Search error: {str(e)}"
+        Returns:
+            Search results (or error message) per call, in call order
+        """
+        results, queries, positions = self._prepare_calls(calls)
+        if queries:
+            try:
+                for position, result in zip(positions, self.search_engine.search_batch(queries)):
+                    results[position] = result
+            except Exception as e:
+                for position in positions:
+                    results[position] = f"Search error: {str(e)}"
+        return results
+
+    @property
+    def async_search_engine(self) -> AsyncSearchEngine:
+        """Async search client, created on first use inside the running event loop."""
+        if self._async_search_engine is None:
+            self._async_search_engine = AsyncSearchEngine(self.config)
+        return self._async_search_engine
+
+    async def acall_functions(self, calls: List[Dict[str, Any]]) -> List[str]:
+        """Async call_functions: all calls of one turn in a single /retrieve request."""
+        results, queries, positions = self._prepare_calls(calls)
+        if queries:
+            try:
+                for position, result in zip(positions, await self.async_search_engine.asearch_batch(queries)):
+                    results[position] = result
+            except Exception as e:
+                for position in positions:
+                    results[position] = f"Search error: {str(e)}"
+        return results
+
+    async def aclose(self):
+        if self._async_search_engine is not None:
+            await self._async_search_engine.aclose()
+            self._async_search_engine = None
+
+    def _prepare_calls(self, calls: List[Dict[str, Any]]):
+        """Split calls into error messages for unknown functions and queries to search"""
+        results = [None] * len(calls)
+        queries, positions = [], []
+        for position, call in enumerate(calls):
+            name = call['name']
+            if name not in self.functions:
+                results[position] = f"Error: Unknown function '{name}'. Available functions: {list(self.functions.keys())}"
+                continue
+            query = self.build_query(call['arguments'])
+            print(query)
+            queries.append(query)
+            positions.append(position)
+        return results, queries, positions
 
 
     def parse_tool_calls(self, response: Dict[str, Any]) -> List[Dict[str, Any]]:
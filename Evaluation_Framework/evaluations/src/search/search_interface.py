@@ -2,7 +2,9 @@
 
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List
+import asyncio
 import requests
+from requests.adapters import HTTPAdapter
 import time
 
 
@@ -15,30 +17,48 @@ class SearchEngine(ABC):
         self.timeout = config.get('timeout', 30)
         self.max_retries = config.get('max_retries', 3)
         self.top_k = config.get('top_k', 3)
+        self.pool_size = config.get('pool_size', 32)
 
-    def search(self, query: str) -> str:
-        """Execute search and return formatted results."""
-        payload = {
-            "queries": [query],
+        # Keep-alive connection pool shared by every thread using this engine
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def _payload(self, queries: List[str]) -> Dict[str, Any]:
+        return {
+            "queries": queries,
             "topk": self.top_k,
             "return_scores": self.config.get('return_scores', True)
         }
 
+    def search(self, query: str) -> str:
+        """Execute search and return formatted results."""
+        return self.search_batch([query])[0]
+
+    def search_batch(self, queries: List[str]) -> List[str]:
+        """Execute several searches in one /retrieve request, returning formatted results per query."""
+        if not queries:
+            return []
+        payload = self._payload(queries)
+
         for retry in range(self.max_retries):
             try:
-                response = requests.post(
+                response = self.session.post(
                     self.url,
                     json=payload,
                     timeout=self.timeout
                 )
                 response.raise_for_status()
-                results = response.json()['result'][0]
-                return self._format_results(results)
+                return [self._format_results(results) for results in response.json()['result']]
             except Exception as e:
                 if retry == self.max_retries - 1:
                     raise e
                 time.sleep(2 ** retry)
 
+    def close(self):
+        self.session.close()
+
     def _format_results(self, results: List[Dict]) -> str:
         """Format search results for insertion."""
         formatted = []
@@ -48,4 +68,41 @@ class SearchEngine(ABC):
             title = lines[0] if lines else ""
             text = '\n'.join(lines[1:]) if len(lines) > 1 else content
             formatted.append(f"Doc {idx + 1}(Title: {title}) {text}")
-        return '\n'.join(formatted)
\ No newline at end of file
+        return '\n'.join(formatted)
+
+
+class AsyncSearchEngine(SearchEngine):
+    """Asyncio search engine on a pooled httpx.AsyncClient (create and use it inside one event loop)."""
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        import httpx
+
+        self.client = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size)
+        )
+
+    async def asearch(self, query: str) -> str:
+        """Execute search and return formatted results."""
+        return (await self.asearch_batch([query]))[0]
+
+    async def asearch_batch(self, queries: List[str]) -> List[str]:
+        """Execute several searches in one /retrieve request, returning formatted results per query."""
+        if not queries:
+            return []
+        payload = self._payload(queries)
+
+        for retry in range(self.max_retries):
+            try:
+                response = await self.client.post(self.url, json=payload)
+                response.raise_for_status()
+                return [self._format_results(results) for results in response.json()['result']]
+            except Exception as e:
+                if retry == self.max_retries - 1:
+                    raise e
+                await asyncio.sleep(2 ** retry)
+
+    async def aclose(self):
+        await self.client.aclose()
+        self.close()
@@ -2,7 +2,7 @@
 
 import re
 from typing import Dict, Any, Optional, Tuple
-from .search_interface import SearchEngine
+from .search_interface import SearchEngine, AsyncSearchEngine
 
 
 class TagBasedSearch:
@@ -10,6 +10,7 @@ class TagBasedSearch:
 
     def __init__(self, search_engine: SearchEngine, config: Dict[str, Any]):
         self.search_engine = search_engine
+        self._async_search_engine = None
         self.config = config['tag_format']
         self.search_pattern = re.compile(
             f"{re.escape(self.config['search_tag'])}(.*?){re.escape(self.config['search_close'])}",
@@ -49,4 +50,15 @@ class TagBasedSearch:
             return False, "answer_found"
         if self.extract_search_query(text):
             return True, "search_needed"
-        return True, "continue_generation"
\ No newline at end of file
+        return True, "continue_generation"
+
+    async def asearch(self, query: str) -> str:
+        """Async search on a pooled client created inside the running event loop."""
+        if self._async_search_engine is None:
+            self._async_search_engine = AsyncSearchEngine(self.search_engine.config)
+        return await self._async_search_engine.asearch(query)
+
+    async def aclose(self):
+        if self._async_search_engine is not None:
+            await self._async_search_engine.aclose()
+            self._async_search_engine = None
@@ -0,0 +1,170 @@
+"""Asyncio evaluation engine."""
+
+import asyncio
+import json
+import os
+from typing import Dict, Any, Callable, List, Optional
+
+from tqdm import tqdm
+
+from .thread_manager import build_result, build_error_result, load_checkpoint, open_checkpoint, reset_checkpoint
+
+
+class OrderedCheckpointWriter:
+    """
+    Appends results to a checkpoint JSONL in submission order.
+
+    Results may complete in any order; each is buffered until all earlier positions are
+    written. The file stays open and is flushed and fsynced every flush_every lines.
+    """
+
+    def __init__(self, file_path: str, flush_every: int = 10):
+        self.file_path = file_path
+        self.flush_every = max(1, flush_every)
+        self._file = open_checkpoint(file_path)
+        self._pending = {}
+        self._next = 0
+        self._unflushed = 0
+
+    def add(self, position: int, result: Dict[str, Any]):
+        self._pending[position] = result
+        while self._next in self._pending:
+            self._file.write(json.dumps(self._pending.pop(self._next), ensure_ascii=False) + '\n')
+            self._next += 1
+            self._unflushed += 1
+        if self._unflushed >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unflushed = 0
+
+    def close(self):
+        if self._file.closed:
+            return
+        # Anything still buffered follows a gap left by a crashed task; keep it anyway
+        for position in sorted(self._pending):
+            self._file.write(json.dumps(self._pending[position], ensure_ascii=False) + '\n')
+        self._pending.clear()
+        self.flush()
+        self._file.close()
+
+
+class AsyncEvaluator:
+    """
+    Evaluates a dataset with asyncio tasks sharing one model client and one search client.
+
+    max_concurrency bounds the questions in flight; model_concurrency and search_concurrency
+    bound concurrent calls to the model endpoint and to the retrieval server, so throughput
+    is set by what the endpoints can take rather than by a thread count.
+    """
+
+    def __init__(self,
+                 model,
+                 search_handler,
+                 prompt_config: Dict[str, Any],
+                 search_method: str,
+                 max_concurrency: int = 32,
+                 model_concurrency: Optional[int] = None,
+                 search_concurrency: Optional[int] = None,
+                 checkpoint_every: int = 10):
+        """
+        Initialize async evaluator.
+
+        Args:
+            model: Shared model instance
+            search_handler: Shared search handler instance
+            prompt_config: Prompt configuration
+            search_method: Search method ('tag' or 'function')
+            max_concurrency: Maximum number of questions evaluated at once
+            model_concurrency: Maximum concurrent model calls (None: max_concurrency)
+            search_concurrency: Maximum concurrent search requests (None: max_concurrency)
+            checkpoint_every: Flush the checkpoint every N results
+        """
+        self.model = model
+        self.search_handler = search_handler
+        self.prompt_config = prompt_config
+        self.search_method = search_method
+        self.max_concurrency = max_concurrency
+        self.model_concurrency = model_concurrency or max_concurrency
+        self.search_concurrency = search_concurrency or max_concurrency
+        self.checkpoint_every = checkpoint_every
+
+    def _create_inference(self, model_limit: asyncio.Semaphore, search_limit: asyncio.Semaphore):
+        if self.search_method == 'tag':
+            from ..inference.tag_based_inference import TagBasedInference
+            return TagBasedInference(self.model, self.search_handler, self.prompt_config, model_limit, search_limit)
+        elif self.search_method == 'function':
+            from ..inference.function_inference import FunctionInference
+            return FunctionInference(self.model, self.search_handler, self.prompt_config, model_limit, search_limit)
+        raise ValueError(f"Unknown search method: {self.search_method}")
+
+    def evaluate_dataset(self,
+                         dataset_name: str,
+                         data: List[Dict[str, Any]],
+                         output_dir: str,
+                         resume_from_checkpoint: bool = True,
+                         on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> str:
+        """
+        Evaluate a dataset.
+
+        Results are not kept in memory: each one goes to the checkpoint and to on_result
+        as it completes; read them back in dataset order with iter_checkpoint().
+
+        Args:
+            dataset_name: Name of the dataset
+            data: List of dataset items
+            output_dir: Output directory for results
+            resume_from_checkpoint: Skip items whose id is already in the checkpoint
+            on_result: Called once per item with each result (resumed results first),
+                e.g. MetricsAggregator.add
+
+        Returns:
+            Path of the checkpoint holding the results
+        """
+        return asyncio.run(self._evaluate_dataset(dataset_name, data, output_dir, resume_from_checkpoint, on_result))
+
+    async def _evaluate_dataset(self, dataset_name, data, output_dir, resume_from_checkpoint, on_result):
+        checkpoint_file = os.path.join(output_dir, f"{dataset_name}_checkpoint.jsonl")
+        reset_checkpoint(checkpoint_file, resume_from_checkpoint)
+        completed = load_checkpoint(checkpoint_file, on_result, {item['id'] for item in data})
+        if completed:
+            print(f"Resumed from checkpoint: {len(completed)} completed")
+
+        remaining = [item for item in data if item['id'] not in completed]
+        if not remaining:
+            print("All items already completed!")
+            return checkpoint_file
+
+        print(f"Evaluating {len(remaining)} items with concurrency {self.max_concurrency} "
+              f"(model {self.model_concurrency}, search {self.search_concurrency})...")
+
+        inference = self._create_inference(asyncio.Semaphore(self.model_concurrency),
+                                           asyncio.Semaphore(self.search_concurrency))
+        writer = OrderedCheckpointWriter(checkpoint_file, self.checkpoint_every)
+        jobs = iter(enumerate(remaining))
+
+        async def worker(pbar):
+            for position, item in jobs:
+                try:
+                    result = await inference.arun(item['question'])
+                    result = build_result(item, result, self.search_method)
+                except Exception as e:
+                    result = build_error_result(item, e)
+                writer.add(position, result)
+                if on_result is not None:
+                    on_result(result)
+                pbar.update(1)
+
+        try:
+            with tqdm(total=len(remaining), desc=f"Evaluating {dataset_name}") as pbar:
+                await asyncio.gather(*(worker(pbar) for _ in range(min(self.max_concurrency, len(remaining)))))
+        finally:
+            writer.close()
+            # Clients are bound to this event loop; drop them so the next dataset gets fresh ones
+            await self.model.aclose()
+            await self.search_handler.aclose()
+
+        print(f"Evaluation complete! Total results: {len(completed) + len(remaining)}")
+        return checkpoint_file
@@ -0,0 +1,10 @@
+"""Concurrency helpers for async evaluation."""
+
+import asyncio
+import contextlib
+from typing import Optional
+
+
+def bounded(semaphore: Optional[asyncio.Semaphore]):
+    """async-with context for an optional concurrency limit."""
+    return semaphore if semaphore is not None else contextlib.nullcontext()
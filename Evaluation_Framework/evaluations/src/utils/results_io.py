@@ -0,0 +1,115 @@
+"""Streaming read / write of evaluation result files."""
+
+import json
+import os
+from typing import Dict, Any, Iterable, Iterator, Optional
+
+
+RESULTS_FORMATS = ('jsonl', 'json')
+
+
+def results_path(output_dir: str, dataset_name: str, results_format: str = 'jsonl') -> str:
+    """Path of a dataset's result file for the given format."""
+    if results_format not in RESULTS_FORMATS:
+        raise ValueError(f"Unknown results format: {results_format}")
+    return os.path.join(output_dir, f"{dataset_name}_results.{results_format}")
+
+
+def metrics_path(result_file: str) -> str:
+    """Metrics file written next to a JSONL result file: nq_results.jsonl -> nq_metrics.json."""
+    base = str(result_file)
+    if base.endswith('_results.jsonl'):
+        base = base[:-len('_results.jsonl')]
+    else:
+        base = os.path.splitext(base)[0]
+    return base + '_metrics.json'
+
+
+def iter_results(result_file: str) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over the results in a result file.
+
+    JSONL files are read one line at a time, so memory stays constant however large the
+    transcripts are. Legacy `{dataset}_results.json` files are a single JSON document and
+    are loaded whole.
+    """
+    if str(result_file).endswith('.jsonl'):
+        with open(result_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        return
+
+    with open(result_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict) and 'results' in data:
+        yield from data['results']
+    elif isinstance(data, list):
+        yield from data
+    else:
+        yield data
+
+
+def write_results(result_file: str, results: Iterable[Dict[str, Any]], aggregator=None) -> int:
+    """
+    Stream results to a JSONL file, one result per line.
+
+    Args:
+        result_file: Output path
+        results: Results to write (any iterable)
+        aggregator: Optional MetricsAggregator updated with each result as it is written
+
+    Returns:
+        Number of results written
+    """
+    count = 0
+    tmp_file = str(result_file) + '.tmp'
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        for result in results:
+            if aggregator is not None:
+                aggregator.add(result)
+            f.write(json.dumps(result, ensure_ascii=False) + '\n')
+            count += 1
+    os.replace(tmp_file, result_file)
+    return count
+
+
+def write_json_results(result_file: str, dataset_name: str, num_examples: int, metrics: Dict[str, float],
+                       results: Iterable[Dict[str, Any]]) -> int:
+    """
+    Write the legacy single-document `{dataset}_results.json` (indent=2), streaming the results
+    into its "results" list one at a time instead of building the whole document in memory.
+
+    Returns:
+        Number of results written
+    """
+    header = json.dumps({'dataset': dataset_name, 'num_examples': num_examples, 'metrics': metrics}, indent=2)
+    count = 0
+    tmp_file = str(result_file) + '.tmp'
+    with open(tmp_file, 'w') as f:
+        f.write(header[:-2] + ',\n  "results": [')
+        for result in results:
+            f.write((',' if count else '') + '\n    ' + json.dumps(result, indent=2).replace('\n', '\n    '))
+            count += 1
+        f.write('\n  ]\n}' if count else ']\n}')
+    os.replace(tmp_file, result_file)
+    return count
+
+
+def read_metrics(result_file: str) -> Optional[Dict[str, Any]]:
+    """Contents of the metrics file accompanying a JSONL result file, if any."""
+    path = metrics_path(result_file)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_metrics(result_file: str, dataset_name: str, num_examples: int, metrics: Dict[str, float]):
+    """Write the metrics file that accompanies a JSONL result file."""
+    with open(metrics_path(result_file), 'w', encoding='utf-8') as f:
+        json.dump({
+            'dataset': dataset_name,
+            'num_examples': num_examples,
+            'metrics': metrics
+        }, f, indent=2)
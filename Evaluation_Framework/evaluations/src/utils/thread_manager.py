@@ -3,12 +3,14 @@
 import threading
 import queue
 import time
-from typing import Dict, Any, List, Callable, Optional
+from typing import Dict, Any, List, Callable, Iterator, Optional, Set
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import json
 import os
 from tqdm import tqdm
 
+from .results_io import write_results
+
 
 class ThreadSafeCounter:
     """Thread-safe counter for tracking progress."""
@@ -27,18 +29,157 @@ class ThreadSafeCounter:
             return self._value
 
 
+def build_result(item: Dict[str, Any], result: Dict[str, Any], search_method: str) -> Dict[str, Any]:
+    """Simplified per-item result stored in checkpoints and result files."""
+    simplified_result = {
+        'id': item['id'],
+        'question': item['question'],
+        'gold_answer': item['answers'][0] if item['answers'] else '',
+        'prediction': result.get('answer', '')
+    }
+
+    # Add method-specific data
+    if search_method == 'tag':
+        simplified_result['response'] = result.get('response', '')
+        if result.get('generation_stats'):
+            simplified_result['generation_stats'] = result['generation_stats']
+    elif search_method == 'function':
+        simplified_result['messages'] = result.get('messages', [])
+    return simplified_result
+
+
+def build_error_result(item: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+    return {
+        'id': item['id'],
+        'question': item['question'],
+        'gold_answer': item['answers'][0] if item['answers'] else '',
+        'prediction': '',
+        'error': str(error)
+    }
+
+
+def load_checkpoint(checkpoint_file: str,
+                    on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+                    ids: Optional[Set[Any]] = None) -> Set[Any]:
+    """
+    Ids of the completed results, read one line at a time; a truncated last line (crash
+    mid-write) is ignored. on_result is called with each completed result whose id is in
+    ids (all ids when None), e.g. to feed a MetricsAggregator with the resumed results.
+    """
+    completed = set()
+    if not os.path.exists(checkpoint_file):
+        return completed
+    with open(checkpoint_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                result = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if ids is not None and result['id'] not in ids:
+                continue
+            if on_result is not None and result['id'] not in completed:
+                on_result(result)
+            completed.add(result['id'])
+    return completed
+
+
+def iter_checkpoint(checkpoint_file: str, data: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """
+    Checkpointed results of data's items in dataset order, read back lazily.
+
+    The checkpoint is in completion order; one pass records the byte offset of each id's
+    line, then lines are read one at a time by seeking, so only the offsets stay in memory.
+    Items without a result are skipped.
+    """
+    offsets = {}
+    with open(checkpoint_file, 'rb') as f:
+        offset = 0
+        for line in f:
+            if line.strip():
+                try:
+                    offsets[json.loads(line)['id']] = offset
+                except json.JSONDecodeError:
+                    pass
+            offset += len(line)
+        for item in data:
+            if item['id'] in offsets:
+                f.seek(offsets[item['id']])
+                yield json.loads(f.readline())
+
+
+def reset_checkpoint(checkpoint_file: str, resume_from_checkpoint: bool):
+    """Without resuming, start a fresh checkpoint so every id appears in it at most once."""
+    if not resume_from_checkpoint and os.path.exists(checkpoint_file):
+        os.remove(checkpoint_file)
+
+
+def open_checkpoint(checkpoint_file: str):
+    """Open a checkpoint for appending, terminating a partial last line left by a crash."""
+    partial = False
+    if os.path.exists(checkpoint_file) and os.path.getsize(checkpoint_file) > 0:
+        with open(checkpoint_file, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            partial = f.read(1) != b'\n'
+    f = open(checkpoint_file, 'a', encoding='utf-8')
+    if partial:
+        f.write('\n')
+    return f
+
+
 class ThreadSafeFileWriter:
-    """Thread-safe file writer for checkpoint files."""
-    
-    def __init__(self, file_path: str):
+    """
+    Checkpoint writer: worker threads enqueue lines, a single writer thread owns the file.
+
+    The file is opened once; queued lines are written in batches and the file is flushed
+    and fsynced every flush_every lines and on close().
+    """
+
+    _STOP = object()
+
+    def __init__(self, file_path: str, flush_every: int = 10):
         self.file_path = file_path
-        self._lock = threading.Lock()
-    
+        self.flush_every = max(1, flush_every)
+        self._queue = queue.Queue()
+        self._file = open_checkpoint(file_path)
+        self._thread = threading.Thread(target=self._run, name="checkpoint-writer", daemon=True)
+        self._thread.start()
+
     def write_line(self, data: Dict[str, Any]):
-        """Write a single line to the file."""
-        with self._lock:
-            with open(self.file_path, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(data, ensure_ascii=False) + '\n')
+        """Queue a single line for the writer thread."""
+        self._queue.put(json.dumps(data, ensure_ascii=False) + '\n')
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _run(self):
+        unsynced = 0
+        stopping = False
+        while not stopping:
+            lines = [self._queue.get()]
+            # Drain whatever else is queued so bursts become one write
+            while True:
+                try:
+                    lines.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if lines[-1] is self._STOP:
+                lines.pop()
+                stopping = True
+            self._file.write(''.join(lines))
+            unsynced += len(lines)
+            if unsynced >= self.flush_every or stopping:
+                self._sync()
+                unsynced = 0
+        self._file.close()
+
+    def close(self):
+        """Write out everything queued, fsync and close the file."""
+        if self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join()
 
 
 class MultiThreadEvaluator:
@@ -71,8 +212,6 @@ class MultiThreadEvaluator:
         
         # Thread-safe components
         self.counter = ThreadSafeCounter()
-        self.results_lock = threading.Lock()
-        self.results = []
         
     def _create_worker_components(self):
         """Create model and search components for a worker thread."""
@@ -107,20 +246,7 @@ class MultiThreadEvaluator:
             
             # Run inference
             result = inference.run(item['question'])
-            
-            # Create simplified result
-            simplified_result = {
-                'id': item['id'],
-                'question': item['question'],
-                'gold_answer': item['answers'][0] if item['answers'] else '',
-                'prediction': result.get('answer', '')
-            }
-            
-            # Add method-specific data
-            if self.search_method == 'tag':
-                simplified_result['response'] = result.get('response', '')
-            elif self.search_method == 'function':
-                simplified_result['messages'] = result.get('messages', [])
+            simplified_result = build_result(item, result, self.search_method)
             
             # Write checkpoint if writer provided
             if checkpoint_writer:
@@ -129,13 +255,7 @@ class MultiThreadEvaluator:
             return simplified_result
             
         except Exception as e:
-            error_result = {
-                'id': item['id'],
-                'question': item['question'],
-                'gold_answer': item['answers'][0] if item['answers'] else '',
-                'prediction': '',
-                'error': str(e)
-            }
+            error_result = build_error_result(item, e)
             
             if checkpoint_writer:
                 checkpoint_writer.write_line(error_result)
@@ -146,60 +266,66 @@ class MultiThreadEvaluator:
                         dataset_name: str,
                         data: List[Dict[str, Any]], 
                         output_dir: str,
-                        resume_from_checkpoint: bool = True) -> List[Dict[str, Any]]:
+                        resume_from_checkpoint: bool = True,
+                        on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> str:
         """
         Evaluate a dataset using multiple threads.
         
+        Results are not kept in memory: each one goes to the checkpoint and to on_result
+        as it completes; read them back in dataset order with iter_checkpoint().
+        
         Args:
             dataset_name: Name of the dataset
             data: List of dataset items
             output_dir: Output directory for results
             resume_from_checkpoint: Whether to resume from existing checkpoint
+            on_result: Called once per item, in the main thread, with each result (resumed
+                results first), e.g. MetricsAggregator.add
             
         Returns:
-            List of evaluation results
+            Path of the checkpoint holding the results
         """
         checkpoint_file = os.path.join(output_dir, f"{dataset_name}_checkpoint.jsonl")
-        checkpoint_writer = ThreadSafeFileWriter(checkpoint_file)
-        
-        # Load existing results if resuming
-        completed_results = []
-        start_index = 0
+        reset_checkpoint(checkpoint_file, resume_from_checkpoint)
         
-        if resume_from_checkpoint and os.path.exists(checkpoint_file):
-            with open(checkpoint_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    if line.strip():
-                        completed_results.append(json.loads(line))
-            start_index = len(completed_results)
-            print(f"Resumed from checkpoint: {start_index} completed")
+        # Completed items are matched by id, since the checkpoint is written in
+        # completion order rather than dataset order
+        completed = load_checkpoint(checkpoint_file, on_result, {item['id'] for item in data})
+        if completed:
+            print(f"Resumed from checkpoint: {len(completed)} completed")
         
         # Prepare remaining items
-        remaining_items = data[start_index:]
+        remaining_items = [item for item in data if item['id'] not in completed]
         
         if not remaining_items:
             print("All items already completed!")
-            return completed_results
+            return checkpoint_file
         
         print(f"Evaluating {len(remaining_items)} items with {self.max_workers} workers...")
+        checkpoint_writer = ThreadSafeFileWriter(checkpoint_file, self.checkpoint_every)
         
-        # Use ThreadPoolExecutor for parallel execution
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all tasks
-            future_to_item = {
-                executor.submit(self._evaluate_single_item, item, checkpoint_writer): item
-                for item in remaining_items
-            }
-            
-            # Process completed tasks with progress bar
-            with tqdm(total=len(remaining_items), desc=f"Evaluating {dataset_name}") as pbar:
-                for future in as_completed(future_to_item):
-                    try:
-                        result = future.result()
+        try:
+            # Use ThreadPoolExecutor for parallel execution
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                # Submit all tasks
+                future_to_item = {
+                    executor.submit(self._evaluate_single_item, item, checkpoint_writer): item
+                    for item in remaining_items
+                }
+                
+                # Process completed tasks with progress bar
+                with tqdm(total=len(remaining_items), desc=f"Evaluating {dataset_name}") as pbar:
+                    for future in as_completed(future_to_item):
+                        item = future_to_item.pop(future)
+                        try:
+                            result = future.result()
+                        except Exception as e:
+                            print(f"Error processing item {item['id']}: {e}")
+                            result = build_error_result(item, e)
+                            checkpoint_writer.write_line(result)
                         
-                        # Thread-safe result collection
-                        with self.results_lock:
-                            completed_results.append(result)
+                        if on_result is not None:
+                            on_result(result)
                         
                         # Update progress
                         pbar.update(1)
@@ -208,14 +334,11 @@ class MultiThreadEvaluator:
                         current_count = self.counter.increment()
                         if current_count % self.checkpoint_every == 0:
                             print(f"\nCompleted {current_count} items")
-                            
-                    except Exception as e:
-                        item = future_to_item[future]
-                        print(f"Error processing item {item['id']}: {e}")
-                        pbar.update(1)
+        finally:
+            checkpoint_writer.close()
         
-        print(f"Evaluation complete! Total results: {len(completed_results)}")
-        return completed_results
+        print(f"Evaluation complete! Total results: {len(completed) + len(remaining_items)}")
+        return checkpoint_file
 
 
 class BatchProcessor:
@@ -237,7 +360,8 @@ class BatchProcessor:
     def process_dataset(self, 
                        dataset_name: str,
                        data: List[Dict[str, Any]], 
-                       output_dir: str) -> List[Dict[str, Any]]:
+                       output_dir: str,
+                       on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> int:
         """
         Process dataset in batches.
         
@@ -245,11 +369,12 @@ class BatchProcessor:
             dataset_name: Name of the dataset
             data: List of dataset items
             output_dir: Output directory for results
+            on_result: Called with each result as it completes
             
         Returns:
-            List of all evaluation results
+            Number of results written
         """
-        all_results = []
+        total = 0
         total_batches = (len(data) + self.batch_size - 1) // self.batch_size
         
         print(f"Processing {len(data)} items in {total_batches} batches of {self.batch_size}")
@@ -262,18 +387,16 @@ class BatchProcessor:
             print(f"\nProcessing batch {batch_idx + 1}/{total_batches} (items {start_idx}-{end_idx-1})")
             
             # Process batch
-            batch_results = self.evaluator.evaluate_dataset(
+            checkpoint_file = self.evaluator.evaluate_dataset(
                 f"{dataset_name}_batch_{batch_idx}",
                 batch_data,
                 output_dir,
-                resume_from_checkpoint=True
+                resume_from_checkpoint=True,
+                on_result=on_result
             )
             
-            all_results.extend(batch_results)
-            
-            # Save intermediate results
-            intermediate_file = os.path.join(output_dir, f"{dataset_name}_batch_{batch_idx}_results.json")
-            with open(intermediate_file, 'w', encoding='utf-8') as f:
-                json.dump(batch_results, f, indent=2, ensure_ascii=False)
+            # Save intermediate results, streamed back from the batch checkpoint
+            intermediate_file = os.path.join(output_dir, f"{dataset_name}_batch_{batch_idx}_results.jsonl")
+            total += write_results(intermediate_file, iter_checkpoint(checkpoint_file, batch_data))
         
-        return all_results
+        return total
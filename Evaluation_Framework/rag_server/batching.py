@@ -0,0 +1,169 @@
+"""
+Micro-batching dispatcher for the retrieval server.
+
+Concurrent /retrieve requests are queued and gathered into one batch until either
+max_batch_queries queries are pending or the oldest request has waited max_wait_ms.
+The batch is run through a single retriever.batch_search call (one Encoder.encode and
+one index.search) on a dedicated worker thread, and each request gets its own slice back.
+"""
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Tuple
+
+
+class QueueFullError(Exception):
+    """Raised when a request would take the dispatcher queue past max_queue_queries queries"""
+
+
+class _Pending:
+    __slots__ = ("queries", "topk", "future", "enqueued_at")
+
+    def __init__(self, queries, topk, future):
+        self.queries = queries
+        self.topk = topk
+        self.future = future
+        self.enqueued_at = time.perf_counter()
+
+
+class MicroBatcher:
+    """
+    Args:
+        search_fn: search_fn(query_list, num) -> (results, scores), one list per query
+        max_batch_queries: flush once this many queries are pending
+        max_wait_ms: flush once the oldest pending request has waited this long
+        max_queue_queries: reject new requests beyond this many pending queries (0: unbounded);
+            a request is always admitted into an empty queue, however many queries it has
+    """
+    def __init__(self, search_fn: Callable, max_batch_queries: int = 64, max_wait_ms: float = 5.0,
+                 max_queue_queries: int = 4096):
+        self.search_fn = search_fn
+        self.max_batch_queries = max_batch_queries
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_queue_queries = max_queue_queries
+
+        self._pending = deque()
+        self._pending_queries = 0
+        self._wakeup = None
+        self._task = None
+        # One worker keeps encoder / index calls serialized, as in the single-request path
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="retrieval-batch")
+
+        self.requests = 0
+        self.queries = 0
+        self.batches = 0
+        self.rejected = 0
+        self.flush_full = 0
+        self.flush_timeout = 0
+        self.max_queue_depth = 0
+        self.total_wait = 0.0
+        self.total_search = 0.0
+
+    def start(self):
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._executor.shutdown(wait=False)
+
+    async def submit(self, queries: List[str], topk: int) -> Tuple[List[list], List[list]]:
+        """Queue queries and wait for their (results, scores)"""
+        if not queries:
+            return [], []
+        if (self.max_queue_queries and self._pending_queries
+                and self._pending_queries + len(queries) > self.max_queue_queries):
+            self.rejected += 1
+            raise QueueFullError(f"{self._pending_queries} queries already queued")
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(_Pending(list(queries), topk, future))
+        self._pending_queries += len(queries)
+        self.max_queue_depth = max(self.max_queue_depth, self._pending_queries)
+        self.requests += 1
+        self._wakeup.set()
+        return await future
+
+    def _take_batch(self):
+        batch, size = [], 0
+        while self._pending and (not batch or size + len(self._pending[0].queries) <= self.max_batch_queries):
+            item = self._pending.popleft()
+            batch.append(item)
+            size += len(item.queries)
+        self._pending_queries -= size
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            # Gather until the batch is full or the oldest request hits its deadline
+            deadline = self._pending[0].enqueued_at + self.max_wait
+            while self._pending_queries < self.max_batch_queries:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            if self._pending_queries >= self.max_batch_queries:
+                self.flush_full += 1
+            else:
+                self.flush_timeout += 1
+
+            batch = self._take_batch()
+            started = time.perf_counter()
+            for item in batch:
+                self.total_wait += started - item.enqueued_at
+            queries = [query for item in batch for query in item.queries]
+            topk = max(item.topk for item in batch)
+            try:
+                results, scores = await loop.run_in_executor(self._executor, self.search_fn, queries, topk)
+            except Exception as e:
+                for item in batch:
+                    if not item.future.done():
+                        item.future.set_exception(e)
+                continue
+            self.total_search += time.perf_counter() - started
+            self.batches += 1
+            self.queries += len(queries)
+
+            # Fan out, trimming each request back to its own topk
+            offset = 0
+            for item in batch:
+                n = len(item.queries)
+                item_results = [docs[:item.topk] for docs in results[offset:offset + n]]
+                item_scores = [list(s[:item.topk]) for s in scores[offset:offset + n]]
+                offset += n
+                if not item.future.done():
+                    item.future.set_result((item_results, item_scores))
+
+    def stats(self):
+        return {
+            "max_batch_queries": self.max_batch_queries,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "queue_depth": self._pending_queries,
+            "max_queue_depth": self.max_queue_depth,
+            "requests": self.requests,
+            "queries": self.queries,
+            "batches": self.batches,
+            "rejected": self.rejected,
+            "flush_full": self.flush_full,
+            "flush_timeout": self.flush_timeout,
+            "avg_batch_queries": round(self.queries / self.batches, 2) if self.batches else 0.0,
+            "avg_wait_ms": round(self.total_wait / self.requests * 1000.0, 3) if self.requests else 0.0,
+            "avg_search_ms": round(self.total_search / self.batches * 1000.0, 3) if self.batches else 0.0,
+        }
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Document-store fetch latency and memory across repeated takes.
+
+Real store (random ids, as the server fetches (batch x topk) results):
+    python3 rag_server/benchmark_doc_store.py --doc_store /path/to/wiki-18.arrow --batch 64 --topk 3
+
+Synthetic corpus built in a temporary directory (many small record batches):
+    python3 rag_server/benchmark_doc_store.py --synthetic --num_docs 400000 --batch_rows 20000
+
+Rows are served straight from the memory-mapped file, so anonymous memory (RssAnon) must stay
+flat however many takes are made; the script exits non-zero if it grows by more than
+--max_rss_growth_mb from opening the store to the last take (Linux only).
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from doc_store import DocStore, build_doc_store
+
+
+def rss_anon_mb() -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("RssAnon:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def write_synthetic_corpus(path: str, num_docs: int, seed: int = 0):
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(num_docs):
+            contents = f"\"Title {i}\"\n" + " ".join(f"word{rng.randint(0, 50000)}" for _ in range(rng.randint(20, 150)))
+            f.write(json.dumps({"id": str(i), "contents": contents}) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DocStore.take latency and memory.")
+    parser.add_argument("--doc_store", type=str, default=None, help="Arrow document store built by doc_store.py.")
+    parser.add_argument("--synthetic", action="store_true", help="Build a synthetic store instead.")
+    parser.add_argument("--num_docs", type=int, default=400000)
+    parser.add_argument("--batch_rows", type=int, default=20000, help="Rows per record batch of the synthetic store.")
+    parser.add_argument("--batch", type=int, default=64, help="Queries per fetch.")
+    parser.add_argument("--topk", type=int, default=3)
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--max_rss_growth_mb", type=float, default=32.0)
+    args = parser.parse_args()
+    if not args.doc_store and not args.synthetic:
+        parser.error("pass --doc_store or --synthetic")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.doc_store
+        if args.synthetic:
+            corpus = os.path.join(tmp, "corpus.jsonl")
+            write_synthetic_corpus(corpus, args.num_docs)
+            path = os.path.join(tmp, "corpus.arrow")
+            build_doc_store(corpus, path, args.batch_rows)
+            os.remove(corpus)
+
+        store = DocStore(path)
+        print(f"{path}: {len(store)} documents in {len(store.batches)} record batches, "
+              f"{os.path.getsize(path) / 2 ** 20:.0f} MB")
+
+        rng = np.random.default_rng(0)
+        size = args.batch * args.topk
+        # Measured before the first take: a take that copies the store does so on every call
+        rss_before = rss_anon_mb()
+        for _ in range(args.warmup):
+            store.take(rng.integers(0, len(store), size))
+        latencies = []
+        for _ in range(args.iterations):
+            doc_idxs = rng.integers(0, len(store), size)
+            doc_idxs[0] = -1
+            start = time.perf_counter()
+            docs = store.take(doc_idxs)
+            latencies.append(time.perf_counter() - start)
+            if args.synthetic and (docs[0] is not None or any(
+                    doc["id"] != str(idx) for doc, idx in zip(docs[1:], doc_idxs[1:]))):
+                print("take returned the wrong rows")
+                sys.exit(1)
+        growth = rss_anon_mb() - rss_before
+
+    latencies = np.array(latencies) * 1000.0
+    print(f"take({size}): p50 {np.percentile(latencies, 50):.2f} ms, p99 {np.percentile(latencies, 99):.2f} ms")
+    print(f"RssAnon {rss_before:.0f} MB -> {rss_before + growth:.0f} MB over {args.warmup + args.iterations} takes")
+    if growth > args.max_rss_growth_mb:
+        print(f"\nRSS check FAILED (grew {growth:.0f} MB > {args.max_rss_growth_mb:.0f} MB)")
+        sys.exit(1)
+    print("\nRSS flat across takes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Query-encoder throughput and accuracy per backend (default model: intfloat/e5-base-v2).
+
+Run from the Evaluation_Framework root:
+    python3 rag_server/benchmark_encoder.py --backends torch int8 onnx --device cpu --threads 8
+    python3 rag_server/benchmark_encoder.py --backends torch --device cuda --batch_sizes 1 64 512
+
+Every backend is compared against the fp32 torch encoder on CPU over the benchmark queries;
+the script exits non-zero if any backend's min cosine similarity is below 1 - tolerance.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+
+from query_encoder import Encoder, ENCODER_BACKENDS, compare_embeddings
+
+WORDS = (
+    "who what when where which how many the a of in first largest city country river film album "
+    "song band king queen president war world cup team player wrote directed founded born died "
+    "capital population language currency united states france china brazil moon"
+).split()
+
+
+def synthetic_queries(num_queries: int, seed: int = 0):
+    """Search-style queries with a long-tailed length distribution (mostly short, a few long)"""
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(num_queries):
+        length = min(int(rng.expovariate(1 / 8)) + 3, 60)
+        queries.append(" ".join(rng.choice(WORDS) for _ in range(length)))
+    return queries
+
+
+def load_queries(path: str, num_queries: int):
+    """Questions from a JSONL dataset file ("question" field) or one query per line"""
+    queries = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            queries.append(json.loads(line)["question"] if line.startswith("{") else line)
+            if len(queries) >= num_queries:
+                break
+    return queries
+
+
+def throughput(encoder: Encoder, queries, batch_size: int, warmup: int = 2) -> float:
+    batches = [queries[i:i + batch_size] for i in range(0, len(queries), batch_size)]
+    for batch in batches[:warmup]:
+        encoder.encode(batch)
+    start = time.perf_counter()
+    for batch in batches:
+        encoder.encode(batch)
+    return len(queries) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark query-encoder backends.")
+    parser.add_argument("--model", type=str, default="intfloat/e5-base-v2", help="Model name or path.")
+    parser.add_argument("--retrieval_method", type=str, default="e5", help="Encoder name (selects the query prefix).")
+    parser.add_argument("--backends", nargs="+", default=list(ENCODER_BACKENDS), choices=ENCODER_BACKENDS)
+    parser.add_argument("--device", type=str, default="cpu", help="Device of the torch backend: cpu, cuda or auto.")
+    parser.add_argument("--threads", type=int, default=None, help="CPU threads for encoding.")
+    parser.add_argument("--batch_sizes", type=int, nargs="+", default=[1, 16, 64, 256])
+    parser.add_argument("--bucket_size", type=int, default=0, help="Length-bucketed padding bucket size (0 disables).")
+    parser.add_argument("--compile", action="store_true", help="torch.compile the torch backend.")
+    parser.add_argument("--onnx_path", type=str, default=None, help="Exported ONNX encoder (default: <model>/encoder.onnx for a local model, else ~/.cache/rag_server/onnx/<model id>/encoder.onnx).")
+    parser.add_argument("--queries", type=str, default=None, help="JSONL dataset or text file of queries (default: synthetic).")
+    parser.add_argument("--num_queries", type=int, default=1024)
+    parser.add_argument("--max_length", type=int, default=256)
+    parser.add_argument("--tolerance", type=float, default=1e-2, help="Required min cosine to the fp32 reference is 1 - tolerance.")
+    args = parser.parse_args()
+
+    queries = load_queries(args.queries, args.num_queries) if args.queries else synthetic_queries(args.num_queries)
+    print(f"{len(queries)} queries, model {args.model}, threads {args.threads or 'default'}")
+
+    reference = Encoder(args.retrieval_method, args.model, "mean", args.max_length, use_fp16=False,
+                        device="cpu", backend="torch", num_threads=args.threads)
+    reference_emb = reference.encode(queries)
+    del reference
+
+    ok = True
+    rows = []
+    for backend in args.backends:
+        encoder = Encoder(args.retrieval_method, args.model, "mean", args.max_length, use_fp16=args.device != "cpu",
+                          device=args.device, backend=backend, num_threads=args.threads, compile=args.compile,
+                          bucket_size=args.bucket_size, onnx_path=args.onnx_path)
+        report = compare_embeddings(reference_emb, encoder.encode(queries))
+        passed = report["min_cosine"] >= 1.0 - args.tolerance
+        ok &= passed
+        qps = {batch_size: throughput(encoder, queries, batch_size) for batch_size in args.batch_sizes}
+        rows.append((f"{backend}/{encoder.device}", report, passed, qps))
+        del encoder
+
+    print(f"\n{'backend':12s} {'min cos':>9s} {'max |diff|':>11s} {'ok':>4s}  "
+          + "  ".join(f"{'bs=' + str(batch_size):>9s}" for batch_size in args.batch_sizes) + "   (queries/s)")
+    for name, report, passed, qps in rows:
+        print(f"{name:12s} {report['min_cosine']:9.5f} {report['max_abs_diff']:11.5f} {'yes' if passed else 'NO':>4s}  "
+              + "  ".join(f"{qps[batch_size]:9.1f}" for batch_size in args.batch_sizes))
+
+    if not ok:
+        print(f"\nTolerance check FAILED (min cosine < {1.0 - args.tolerance})")
+        sys.exit(1)
+    print("\nAll backends within tolerance")
+
+
+if __name__ == "__main__":
+    main()
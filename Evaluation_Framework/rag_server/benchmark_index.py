@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Recall-vs-latency benchmark of compressed FAISS indexes against the flat index.
+
+Real indexes (query embeddings as a .npy matrix, e.g. encoded benchmark questions):
+    python3 rag_server/benchmark_index.py --flat e5_Flat.index --queries queries.npy \
+        --candidates e5_IVF16384_PQ64.index e5_HNSW32.index --index_mmap
+
+Synthetic clustered vectors, building every index type in-process:
+    python3 rag_server/benchmark_index.py --synthetic --num_docs 200000 --dim 768
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import faiss
+import numpy as np
+
+from faiss_index import VectorSource, build_index, factory_string, load_index, set_search_params
+
+
+def recall_at_k(truth, found):
+    k = truth.shape[1]
+    hits = sum(len(set(t[t >= 0]) & set(f[f >= 0])) for t, f in zip(truth, found))
+    return hits / (len(truth) * k)
+
+
+def timed_search(index, queries, k, batch_size):
+    start = time.perf_counter()
+    found = [index.search(queries[i:i + batch_size], k)[1] for i in range(0, len(queries), batch_size)]
+    return np.vstack(found), (time.perf_counter() - start) / len(queries) * 1000.0
+
+
+def sweep(name, index, queries, truth, k, batch_size):
+    """Print one result row per nprobe / efSearch setting (a single row for other index types)"""
+    settings = [(None, None)]
+    try:
+        faiss.extract_index_ivf(index)
+        settings = [(nprobe, None) for nprobe in (8, 16, 32, 64, 128, 256)]
+    except RuntimeError:
+        if isinstance(index, faiss.IndexHNSW):
+            settings = [(None, ef) for ef in (16, 32, 64, 128, 256)]
+    for nprobe, ef_search in settings:
+        set_search_params(index, nprobe, ef_search)
+        found, ms_batched = timed_search(index, queries, k, batch_size)
+        _, ms_single = timed_search(index, queries[:min(len(queries), 200)], k, 1)
+        knob = f"nprobe={nprobe}" if nprobe else f"efSearch={ef_search}" if ef_search else "-"
+        print(f"{name:<36} {knob:<14} recall@{k}={recall_at_k(truth, found):.4f}  "
+              f"batch={ms_batched:7.3f}ms/q  single={ms_single:7.3f}ms/q")
+
+
+def synthetic_data(num_docs, dim, num_queries, seed=0):
+    """Clustered unit vectors, so that coarse quantization behaves like it does on real embeddings"""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((1024, dim), dtype=np.float32)
+    docs = centers[rng.integers(0, len(centers), num_docs)] + 0.5 * rng.standard_normal((num_docs, dim), dtype=np.float32)
+    queries = centers[rng.integers(0, len(centers), num_queries)] + 0.5 * rng.standard_normal((num_queries, dim), dtype=np.float32)
+    faiss.normalize_L2(docs)
+    faiss.normalize_L2(queries)
+    return docs, queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FAISS index recall / latency benchmark")
+    parser.add_argument("--flat", type=str, help="Flat index used as ground truth.")
+    parser.add_argument("--candidates", type=str, nargs="*", default=[], help="Index files to compare.")
+    parser.add_argument("--queries", type=str, help="Query embeddings (.npy).")
+    parser.add_argument("--index_mmap", action="store_true", help="Memory-map candidate indexes.")
+    parser.add_argument("--synthetic", action="store_true")
+    parser.add_argument("--num_docs", type=int, default=200000)
+    parser.add_argument("--num_queries", type=int, default=1000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--topk", type=int, default=3)
+    parser.add_argument("--batch_size", type=int, default=64)
+    parser.add_argument("--threads", type=int, default=0, help="OpenMP threads (0: FAISS default).")
+    args = parser.parse_args()
+
+    if args.threads:
+        faiss.omp_set_num_threads(args.threads)
+
+    if args.synthetic:
+        docs, queries = synthetic_data(args.num_docs, args.dim, args.num_queries)
+        workdir = tempfile.mkdtemp(prefix="faiss_bench_")
+        source_path = os.path.join(workdir, "docs.npy")
+        np.save(source_path, docs)
+        flat = faiss.IndexFlatIP(args.dim)
+        flat.add(docs)
+        nlist = max(16, int(4 * np.sqrt(args.num_docs)))
+        pq_m = args.dim // 8 if args.dim % 8 == 0 else 8
+        source = VectorSource(source_path)
+        candidates = {}
+        for index_type in ("ivfpq", "opq_ivfpq", "hnsw"):
+            factory = factory_string(index_type, nlist=nlist, pq_m=pq_m)
+            candidates[factory] = build_index(source, factory, train_size=min(args.num_docs, 50 * nlist),
+                                              ef_construction=100)
+        os.remove(source_path)
+        os.rmdir(workdir)
+    else:
+        if not (args.flat and args.queries and args.candidates):
+            parser.error("--flat, --queries and --candidates are required without --synthetic")
+        queries = np.ascontiguousarray(np.load(args.queries), dtype=np.float32)[:args.num_queries]
+        flat = load_index(args.flat, use_mmap=args.index_mmap)
+        candidates = {os.path.basename(path): load_index(path, use_mmap=args.index_mmap) for path in args.candidates}
+
+    truth, flat_ms = timed_search(flat, queries, args.topk, args.batch_size)
+    _, flat_single = timed_search(flat, queries[:min(len(queries), 200)], args.topk, 1)
+    print(f"{'Flat (ground truth)':<36} {'-':<14} recall@{args.topk}=1.0000  "
+          f"batch={flat_ms:7.3f}ms/q  single={flat_single:7.3f}ms/q")
+    for name, index in candidates.items():
+        sweep(name, index, queries, truth, args.topk, args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
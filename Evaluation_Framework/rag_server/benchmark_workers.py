@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+QPS scaling of the retrieval server across worker processes.
+
+For each --workers count, starts retrieval_server.py with the given server arguments (after "--"),
+waits until every worker process reports ready on /ready, drives the shared port with the
+load_test.py HTTP client and prints QPS, speedup over one worker and per-worker efficiency, plus
+the workers' memory after the run (from /proc/<pid>/smaps_rollup; Linux only):
+
+    python3 rag_server/benchmark_workers.py --workers 1 2 4 8 --concurrency 64 -- \\
+        --faiss_cpu --index_path /path/to/e5_IVF16384_PQ64.index --nprobe 64 \\
+        --doc_store /path/to/wiki-18.arrow --encoder_device cpu --encoder_backend int8
+
+The client threads share the machine with the server, so leave them a core or two: on N cores,
+compare worker counts up to about N - 2.
+
+A memory-mapped index and document store are shared through the page cache: they count in every
+worker's RSS but only once in the summed PSS, and not in a worker's anonymous memory. A worker whose
+anon/worker grows by the index size holds its own copy (e.g. a Flat / HNSW index with a faiss build
+lacking IO_FLAG_MMAP_IFC).
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+import requests
+
+from load_test import make_queries, run_http
+
+SERVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "retrieval_server.py")
+
+
+def wait_ready(url: str, workers: int, proc=None, timeout: float = 1800.0):
+    """
+    Poll /ready on fresh connections until `workers` distinct worker processes answered 200;
+    returns the seconds waited and the worker pids
+    """
+    start = time.time()
+    ready = set()
+    while len(ready) < workers:
+        if proc is not None and proc.poll() is not None:
+            raise RuntimeError(f"Server exited with code {proc.returncode}")
+        if time.time() - start > timeout:
+            raise TimeoutError(f"{len(ready)}/{workers} workers ready after {timeout:.0f}s")
+        try:
+            response = requests.get(f"{url}/ready", timeout=5)
+            report = response.json()
+        except (requests.RequestException, ValueError):
+            time.sleep(1.0)
+            continue
+        if report.get("status") == "failed":
+            raise RuntimeError(f"Retriever failed to load: {report.get('error')}")
+        if response.status_code == 200:
+            ready.add(report["worker"])
+        else:
+            time.sleep(0.5)
+    return time.time() - start, sorted(ready)
+
+
+def memory_mb(pid: int) -> dict:
+    """Rss, Pss and Anonymous memory of a process in MB, from /proc/<pid>/smaps_rollup"""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            if key in ("Rss", "Pss", "Anonymous"):
+                fields[key.lower()] = int(value.split()[0]) / 1024
+    return fields
+
+
+def start_server(server_args, workers: int, port: int, log):
+    cmd = [sys.executable, SERVER, *server_args, "--workers", str(workers), "--port", str(port)]
+    print(f"$ {' '.join(cmd)}")
+    return subprocess.Popen(cmd, stdout=log, stderr=subprocess.STDOUT)
+
+
+def stop_server(proc):
+    proc.terminate()
+    try:
+        proc.wait(timeout=60)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Retrieval server QPS vs. number of worker processes")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--concurrency", type=int, default=64, help="Concurrent clients (one query per POST)")
+    parser.add_argument("--requests", type=int, default=50, help="Requests per concurrent client")
+    parser.add_argument("--topk", type=int, default=3)
+    parser.add_argument("--port", type=int, default=5013)
+    parser.add_argument("--warmup", type=int, default=5, help="Warm-up requests per client before measuring")
+    parser.add_argument("--log", type=str, default="benchmark_workers_server.log", help="Server output")
+    parser.add_argument("--ready_timeout", type=float, default=1800.0)
+    parser.add_argument("server_args", nargs=argparse.REMAINDER, help="Arguments for retrieval_server.py, after --")
+    args = parser.parse_args()
+    server_args = args.server_args[1:] if args.server_args[:1] == ["--"] else args.server_args
+
+    url = f"http://127.0.0.1:{args.port}"
+    # Distinct queries per run so the query cache does not serve the measured requests
+    queries = make_queries(args.concurrency * (args.requests + args.warmup) * len(args.workers))
+    print(f"{os.cpu_count()} cores, concurrency {args.concurrency}")
+
+    rows = []
+    with open(args.log, "w") as log:
+        for run, workers in enumerate(args.workers):
+            proc = start_server(server_args, workers, args.port, log)
+            try:
+                load_seconds, pids = wait_ready(url, workers, proc, args.ready_timeout)
+                print(f"{workers} worker(s) ready in {load_seconds:.1f}s")
+                offset = run * args.concurrency * (args.requests + args.warmup)
+                run_queries = queries[offset:offset + args.concurrency * (args.requests + args.warmup)]
+                run_http(url, args.concurrency, args.warmup, args.topk, run_queries[args.concurrency * args.requests:])
+                qps = run_http(url, args.concurrency, args.requests, args.topk, run_queries)
+                memory = [memory_mb(pid) for pid in pids]
+            finally:
+                stop_server(proc)
+            rows.append((workers, qps, memory))
+
+    base_workers, base_qps, _ = rows[0]
+    print(f"\n{'workers':>8} {'qps':>10} {'speedup':>8} {'efficiency':>11} "
+          f"{'rss/worker':>11} {'anon/worker':>12} {'pss total':>10}   (MB)")
+    for workers, qps, memory in rows:
+        speedup = qps / base_qps
+        print(f"{workers:8d} {qps:10.1f} {speedup:7.2f}x {speedup * base_workers / workers:10.0%} "
+              f"{sum(m['rss'] for m in memory) / workers:11.0f} {sum(m['anonymous'] for m in memory) / workers:12.0f} "
+              f"{sum(m['pss'] for m in memory):10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Pure-Python sparse (BM25) index for the retrieval server, built with bm25s.
+
+Unlike the pyserini backend this needs no JVM: the index is a set of .npy arrays that are
+memory-mapped on load, so the server starts in seconds and pages the postings in on demand.
+Rows of the index follow the corpus order, so documents are fetched with the same row ids
+from the Arrow document store (doc_store.py) or the parsed corpus.
+
+Build once from the wiki JSONL corpus:
+    python3 rag_server/bm25s_index.py --corpus_path wiki-18.jsonl --output wiki-18_bm25s
+
+and serve it with --retrieval_method bm25s --index_path wiki-18_bm25s (plus --doc_store).
+"""
+import argparse
+import json
+import os
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from doc_store import _open_text
+
+META_NAME = "bm25s_meta.json"
+
+
+def _stemmer(name: Optional[str]):
+    if not name:
+        return None
+    import Stemmer  # PyStemmer
+
+    return Stemmer.Stemmer(name).stemWords
+
+
+def _iter_contents(corpus_path: str):
+    with _open_text(corpus_path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)["contents"]
+
+
+def build_bm25s_index(corpus_path: str, output_dir: str, k1: float = 0.9, b: float = 0.4,
+                      method: str = "lucene", stopwords: str = "en", stemmer: Optional[str] = None,
+                      chunk_docs: int = 100000) -> int:
+    """Tokenize the corpus chunk by chunk into one shared vocabulary, index it and save it to output_dir"""
+    import bm25s
+    from bm25s.tokenization import Tokenizer
+
+    tokenizer = Tokenizer(stopwords=stopwords, stemmer=_stemmer(stemmer))
+    corpus_ids = []
+    chunk = []
+    start = time.time()
+
+    def flush():
+        corpus_ids.extend(tokenizer.tokenize(chunk, update_vocab=True, return_as="ids", show_progress=False))
+        print(f"  tokenized {len(corpus_ids)} documents ({time.time() - start:.0f}s)")
+        chunk.clear()
+
+    for contents in _iter_contents(corpus_path):
+        chunk.append(contents)
+        if len(chunk) >= chunk_docs:
+            flush()
+    if chunk:
+        flush()
+
+    retriever = bm25s.BM25(k1=k1, b=b, method=method)
+    retriever.index((corpus_ids, tokenizer.get_vocab_dict()), show_progress=True)
+    num_docs = len(corpus_ids)
+    del corpus_ids
+
+    os.makedirs(output_dir, exist_ok=True)
+    retriever.save(output_dir)
+    with open(os.path.join(output_dir, META_NAME), "w") as f:
+        json.dump({
+            "corpus_path": os.path.abspath(corpus_path),
+            "num_docs": num_docs,
+            "k1": k1,
+            "b": b,
+            "method": method,
+            "stopwords": stopwords,
+            "stemmer": stemmer,
+        }, f, indent=2)
+    return num_docs
+
+
+class BM25sIndex:
+    """A saved bm25s index, memory-mapped, with the tokenization it was built with"""
+    def __init__(self, index_dir: str, mmap: bool = True):
+        import bm25s
+
+        self._bm25s = bm25s
+        meta_path = os.path.join(index_dir, META_NAME)
+        meta = {}
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+        self.stopwords = meta.get("stopwords", "en")
+        self.stemmer = _stemmer(meta.get("stemmer"))
+        self.retriever = bm25s.BM25.load(index_dir, mmap=mmap, load_corpus=False)
+        self.num_docs = meta.get("num_docs") or len(self.retriever.scores["indptr"]) - 1
+
+    def __len__(self):
+        return self.num_docs
+
+    def search(self, query_list: List[str], num: int, n_threads: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Top-num row ids and scores, shape (len(query_list), num); rows without a match
+        (score 0, e.g. only stopwords or unseen terms) are marked with id -1
+        """
+        k = min(num, self.num_docs)
+        query_tokens = self._bm25s.tokenize(
+            query_list, stopwords=self.stopwords, stemmer=self.stemmer, return_ids=False, show_progress=False
+        )
+        idxs, scores = self.retriever.retrieve(query_tokens, k=k, n_threads=n_threads, show_progress=False)
+        idxs = np.asarray(idxs, dtype=np.int64)
+        scores = np.asarray(scores, dtype=np.float32)
+        idxs[scores <= 0] = -1
+        return idxs, scores
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a memory-mappable bm25s index from a JSONL corpus.")
+    parser.add_argument("--corpus_path", type=str, required=True, help="Corpus JSONL (or .jsonl.gz) file.")
+    parser.add_argument("--output", type=str, required=True, help="Output index directory.")
+    parser.add_argument("--k1", type=float, default=0.9, help="BM25 k1 (0.9 matches the pyserini default).")
+    parser.add_argument("--b", type=float, default=0.4, help="BM25 b (0.4 matches the pyserini default).")
+    parser.add_argument("--method", type=str, default="lucene", help="bm25s scoring variant (lucene, robertson, atire, bm25l, bm25+).")
+    parser.add_argument("--stopwords", type=str, default="en", help="Stopword list passed to the bm25s tokenizer.")
+    parser.add_argument("--stemmer", type=str, default=None, help="PyStemmer language, e.g. english (requires PyStemmer).")
+    parser.add_argument("--chunk_docs", type=int, default=100000, help="Documents tokenized per chunk.")
+    args = parser.parse_args()
+
+    start = time.time()
+    num_docs = build_bm25s_index(args.corpus_path, args.output, args.k1, args.b, args.method,
+                                 args.stopwords, args.stemmer, args.chunk_docs)
+    print(f"Built {args.output}: {num_docs} documents in {time.time() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
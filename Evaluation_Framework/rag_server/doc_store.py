@@ -0,0 +1,151 @@
+"""
+Memory-mapped columnar document store for the retrieval corpus.
+
+The JSONL corpus is converted once into an Arrow IPC file. Opening it memory-maps the
+file (nothing is parsed or copied), and a whole (batch x topk) id matrix is fetched with
+one vectorized take per record batch, so only the returned rows are ever materialized.
+
+Build:
+    python3 rag_server/doc_store.py --corpus_path wiki-18.jsonl --output wiki-18.arrow
+
+Without --output the store is written as the corpus's snapshot (wiki-18.jsonl -> wiki-18.arrow
+next to it), which the retrieval server picks up automatically instead of parsing the JSONL.
+"""
+import argparse
+import gzip
+import json
+import os
+import time
+from typing import List, Optional
+
+import numpy as np
+import pyarrow as pa
+
+
+def _open_text(path):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+def build_doc_store(corpus_path: str, output_path: str, batch_rows: int = 100000) -> int:
+    """Convert a JSONL(.gz) corpus into an Arrow IPC file, streaming batch_rows rows at a time"""
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    tmp_path = output_path + ".tmp"
+    schema = None
+    writer = None
+    rows = []
+    total = 0
+    start = time.time()
+
+    def flush():
+        nonlocal schema, writer
+        if not rows:
+            return
+        if schema is None:
+            # Store every field as a string column; non-string values are kept as JSON
+            schema = pa.schema([(name, pa.string()) for name in rows[0].keys()])
+            writer = pa.ipc.new_file(tmp_path, schema)
+        columns = {
+            name: [value if isinstance(value, str) or value is None else json.dumps(value, ensure_ascii=False)
+                   for value in (row.get(name) for row in rows)]
+            for name in schema.names
+        }
+        writer.write_batch(pa.RecordBatch.from_pydict(columns, schema=schema))
+        rows.clear()
+
+    with _open_text(corpus_path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            rows.append(json.loads(line))
+            total += 1
+            if len(rows) >= batch_rows:
+                flush()
+                print(f"  {total} documents written ({time.time() - start:.0f}s)")
+    flush()
+    if writer is None:
+        raise ValueError(f"No documents found in {corpus_path}")
+    writer.close()
+    os.replace(tmp_path, output_path)
+    return total
+
+
+def snapshot_path(corpus_path: str) -> str:
+    """Default document store path of a corpus: wiki-18.jsonl(.gz) -> wiki-18.arrow"""
+    base = corpus_path[:-3] if corpus_path.endswith(".gz") else corpus_path
+    return os.path.splitext(base)[0] + ".arrow"
+
+
+def open_snapshot(corpus_path: str, build: bool = False) -> Optional["DocStore"]:
+    """
+    The corpus's snapshot document store if it exists and is newer than the corpus; with
+    build=True a missing or stale snapshot is (re)built first. None when there is none to use.
+    """
+    path = snapshot_path(corpus_path)
+    fresh = os.path.exists(path) and (
+        not os.path.exists(corpus_path) or os.path.getmtime(path) >= os.path.getmtime(corpus_path)
+    )
+    if not fresh:
+        if not build:
+            if os.path.exists(path):
+                print(f"Ignoring stale snapshot {path} (older than {corpus_path})")
+            return None
+        start = time.time()
+        print(f"Building corpus snapshot {path}")
+        total = build_doc_store(corpus_path, path)
+        print(f"Built {path}: {total} documents in {time.time() - start:.1f}s")
+    return DocStore(path)
+
+
+class DocStore:
+    """Read-only, memory-mapped view of a corpus built by build_doc_store()"""
+    def __init__(self, path: str):
+        self.path = path
+        self._source = pa.memory_map(path, "r")
+        reader = pa.ipc.open_file(self._source)
+        # Taking from a chunked Table concatenates every chunk (copying the whole text column
+        # into RAM) on each call, so rows are taken from the record batches one at a time
+        self.batches = [reader.get_batch(i) for i in range(reader.num_record_batches)]
+        self.batch_starts = np.cumsum([0] + [batch.num_rows for batch in self.batches])
+
+    def __len__(self):
+        return int(self.batch_starts[-1])
+
+    def __getitem__(self, idx: int) -> dict:
+        return self.take([idx])[0]
+
+    def take(self, doc_idxs) -> List[Optional[dict]]:
+        """Fetch rows for a flat id array, one take per record batch; negative ids (FAISS padding) give None"""
+        doc_idxs = np.asarray(doc_idxs, dtype=np.int64).reshape(-1)
+        docs = [None] * len(doc_idxs)
+        positions = np.flatnonzero(doc_idxs >= 0)
+        batch_ids = np.searchsorted(self.batch_starts, doc_idxs[positions], side="right") - 1
+        order = np.argsort(batch_ids, kind="stable")
+        positions, batch_ids = positions[order], batch_ids[order]
+        bounds = np.flatnonzero(np.diff(batch_ids)) + 1
+        for group in np.split(np.arange(len(positions)), bounds):
+            if not len(group):
+                continue
+            batch_id = batch_ids[group[0]]
+            rows = doc_idxs[positions[group]] - self.batch_starts[batch_id]
+            for position, doc in zip(positions[group], self.batches[batch_id].take(pa.array(rows)).to_pylist()):
+                docs[position] = doc
+        return docs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a memory-mapped Arrow document store from a JSONL corpus.")
+    parser.add_argument("--corpus_path", type=str, required=True, help="Corpus JSONL (or .jsonl.gz) file.")
+    parser.add_argument("--output", type=str, default=None, help="Output .arrow file (default: the corpus snapshot path, e.g. wiki-18.arrow).")
+    parser.add_argument("--batch_rows", type=int, default=100000, help="Rows per Arrow record batch.")
+    args = parser.parse_args()
+
+    output = args.output or snapshot_path(args.corpus_path)
+    start = time.time()
+    total = build_doc_store(args.corpus_path, output, args.batch_rows)
+    print(f"Built {output}: {total} documents in {time.time() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
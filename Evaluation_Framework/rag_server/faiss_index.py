@@ -0,0 +1,139 @@
+"""
+Building and loading compressed FAISS indexes for the dense retriever.
+
+Besides the flat index, the server can serve IVF-PQ, OPQ+IVF-PQ and HNSW variants that
+fit in RAM and search fast on CPU-only nodes. Build one from the flat index (or a .npy
+embedding matrix):
+
+    python3 rag_server/faiss_index.py --source e5_Flat.index --output e5_IVF16384_PQ64.index \
+        --index_type ivfpq --nlist 16384 --pq_m 64
+    python3 rag_server/faiss_index.py --source e5_Flat.index --output e5_OPQ64_IVF16384_PQ64.index \
+        --index_type opq_ivfpq --nlist 16384 --pq_m 64
+    python3 rag_server/faiss_index.py --source e5_Flat.index --output e5_HNSW32.index \
+        --index_type hnsw --hnsw_m 32 --ef_construction 200
+
+and serve it with --index_path plus --nprobe / --ef_search (and --index_mmap).
+"""
+import argparse
+import time
+from typing import Optional
+
+import faiss
+import numpy as np
+
+INDEX_TYPES = ("flat", "ivfpq", "opq_ivfpq", "ivfflat", "hnsw")
+# IO_FLAG_MMAP only maps IVF inverted lists; flat codes (Flat, HNSW storage) would still be
+# read into RAM. IO_FLAG_MMAP_IFC, where this faiss build has it, maps every index type.
+MMAP_FLAGS = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP) | faiss.IO_FLAG_READ_ONLY
+METRICS = {"ip": faiss.METRIC_INNER_PRODUCT, "l2": faiss.METRIC_L2}
+
+
+def factory_string(index_type: str, nlist: int = 16384, pq_m: int = 64, pq_bits: int = 8, hnsw_m: int = 32) -> str:
+    if index_type == "flat":
+        return "Flat"
+    if index_type == "ivfflat":
+        return f"IVF{nlist},Flat"
+    if index_type == "ivfpq":
+        return f"IVF{nlist},PQ{pq_m}x{pq_bits}"
+    if index_type == "opq_ivfpq":
+        return f"OPQ{pq_m},IVF{nlist},PQ{pq_m}x{pq_bits}"
+    if index_type == "hnsw":
+        return f"HNSW{hnsw_m},Flat"
+    raise ValueError(f"Unknown index type: {index_type}")
+
+
+class VectorSource:
+    """Row-chunked access to the vectors of a FAISS index file or a (memory-mapped) .npy matrix"""
+    def __init__(self, path: str):
+        self.path = path
+        if path.endswith(".npy"):
+            self.matrix = np.load(path, mmap_mode="r")
+            self.index = None
+            self.ntotal, self.d = self.matrix.shape
+        else:
+            self.matrix = None
+            self.index = faiss.read_index(path, MMAP_FLAGS)
+            self.ntotal, self.d = self.index.ntotal, self.index.d
+
+    def rows(self, start: int, end: int) -> np.ndarray:
+        if self.matrix is not None:
+            return np.ascontiguousarray(self.matrix[start:end], dtype=np.float32)
+        return self.index.reconstruct_n(start, end - start)
+
+    def sample(self, n: int, seed: int = 0) -> np.ndarray:
+        if n >= self.ntotal:
+            return self.rows(0, self.ntotal)
+        ids = np.sort(np.random.default_rng(seed).choice(self.ntotal, size=n, replace=False))
+        if self.matrix is not None:
+            return np.ascontiguousarray(self.matrix[ids], dtype=np.float32)
+        return np.vstack([self.index.reconstruct(int(i)) for i in ids]).astype(np.float32)
+
+
+def build_index(source: VectorSource, factory: str, metric: str = "ip", train_size: int = 1000000,
+                add_batch: int = 500000, ef_construction: Optional[int] = None) -> faiss.Index:
+    """Train on a random sample of train_size vectors, then add all vectors in add_batch chunks"""
+    index = faiss.index_factory(source.d, factory, METRICS[metric])
+    if ef_construction and isinstance(index, faiss.IndexHNSW):
+        index.hnsw.efConstruction = ef_construction
+    if not index.is_trained:
+        start = time.time()
+        train = source.sample(train_size)
+        print(f"Training {factory} on {len(train)} vectors...")
+        index.train(train)
+        print(f"  trained in {time.time() - start:.1f}s")
+    start = time.time()
+    for offset in range(0, source.ntotal, add_batch):
+        index.add(source.rows(offset, min(offset + add_batch, source.ntotal)))
+        print(f"  added {index.ntotal}/{source.ntotal} vectors ({time.time() - start:.0f}s)")
+    return index
+
+
+def set_search_params(index: faiss.Index, nprobe: Optional[int] = None, ef_search: Optional[int] = None):
+    """Apply nprobe (IVF) / efSearch (HNSW) where the index supports them"""
+    params = faiss.ParameterSpace()
+    for name, value in (("nprobe", nprobe), ("efSearch", ef_search)):
+        if not value:
+            continue
+        try:
+            params.set_index_parameter(index, name, value)
+        except RuntimeError:
+            print(f"Warning: index {type(index).__name__} has no '{name}' parameter, ignoring")
+
+
+def load_index(index_path: str, use_mmap: bool = False, nprobe: Optional[int] = None,
+               ef_search: Optional[int] = None) -> faiss.Index:
+    """Read an index, optionally memory-mapped (read-only) instead of loaded into RAM"""
+    flags = MMAP_FLAGS if use_mmap else 0
+    index = faiss.read_index(index_path, flags)
+    if use_mmap and not hasattr(faiss, "IO_FLAG_MMAP_IFC") and faiss.try_extract_index_ivf(index) is None:
+        print(f"Warning: this faiss build only memory-maps IVF lists; {type(index).__name__} is loaded into RAM")
+    set_search_params(index, nprobe, ef_search)
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a compressed FAISS index for the dense retriever.")
+    parser.add_argument("--source", type=str, required=True, help="Flat FAISS index or .npy embedding matrix.")
+    parser.add_argument("--output", type=str, required=True, help="Output index file.")
+    parser.add_argument("--index_type", type=str, default="ivfpq", choices=INDEX_TYPES)
+    parser.add_argument("--factory", type=str, default=None, help="Raw faiss.index_factory string (overrides --index_type).")
+    parser.add_argument("--metric", type=str, default="ip", choices=list(METRICS))
+    parser.add_argument("--nlist", type=int, default=16384, help="IVF cells.")
+    parser.add_argument("--pq_m", type=int, default=64, help="PQ sub-quantizers (must divide the dimension).")
+    parser.add_argument("--pq_bits", type=int, default=8, help="Bits per PQ code.")
+    parser.add_argument("--hnsw_m", type=int, default=32, help="HNSW neighbors per node.")
+    parser.add_argument("--ef_construction", type=int, default=200, help="HNSW efConstruction.")
+    parser.add_argument("--train_size", type=int, default=1000000, help="Vectors sampled for training.")
+    parser.add_argument("--add_batch", type=int, default=500000, help="Vectors added per chunk.")
+    args = parser.parse_args()
+
+    source = VectorSource(args.source)
+    factory = args.factory or factory_string(args.index_type, args.nlist, args.pq_m, args.pq_bits, args.hnsw_m)
+    print(f"Source: {args.source} ({source.ntotal} x {source.d}), building {factory}")
+    index = build_index(source, factory, args.metric, args.train_size, args.add_batch, args.ef_construction)
+    faiss.write_index(index, args.output)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
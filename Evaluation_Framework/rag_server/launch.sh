@@ -15,4 +15,20 @@ python3 rag_server/retrieval_server.py --index_path $index_file \
                                             --corpus_path $corpus_file \
                                             --topk 3 \
                                             --retriever_model $retriever &
-sleep 1200
+server_pid=$!
+# The server listens right away and loads in the background; wait until /ready returns 200
+ready_timeout=${READY_TIMEOUT:-3600}
+SECONDS=0
+until curl -sf -o /dev/null http://127.0.0.1:5003/ready; do
+    if ! kill -0 $server_pid 2>/dev/null; then
+        wait $server_pid
+        echo "Retriever server exited with code $? before it was ready"; exit 1
+    fi
+    if [ "$(curl -s -o /dev/null -w '%{http_code}' http://127.0.0.1:5003/health)" = "500" ]; then
+        echo "Retriever failed to load:"; curl -s http://127.0.0.1:5003/health; exit 1
+    fi
+    if [ $SECONDS -ge $ready_timeout ]; then
+        echo "Retriever not ready after ${ready_timeout}s"; kill $server_pid; exit 1
+    fi
+    sleep 10
+done
@@ -0,0 +1,91 @@
+"""
+Startup progress of the retrieval server.
+
+The server starts listening immediately and builds the retriever in a background thread;
+each loading step (corpus, index, encoder, ...) is recorded as a named stage so /health and
+/ready can report what is still loading, how long each step took, and whether loading failed.
+"""
+import os
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+
+class LoadProgress:
+    """Thread-safe record of named loading stages; stages may run concurrently"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages = {}
+        self._started = time.time()
+        self._ready_at = None
+        self._error = None
+        self._thread = None
+
+    @contextmanager
+    def stage(self, name: str):
+        """Mark `name` as loading for the duration of the block; a raised error marks it failed"""
+        start = time.time()
+        with self._lock:
+            self._stages[name] = {"state": "loading", "started": start - self._started, "seconds": None}
+        try:
+            yield
+        except BaseException as e:
+            with self._lock:
+                self._stages[name].update(state="failed", seconds=time.time() - start, error=repr(e))
+            raise
+        with self._lock:
+            self._stages[name].update(state="done", seconds=time.time() - start)
+        print(f"Loaded {name} in {time.time() - start:.1f}s")
+
+    def start(self, load: Callable[[], None]) -> threading.Thread:
+        """Run `load` in a daemon thread; the server is ready once it returns"""
+        def run():
+            try:
+                load()
+            except Exception as e:
+                traceback.print_exc()
+                with self._lock:
+                    self._error = repr(e)
+                return
+            with self._lock:
+                self._ready_at = time.time()
+            print(f"Retriever ready after {self._ready_at - self._started:.1f}s")
+
+        self._thread = threading.Thread(target=run, name="retriever-loader", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    @property
+    def ready(self) -> bool:
+        return self._ready_at is not None
+
+    @property
+    def error(self) -> Optional[str]:
+        return self._error
+
+    def report(self) -> dict:
+        now = time.time()
+        with self._lock:
+            if self._error is not None:
+                status = "failed"
+            elif self._ready_at is not None:
+                status = "ready"
+            else:
+                status = "loading"
+            stages = {}
+            for name, stage in self._stages.items():
+                stage = dict(stage)
+                if stage["state"] == "loading":
+                    stage["seconds"] = now - self._started - stage["started"]
+                stages[name] = stage
+            return {
+                "worker": os.getpid(),
+                "status": status,
+                "ready": self._ready_at is not None,
+                "uptime": now - self._started,
+                "load_seconds": self._ready_at - self._started if self._ready_at is not None else None,
+                "error": self._error,
+                "stages": stages,
+            }
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Load test for the retrieval server: QPS vs. p50/p99 latency at increasing concurrency.
+
+Against a running server (one query per POST, like the evaluation threads):
+    python3 rag_server/load_test.py --url http://127.0.0.1:5003 --concurrency 1 8 32 64
+
+In-process on CPU FAISS (synthetic flat index + stand-in encoder), comparing
+batch-size-1 dispatch with the micro-batcher:
+    python3 rag_server/load_test.py --synthetic --docs 200000 --concurrency 1 8 32 64
+"""
+import argparse
+import asyncio
+import threading
+import time
+
+import numpy as np
+
+
+def percentile(latencies, q):
+    return float(np.percentile(latencies, q) * 1000.0) if latencies else 0.0
+
+
+def report(label, concurrency, latencies, elapsed):
+    qps = len(latencies) / elapsed
+    print(f"{label:<10} concurrency={concurrency:<4} requests={len(latencies):<6} "
+          f"qps={qps:8.1f}  p50={percentile(latencies, 50):7.2f}ms  "
+          f"p99={percentile(latencies, 99):7.2f}ms")
+    return qps
+
+
+def make_queries(n, seed=0):
+    rng = np.random.default_rng(seed)
+    words = ["who", "what", "when", "river", "album", "film", "president", "born", "capital", "war"]
+    return [" ".join(rng.choice(words, size=6)) + f" {i}" for i in range(n)]
+
+
+# ---------------------------------------------------------------- HTTP mode
+
+def run_http(url, concurrency, requests_per_worker, topk, queries):
+    import requests
+
+    latencies = []
+    lock = threading.Lock()
+
+    def worker(worker_id):
+        session = requests.Session()
+        local = []
+        for i in range(requests_per_worker):
+            query = queries[(worker_id * requests_per_worker + i) % len(queries)]
+            start = time.perf_counter()
+            response = session.post(f"{url}/retrieve", json={"queries": [query], "topk": topk}, timeout=60)
+            response.raise_for_status()
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return report("http", concurrency, latencies, time.perf_counter() - start)
+
+
+# ----------------------------------------------------------- Synthetic mode
+
+class SyntheticRetriever:
+    """CPU FAISS flat index plus a fixed-cost projection standing in for the query encoder"""
+    def __init__(self, num_docs, dim, seed=0):
+        import faiss
+
+        rng = np.random.default_rng(seed)
+        doc_emb = rng.standard_normal((num_docs, dim), dtype=np.float32)
+        faiss.normalize_L2(doc_emb)
+        self.index = faiss.IndexFlatIP(dim)
+        self.index.add(doc_emb)
+        self.projection = rng.standard_normal((dim * 4, dim), dtype=np.float32)
+        self.dim = dim
+
+    def encode(self, query_list):
+        features = np.zeros((len(query_list), self.dim * 4), dtype=np.float32)
+        for row, query in enumerate(query_list):
+            rng = np.random.default_rng(abs(hash(query)) % (2 ** 32))
+            features[row] = rng.standard_normal(self.dim * 4, dtype=np.float32)
+        emb = features @ self.projection
+        return emb / np.linalg.norm(emb, axis=1, keepdims=True)
+
+    def batch_search(self, query_list, num, return_score=True):
+        scores, idxs = self.index.search(self.encode(query_list), k=num)
+        results = [[{"id": int(i)} for i in row] for row in idxs.tolist()]
+        return results, scores.tolist()
+
+
+async def run_synthetic(retriever, batcher, concurrency, requests_per_worker, topk, queries):
+    from concurrent.futures import ThreadPoolExecutor
+
+    loop = asyncio.get_running_loop()
+    # Unbatched: one search per request on the server threadpool, as the sync endpoint did
+    executor = ThreadPoolExecutor(max_workers=40)
+    latencies = []
+
+    async def worker(worker_id):
+        for i in range(requests_per_worker):
+            query = queries[(worker_id * requests_per_worker + i) % len(queries)]
+            start = time.perf_counter()
+            if batcher is not None:
+                await batcher.submit([query], topk)
+            else:
+                await loop.run_in_executor(executor, retriever.batch_search, [query], topk)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    report("batched" if batcher is not None else "unbatched", concurrency, latencies, time.perf_counter() - start)
+    executor.shutdown()
+
+
+async def synthetic_main(args, queries):
+    from batching import MicroBatcher
+
+    print(f"Building synthetic flat index: {args.docs} docs x {args.dim} dims")
+    retriever = SyntheticRetriever(args.docs, args.dim)
+    for concurrency in args.concurrency:
+        await run_synthetic(retriever, None, concurrency, args.requests, args.topk, queries)
+        batcher = MicroBatcher(
+            lambda q, num: retriever.batch_search(q, num, True),
+            max_batch_queries=args.batch_max_queries,
+            max_wait_ms=args.batch_max_wait_ms,
+        )
+        batcher.start()
+        await run_synthetic(retriever, batcher, concurrency, args.requests, args.topk, queries)
+        stats = batcher.stats()
+        print(f"           avg_batch={stats['avg_batch_queries']} flush_full={stats['flush_full']} "
+              f"flush_timeout={stats['flush_timeout']} max_queue_depth={stats['max_queue_depth']}")
+        await batcher.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Retrieval server load test (QPS vs. p99 latency)")
+    parser.add_argument("--url", type=str, default="http://127.0.0.1:5003")
+    parser.add_argument("--synthetic", action="store_true", help="Benchmark the micro-batcher in-process on CPU FAISS")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 64])
+    parser.add_argument("--requests", type=int, default=50, help="Requests per concurrent client")
+    parser.add_argument("--topk", type=int, default=3)
+    parser.add_argument("--docs", type=int, default=200000, help="Synthetic index size")
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--batch_max_queries", type=int, default=64)
+    parser.add_argument("--batch_max_wait_ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    queries = make_queries(max(c * args.requests for c in args.concurrency))
+    if args.synthetic:
+        asyncio.run(synthetic_main(args, queries))
+    else:
+        for concurrency in args.concurrency:
+            run_http(args.url, concurrency, args.requests, args.topk, queries)
+
+
+if __name__ == "__main__":
+    main()
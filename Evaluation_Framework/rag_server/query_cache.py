@@ -0,0 +1,187 @@
+"""
+Two-level query cache for the dense retriever.
+
+    level 1: normalized query text   -> query embedding
+    level 2: (normalized query, topk) -> (doc ids, scores)
+
+Both levels are LRU caches bounded by the bytes of the arrays they hold. The cache can be
+persisted to disk on shutdown and reloaded on start; a fingerprint of the model / index /
+search settings is stored with it so that a stale cache is discarded instead of served.
+"""
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.split())
+
+
+class LRUCache:
+    """
+    Thread-safe LRU mapping bounded by the summed size of its values: nbytes of numpy values
+    by default, or sizeof(key, value) when given.
+    """
+    def __init__(self, max_bytes: int, sizeof=None):
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._data = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _size(self, key, value) -> int:
+        if self.sizeof is not None:
+            return self.sizeof(key, value)
+        arrays = value if isinstance(value, tuple) else (value,)
+        return sum(a.nbytes for a in arrays) + len(str(key))
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        size = self._size(key, value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= self._size(key, old)
+            self._data[key] = value
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                old_key, old_value = self._data.popitem(last=False)
+                self._bytes -= self._size(old_key, old_value)
+                self.evictions += 1
+
+    def items(self):
+        with self._lock:
+            return list(self._data.items())
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+
+class QueryCache:
+    """
+    Args:
+        embedding_bytes: size bound of the embedding level (0 disables it)
+        result_bytes: size bound of the (query, topk) result level (0 disables it)
+        persist_path: pickle file loaded on start and written by save(); None keeps the cache in memory
+        fingerprint: anything identifying the encoder / index / search settings
+    """
+    def __init__(self, embedding_bytes: int, result_bytes: int, persist_path: Optional[str] = None,
+                 fingerprint=None):
+        self.embeddings = LRUCache(embedding_bytes) if embedding_bytes > 0 else None
+        self.results = LRUCache(result_bytes) if result_bytes > 0 else None
+        self.persist_path = persist_path
+        self.fingerprint = fingerprint
+        self.encode_calls = 0
+        self.encoded_queries = 0
+        self.encode_time = 0.0
+        self.search_calls = 0
+        self.searched_queries = 0
+        self.search_time = 0.0
+        if persist_path:
+            self.load()
+
+    def get_embedding(self, query: str) -> Optional[np.ndarray]:
+        return self.embeddings.get(query) if self.embeddings is not None else None
+
+    def put_embedding(self, query: str, embedding: np.ndarray):
+        if self.embeddings is not None:
+            self.embeddings.put(query, np.array(embedding, dtype=np.float32))
+
+    def get_result(self, query: str, topk: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        return self.results.get((query, topk)) if self.results is not None else None
+
+    def put_result(self, query: str, topk: int, idxs: np.ndarray, scores: np.ndarray):
+        if self.results is not None:
+            self.results.put((query, topk), (np.array(idxs, dtype=np.int64), np.array(scores, dtype=np.float32)))
+
+    def record_encode(self, num_queries: int, seconds: float):
+        self.encode_calls += 1
+        self.encoded_queries += num_queries
+        self.encode_time += seconds
+
+    def record_search(self, num_queries: int, seconds: float):
+        self.search_calls += 1
+        self.searched_queries += num_queries
+        self.search_time += seconds
+
+    def load(self):
+        if not os.path.exists(self.persist_path):
+            return
+        try:
+            with open(self.persist_path, "rb") as f:
+                state = pickle.load(f)
+        except Exception as e:
+            print(f"Warning: failed to load query cache {self.persist_path}: {e}")
+            return
+        if state.get("fingerprint") != self.fingerprint:
+            print(f"Query cache {self.persist_path} was built with different settings, ignoring it")
+            return
+        for key, value in state.get("embeddings", []):
+            self.put_embedding(key, value)
+        for (query, topk), (idxs, scores) in state.get("results", []):
+            self.put_result(query, topk, idxs, scores)
+        print(f"Loaded query cache: {len(state.get('embeddings', []))} embeddings, "
+              f"{len(state.get('results', []))} results")
+
+    def save(self):
+        if not self.persist_path:
+            return
+        state = {
+            "fingerprint": self.fingerprint,
+            "saved_at": time.time(),
+            "embeddings": self.embeddings.items() if self.embeddings is not None else [],
+            "results": self.results.items() if self.results is not None else [],
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(self.persist_path)), exist_ok=True)
+        # Several server workers may save the same cache on shutdown; the last replace wins
+        tmp_path = f"{self.persist_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.persist_path)
+
+    def stats(self):
+        return {
+            "embeddings": self.embeddings.stats() if self.embeddings is not None else None,
+            "results": self.results.stats() if self.results is not None else None,
+            "encode": {
+                "calls": self.encode_calls,
+                "queries": self.encoded_queries,
+                "avg_ms_per_call": round(self.encode_time / self.encode_calls * 1000.0, 3) if self.encode_calls else 0.0,
+            },
+            "search": {
+                "calls": self.search_calls,
+                "queries": self.searched_queries,
+                "avg_ms_per_call": round(self.search_time / self.search_calls * 1000.0, 3) if self.search_calls else 0.0,
+            },
+        }
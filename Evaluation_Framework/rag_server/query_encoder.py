@@ -0,0 +1,281 @@
+"""
+Query encoder for the dense retriever, on GPU or CPU.
+
+Backends:
+    torch   fp32 (fp16 on GPU with use_fp16) PyTorch model; optionally torch.compile'd
+    int8    CPU only: torch dynamic int8 quantization of the Linear layers
+    onnx    CPU only: ONNX Runtime session over an exported graph (exported once to onnx_path,
+            default_onnx_path otherwise; requires onnxruntime)
+
+On CPU the thread count is set explicitly, and queries are sorted by token length and encoded
+in buckets, each padded only to its own longest query. A non-reference backend can be checked
+against the fp32 torch encoder with compare_embeddings (the server does so at startup).
+
+Throughput benchmark: rag_server/benchmark_encoder.py
+"""
+import os
+import time
+from typing import List, Optional
+
+import numpy as np
+import torch
+from transformers import AutoConfig, AutoTokenizer, AutoModel
+
+ENCODER_BACKENDS = ("torch", "int8", "onnx")
+PROBE_QUERIES = [
+    "who wrote the declaration of independence",
+    "what is the capital of australia",
+    "when did the first man land on the moon",
+    "how many bones are in the adult human body",
+    "which element has the chemical symbol fe",
+    "what language is spoken in brazil",
+    "who painted the mona lisa",
+    "largest desert in the world by area",
+]
+
+
+def resolve_device(device: str = "auto") -> str:
+    if device == "auto":
+        return "cuda" if torch.cuda.is_available() else "cpu"
+    return device
+
+
+def default_onnx_path(model_path: str) -> str:
+    """
+    Exported graph next to a local model directory; for a hub model id, under a cache
+    directory keyed by the id (a directory named after the id would shadow the hub model)
+    """
+    if os.path.isdir(model_path):
+        return os.path.join(model_path, "encoder.onnx")
+    cache_dir = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_dir, "rag_server", "onnx", model_path.replace("/", "--"), "encoder.onnx")
+
+
+def load_model(model_path: str, use_fp16: bool = False, device: str = "cuda"):
+    model_config = AutoConfig.from_pretrained(model_path, trust_remote_code=True)
+    model = AutoModel.from_pretrained(model_path, trust_remote_code=True)
+    print("Model loaded successfully")
+    model.eval()
+    model.to(device)
+    # fp16 matmuls are slow or unsupported on CPU
+    if use_fp16 and device != "cpu":
+        model = model.half()
+    tokenizer = AutoTokenizer.from_pretrained(model_path, use_fast=True, trust_remote_code=True)
+    return model, tokenizer
+
+def pooling(
+    pooler_output,
+    last_hidden_state,
+    attention_mask = None,
+    pooling_method = "mean"
+):
+    if pooling_method == "mean":
+        last_hidden = last_hidden_state.masked_fill(~attention_mask[..., None].bool(), 0.0)
+        return last_hidden.sum(dim=1) / attention_mask.sum(dim=1)[..., None]
+    elif pooling_method == "cls":
+        return last_hidden_state[:, 0]
+    elif pooling_method == "pooler":
+        return pooler_output
+    else:
+        raise NotImplementedError("Pooling method not implemented!")
+
+
+def quantize_int8(model):
+    """Dynamic int8 quantization of the Linear layers (weights int8, activations quantized per batch)"""
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+class OnnxSession:
+    """ONNX Runtime session over the encoder graph, exported from the torch model on first use"""
+    def __init__(self, model, tokenizer, onnx_path: str, num_threads: Optional[int] = None):
+        import onnxruntime as ort
+
+        if not os.path.exists(onnx_path):
+            self.export(model, tokenizer, onnx_path)
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(onnx_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = [i.name for i in self.session.get_inputs()]
+
+    @staticmethod
+    def export(model, tokenizer, onnx_path: str):
+        """
+        Export to a per-process temporary file and move it into place atomically: server
+        workers may export concurrently, and none may load a half-written graph
+        """
+        print(f"Exporting ONNX encoder to {onnx_path}")
+        os.makedirs(os.path.dirname(os.path.abspath(onnx_path)), exist_ok=True)
+        sample = tokenizer(["query: onnx export sample"], return_tensors="pt")
+        input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+        dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+        dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+        tmp_path = f"{onnx_path}.{os.getpid()}.tmp"
+        try:
+            with torch.no_grad():
+                torch.onnx.export(
+                    model.float().cpu(),
+                    tuple(sample[name] for name in input_names),
+                    tmp_path,
+                    input_names=input_names,
+                    output_names=["last_hidden_state"],
+                    dynamic_axes=dynamic_axes,
+                    opset_version=17,
+                )
+            os.replace(tmp_path, onnx_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def __call__(self, inputs) -> torch.Tensor:
+        feeds = {name: inputs[name].numpy() for name in self.input_names}
+        return torch.from_numpy(self.session.run(["last_hidden_state"], feeds)[0])
+
+
+class Encoder:
+    def __init__(self, model_name, model_path, pooling_method, max_length, use_fp16,
+                 device: str = "cuda", backend: str = "torch", num_threads: Optional[int] = None,
+                 compile: bool = False, bucket_size: int = 0, onnx_path: Optional[str] = None):
+        """
+        Args:
+            device: "cuda", "cpu" or "auto"
+            backend: one of ENCODER_BACKENDS; int8 / onnx run on CPU
+            num_threads: CPU threads for torch / ONNX Runtime (None: library default)
+            compile: torch.compile the model (torch backend)
+            bucket_size: encode length-sorted buckets of this many queries, each padded to its own
+                longest query (0: one batch padded to the longest query)
+            onnx_path: exported graph for the onnx backend (default: default_onnx_path(model_path))
+        """
+        if backend not in ENCODER_BACKENDS:
+            raise ValueError(f"Unknown encoder backend {backend!r}, expected one of {ENCODER_BACKENDS}")
+        self.model_name = model_name
+        self.model_path = model_path
+        self.pooling_method = pooling_method
+        self.max_length = max_length
+        self.device = "cpu" if backend in ("int8", "onnx") else resolve_device(device)
+        self.use_fp16 = use_fp16 and self.device != "cpu"
+        self.backend = backend
+        self.bucket_size = bucket_size
+
+        if self.device == "cpu" and num_threads:
+            torch.set_num_threads(num_threads)
+
+        self.model, self.tokenizer = load_model(model_path=model_path, use_fp16=self.use_fp16, device=self.device)
+        self.model.eval()
+        self.onnx_session = None
+        if backend == "int8":
+            self.model = quantize_int8(self.model)
+        elif backend == "onnx":
+            if pooling_method == "pooler" or "T5" in type(self.model).__name__:
+                raise ValueError("The onnx backend supports mean / cls pooling of encoder-only models")
+            self.onnx_session = OnnxSession(self.model, self.tokenizer,
+                                            onnx_path or default_onnx_path(model_path), num_threads)
+        if compile and backend == "torch":
+            self.model = torch.compile(self.model)
+
+    def _prepare(self, query_list: List[str], is_query: bool) -> List[str]:
+        # processing query for different encoders
+        if isinstance(query_list, str):
+            query_list = [query_list]
+
+        if "e5" in self.model_name.lower():
+            if is_query:
+                query_list = [f"query: {query}" for query in query_list]
+            else:
+                query_list = [f"passage: {query}" for query in query_list]
+
+        if "bge" in self.model_name.lower():
+            if is_query:
+                query_list = [f"Represent this sentence for searching relevant passages: {query}" for query in query_list]
+        return query_list
+
+    @torch.no_grad()
+    def _encode_batch(self, query_list: List[str]) -> np.ndarray:
+        inputs = self.tokenizer(query_list,
+                                max_length=self.max_length,
+                                padding=True,
+                                truncation=True,
+                                return_tensors="pt"
+                                )
+
+        if self.onnx_session is not None:
+            last_hidden_state = self.onnx_session(inputs)
+            query_emb = pooling(None, last_hidden_state, inputs['attention_mask'], self.pooling_method)
+            if "dpr" not in self.model_name.lower():
+                query_emb = torch.nn.functional.normalize(query_emb, dim=-1)
+            return query_emb.numpy().astype(np.float32, order="C")
+
+        inputs = {k: v.to(self.device) for k, v in inputs.items()}
+
+        if "T5" in type(self.model).__name__:
+            # T5-based retrieval model
+            decoder_input_ids = torch.zeros(
+                (inputs['input_ids'].shape[0], 1), dtype=torch.long
+            ).to(inputs['input_ids'].device)
+            output = self.model(
+                **inputs, decoder_input_ids=decoder_input_ids, return_dict=True
+            )
+            query_emb = output.last_hidden_state[:, 0, :]
+        else:
+            output = self.model(**inputs, return_dict=True)
+            query_emb = pooling(output.pooler_output,
+                                output.last_hidden_state,
+                                inputs['attention_mask'],
+                                self.pooling_method)
+            if "dpr" not in self.model_name.lower():
+                query_emb = torch.nn.functional.normalize(query_emb, dim=-1)
+
+        query_emb = query_emb.detach().cpu().float().numpy()
+        query_emb = query_emb.astype(np.float32, order="C")
+        return query_emb
+
+    def encode(self, query_list: List[str], is_query=True) -> np.ndarray:
+        query_list = self._prepare(query_list, is_query)
+        if not self.bucket_size or len(query_list) <= self.bucket_size:
+            return self._encode_batch(query_list)
+
+        # Length-bucketed dynamic padding: similar lengths share a batch, so short queries
+        # are not padded (and computed) up to the longest query of the whole request
+        lengths = [len(ids) for ids in self.tokenizer(query_list, max_length=self.max_length,
+                                                       truncation=True)['input_ids']]
+        order = np.argsort(lengths, kind="stable")
+        query_emb = None
+        for start in range(0, len(order), self.bucket_size):
+            rows = order[start:start + self.bucket_size]
+            bucket_emb = self._encode_batch([query_list[row] for row in rows])
+            if query_emb is None:
+                query_emb = np.empty((len(query_list), bucket_emb.shape[1]), dtype=np.float32)
+            query_emb[rows] = bucket_emb
+        return query_emb
+
+
+def compare_embeddings(reference: np.ndarray, candidate: np.ndarray) -> dict:
+    """Per-query agreement of two embedding matrices (rows L2-normalized or not)"""
+    ref = reference / np.maximum(np.linalg.norm(reference, axis=1, keepdims=True), 1e-12)
+    cand = candidate / np.maximum(np.linalg.norm(candidate, axis=1, keepdims=True), 1e-12)
+    cosine = np.sum(ref * cand, axis=1)
+    return {
+        "min_cosine": float(cosine.min()),
+        "mean_cosine": float(cosine.mean()),
+        "max_abs_diff": float(np.abs(reference - candidate).max()),
+    }
+
+
+def check_tolerance(encoder: Encoder, tolerance: float, queries: List[str] = PROBE_QUERIES) -> dict:
+    """
+    Encode probe queries with `encoder` and with an fp32 torch reference of the same model on
+    CPU; raise if any query's cosine similarity to its reference embedding is below 1 - tolerance
+    """
+    reference = Encoder(encoder.model_name, encoder.model_path, encoder.pooling_method,
+                        encoder.max_length, use_fp16=False, device="cpu", backend="torch")
+    start = time.time()
+    report = compare_embeddings(reference.encode(queries), encoder.encode(queries))
+    report["tolerance"] = tolerance
+    del reference
+    print(f"Encoder {encoder.backend}/{encoder.device} vs fp32 reference: min cosine {report['min_cosine']:.5f}, "
+          f"max abs diff {report['max_abs_diff']:.5f} ({time.time() - start:.1f}s)")
+    if report["min_cosine"] < 1.0 - tolerance:
+        raise ValueError(f"Encoder backend {encoder.backend} deviates from the fp32 reference: "
+                         f"min cosine {report['min_cosine']:.5f} < {1.0 - tolerance:.5f}")
+    return report
@@ -1,28 +1,72 @@
 import json
 import os
+import threading
+import time
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
 import argparse
 
 import faiss
-import torch
 import numpy as np
-from transformers import AutoConfig, AutoTokenizer, AutoModel
 from tqdm import tqdm
 import datasets
 
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 
+from batching import MicroBatcher, QueueFullError
+from doc_store import DocStore, open_snapshot
+from faiss_index import load_index
+from load_progress import LoadProgress
+from query_cache import LRUCache, QueryCache, normalize_query
+from query_encoder import ENCODER_BACKENDS, Encoder, check_tolerance
+
 
 parser = argparse.ArgumentParser(description="Launch the local faiss retriever.")
+parser.add_argument("--retrieval_method", type=str, default="e5", help="bm25 (Lucene index), bm25s (bm25s_index.py index) or the dense encoder name, e.g. e5.")
 parser.add_argument("--index_path", type=str, default="/home/peterjin/mnt/index/wiki-18/e5_Flat.index", help="Corpus indexing file.")
 parser.add_argument("--corpus_path", type=str, default="/home/peterjin/mnt/data/retrieval-corpus/wiki-18.jsonl", help="Local corpus file.")
+parser.add_argument("--doc_store", type=str, default=None, help="Prebuilt Arrow document store (see doc_store.py); used instead of parsing --corpus_path.")
+parser.add_argument("--build_snapshot", action="store_true", help="Without --doc_store, convert --corpus_path to its Arrow snapshot (wiki-18.jsonl -> wiki-18.arrow) if missing or stale; an up-to-date snapshot is always used.")
+parser.add_argument("--faiss_cpu", action="store_true", help="Search on CPU instead of sharding the index over all GPUs.")
+parser.add_argument("--index_mmap", action="store_true", help="Memory-map the index file read-only instead of loading it into RAM (CPU only; without faiss.IO_FLAG_MMAP_IFC only IVF lists are mapped).")
+parser.add_argument("--nprobe", type=int, default=None, help="IVF cells visited per query (IVF / IVF-PQ indexes).")
+parser.add_argument("--ef_search", type=int, default=None, help="HNSW search depth (HNSW indexes).")
+parser.add_argument("--cache_embeddings_mb", type=int, default=256, help="Query-embedding cache size in MB (0 disables).")
+parser.add_argument("--cache_results_mb", type=int, default=64, help="(query, topk) -> doc ids / scores cache size in MB (0 disables).")
+parser.add_argument("--cache_path", type=str, default=None, help="Persist the query cache to this file across restarts.")
+parser.add_argument("--bm25_threads", type=int, default=None, help="Threads for bm25 / bm25s batch search (default: all cores).")
+parser.add_argument("--bm25_doc_cache_mb", type=int, default=256, help="BM25 parsed-document cache size in MB (0 disables).")
 parser.add_argument("--topk", type=int, default=3, help="Number of retrieved passages for one query.")
 parser.add_argument("--retriever_model", type=str, default="intfloat/e5-base-v2", help="Name of the retriever model.")
+parser.add_argument("--encoder_device", type=str, default="cuda", help="Query encoder device: cuda, cpu or auto (cuda when available).")
+parser.add_argument("--encoder_backend", type=str, default="torch", choices=ENCODER_BACKENDS, help="Query encoder backend; int8 (dynamic quantization) and onnx (ONNX Runtime) run on CPU.")
+parser.add_argument("--encoder_threads", type=int, default=None, help="CPU threads for query encoding (default: library default).")
+parser.add_argument("--encoder_bucket_size", type=int, default=0, help="Encode length-sorted buckets of this many queries, each padded to its own longest query (0 disables).")
+parser.add_argument("--encoder_compile", action="store_true", help="torch.compile the query encoder (torch backend).")
+parser.add_argument("--encoder_onnx_path", type=str, default=None, help="Exported ONNX encoder (default: <retriever_model>/encoder.onnx for a local model, else ~/.cache/rag_server/onnx/<model id>/encoder.onnx; exported on first use).")
+parser.add_argument("--encoder_tolerance", type=float, default=None, help="At startup, require min cosine >= 1 - tolerance between the encoder and the fp32 reference on probe queries.")
+parser.add_argument("--batch_max_queries", type=int, default=64, help="Flush a micro-batch once this many queries are queued (0 disables micro-batching).")
+parser.add_argument("--batch_max_wait_ms", type=float, default=5.0, help="Flush a micro-batch once its oldest request has waited this long.")
+parser.add_argument("--batch_max_queue", type=int, default=4096, help="Reject requests with 503 beyond this many queued queries (0: unbounded); a request into an empty queue is always admitted.")
+parser.add_argument("--faiss_threads", type=int, default=None, help="OpenMP threads for FAISS search (default: all cores, or cores / workers).")
+parser.add_argument("--workers", type=int, default=1, help="Worker processes serving the same port; they share the memory-mapped index and document store (dense retrieval requires --faiss_cpu).")
+parser.add_argument("--host", type=str, default="0.0.0.0")
+parser.add_argument("--port", type=int, default=5003)
 
 args = parser.parse_args()
+if args.workers > 1 and args.retrieval_method not in ("bm25", "bm25s") and not args.faiss_cpu:
+    parser.error("--workers > 1 shares one memory-mapped CPU index between the workers: add --faiss_cpu")
+
+# With several workers, split the cores between them instead of every worker using all of them
+worker_threads = max(1, (os.cpu_count() or 1) // args.workers) if args.workers > 1 else None
+
+# Loading stages reported on /health and /ready
+progress = LoadProgress()
 
 def load_corpus(corpus_path: str):
     corpus = datasets.load_dataset(
@@ -33,6 +77,19 @@ def load_corpus(corpus_path: str):
     )
     return corpus
 
+def open_corpus(config):
+    """
+    Memory-mapped document store when one was built (--doc_store, or the corpus's snapshot),
+    otherwise the parsed JSONL corpus
+    """
+    with progress.stage("corpus"):
+        if config.doc_store_path:
+            return DocStore(config.doc_store_path)
+        store = open_snapshot(config.corpus_path, build=config.build_snapshot)
+        if store is not None:
+            return store
+        return load_corpus(config.corpus_path)
+
 def read_jsonl(file_path):
     data = []
     with open(file_path, "r") as f:
@@ -41,92 +98,43 @@ def read_jsonl(file_path):
     return data
 
 def load_docs(corpus, doc_idxs):
+    if isinstance(corpus, DocStore):
+        return corpus.take(doc_idxs)
     results = [corpus[int(idx)] for idx in doc_idxs]
     return results
 
-def load_model(model_path: str, use_fp16: bool = False):
-    model_config = AutoConfig.from_pretrained(model_path, trust_remote_code=True)
-    model = AutoModel.from_pretrained(model_path, trust_remote_code=True)
-    print("Model loaded successfully")
-    model.eval()
-    model.cuda()
-    if use_fp16: 
-        model = model.half()
-    tokenizer = AutoTokenizer.from_pretrained(model_path, use_fast=True, trust_remote_code=True)
-    return model, tokenizer
-
-def pooling(
-    pooler_output,
-    last_hidden_state,
-    attention_mask = None,
-    pooling_method = "mean"
-):
-    if pooling_method == "mean":
-        last_hidden = last_hidden_state.masked_fill(~attention_mask[..., None].bool(), 0.0)
-        return last_hidden.sum(dim=1) / attention_mask.sum(dim=1)[..., None]
-    elif pooling_method == "cls":
-        return last_hidden_state[:, 0]
-    elif pooling_method == "pooler":
-        return pooler_output
-    else:
-        raise NotImplementedError("Pooling method not implemented!")
-
-class Encoder:
-    def __init__(self, model_name, model_path, pooling_method, max_length, use_fp16):
-        self.model_name = model_name
-        self.model_path = model_path
-        self.pooling_method = pooling_method
-        self.max_length = max_length
-        self.use_fp16 = use_fp16
-
-        self.model, self.tokenizer = load_model(model_path=model_path, use_fp16=use_fp16)
-        self.model.eval()
-
-    @torch.no_grad()
-    def encode(self, query_list: List[str], is_query=True) -> np.ndarray:
-        # processing query for different encoders
-        if isinstance(query_list, str):
-            query_list = [query_list]
-
-        if "e5" in self.model_name.lower():
-            if is_query:
-                query_list = [f"query: {query}" for query in query_list]
-            else:
-                query_list = [f"passage: {query}" for query in query_list]
-
-        if "bge" in self.model_name.lower():
-            if is_query:
-                query_list = [f"Represent this sentence for searching relevant passages: {query}" for query in query_list]
-
-        inputs = self.tokenizer(query_list,
-                                max_length=self.max_length,
-                                padding=True,
-                                truncation=True,
-                                return_tensors="pt"
-                                )
-        inputs = {k: v.cuda() for k, v in inputs.items()}
-
-        if "T5" in type(self.model).__name__:
-            # T5-based retrieval model
-            decoder_input_ids = torch.zeros(
-                (inputs['input_ids'].shape[0], 1), dtype=torch.long
-            ).to(inputs['input_ids'].device)
-            output = self.model(
-                **inputs, decoder_input_ids=decoder_input_ids, return_dict=True
-            )
-            query_emb = output.last_hidden_state[:, 0, :]
-        else:
-            output = self.model(**inputs, return_dict=True)
-            query_emb = pooling(output.pooler_output,
-                                output.last_hidden_state,
-                                inputs['attention_mask'],
-                                self.pooling_method)
-            if "dpr" not in self.model_name.lower():
-                query_emb = torch.nn.functional.normalize(query_emb, dim=-1)
-
-        query_emb = query_emb.detach().cpu().numpy()
-        query_emb = query_emb.astype(np.float32, order="C")
-        return query_emb
+class BatchTimings:
+    """Thread-safe per-batch search / document-fetch timings reported on /stats"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.queries = 0
+        self.search_time = 0.0
+        self.fetch_time = 0.0
+        self.last_batch = None
+
+    def record(self, num_queries: int, search_time: float, fetch_time: float):
+        with self._lock:
+            self.batches += 1
+            self.queries += num_queries
+            self.search_time += search_time
+            self.fetch_time += fetch_time
+            self.last_batch = {
+                "queries": num_queries,
+                "search_ms": round(search_time * 1000.0, 3),
+                "fetch_ms": round(fetch_time * 1000.0, 3),
+            }
+
+    def stats(self):
+        with self._lock:
+            batches = self.batches
+            return {
+                "batches": batches,
+                "queries": self.queries,
+                "avg_search_ms_per_batch": round(self.search_time / batches * 1000.0, 3) if batches else 0.0,
+                "avg_fetch_ms_per_batch": round(self.fetch_time / batches * 1000.0, 3) if batches else 0.0,
+                "last_batch": self.last_batch,
+            }
 
 class BaseRetriever:
     def __init__(self, config):
@@ -149,95 +157,257 @@ class BaseRetriever:
     def batch_search(self, query_list: List[str], num: int = None, return_score: bool = False):
         return self._batch_search(query_list, num, return_score)
 
+    def stats(self):
+        """Retriever-specific counters for /stats (None when the retriever keeps none)"""
+        return None
+
+def parse_contents(content: str) -> Dict[str, str]:
+    return {
+        'title': content.split("\n")[0].strip("\""),
+        'text': "\n".join(content.split("\n")[1:]),
+        'contents': content
+    }
+
 class BM25Retriever(BaseRetriever):
     def __init__(self, config):
         super().__init__(config)
-        from pyserini.search.lucene import LuceneSearcher
-        self.searcher = LuceneSearcher(self.index_path)
+        with progress.stage("index"):
+            from pyserini.search.lucene import LuceneSearcher
+            self.searcher = LuceneSearcher(self.index_path)
         self.contain_doc = self._check_contain_doc()
         if not self.contain_doc:
-            self.corpus = load_corpus(self.corpus_path)
+            self.corpus = open_corpus(config)
         self.max_process_num = 8
+        # Lucene searcher threads for batch queries
+        self.threads = config.bm25_threads or os.cpu_count() or 1
+        # docid -> parsed {title, text, contents}; popular passages skip the stored-field read + json.loads
+        self.doc_cache = None
+        if config.bm25_doc_cache_mb > 0:
+            self.doc_cache = LRUCache(
+                config.bm25_doc_cache_mb * 1024 * 1024,
+                sizeof=lambda docid, doc: 2 * len(doc['contents']) + len(docid) + 200,
+            )
+        self.timings = BatchTimings()
     
     def _check_contain_doc(self):
         return self.searcher.doc(0).raw() is not None
 
+    def _search_hits(self, query_list: List[str], num: int):
+        """Lucene hits per query; batches are searched on `threads` Lucene threads"""
+        if len(query_list) == 1 or self.threads == 1:
+            return [self.searcher.search(query, num) for query in query_list]
+        qids = [str(i) for i in range(len(query_list))]
+        hits = self.searcher.batch_search(query_list, qids, k=num, threads=min(self.threads, len(query_list)))
+        return [hits.get(qid, []) for qid in qids]
+
+    def _hit_doc(self, hit):
+        doc = self.doc_cache.get(hit.docid) if self.doc_cache is not None else None
+        if doc is None:
+            # Hits carry the stored raw document already; only fall back to a second lookup without it
+            raw = getattr(hit, 'raw', None)
+            if raw is None:
+                raw = self.searcher.doc(hit.docid).raw()
+            doc = parse_contents(json.loads(raw)['contents'])
+            if self.doc_cache is not None:
+                self.doc_cache.put(hit.docid, doc)
+        return doc
+
     def _search(self, query: str, num: int = None, return_score: bool = False):
+        results, scores = self._batch_search([query], num, True)
+        if return_score:
+            return results[0], scores[0]
+        else:
+            return results[0]
+
+    def _batch_search(self, query_list: List[str], num: int = None, return_score: bool = False):
         if num is None:
             num = self.topk
-        hits = self.searcher.search(query, num)
-        if len(hits) < 1:
-            if return_score:
-                return [], []
+        start = time.perf_counter()
+        all_hits = self._search_hits(query_list, num)
+        searched = time.perf_counter()
+
+        results = []
+        scores = []
+        for hits in all_hits:
+            if len(hits) < 1:
+                results.append([])
+                scores.append([])
+                continue
+            if len(hits) < num:
+                warnings.warn('Not enough documents retrieved!')
             else:
-                return []
-        scores = [hit.score for hit in hits]
-        if len(hits) < num:
-            warnings.warn('Not enough documents retrieved!')
-        else:
-            hits = hits[:num]
-
-        if self.contain_doc:
-            all_contents = [
-                json.loads(self.searcher.doc(hit.docid).raw())['contents'] 
-                for hit in hits
-            ]
-            results = [
-                {
-                    'title': content.split("\n")[0].strip("\""),
-                    'text': "\n".join(content.split("\n")[1:]),
-                    'contents': content
-                } 
-                for content in all_contents
-            ]
-        else:
-            results = load_docs(self.corpus, [hit.docid for hit in hits])
+                hits = hits[:num]
+            scores.append([hit.score for hit in hits])
+            if self.contain_doc:
+                results.append([self._hit_doc(hit) for hit in hits])
+            else:
+                results.append(load_docs(self.corpus, [hit.docid for hit in hits]))
+        self.timings.record(len(query_list), searched - start, time.perf_counter() - searched)
 
         if return_score:
             return results, scores
         else:
             return results
 
+    def stats(self):
+        return {
+            "threads": self.threads,
+            **self.timings.stats(),
+            "doc_cache": self.doc_cache.stats() if self.doc_cache is not None else None,
+        }
+
+class BM25sRetriever(BaseRetriever):
+    """BM25 over a memory-mapped bm25s index (bm25s_index.py): no JVM, starts in seconds"""
+    def __init__(self, config):
+        super().__init__(config)
+        with progress.stage("index"):
+            from bm25s_index import BM25sIndex
+            self.index = BM25sIndex(self.index_path, mmap=True)
+        self.corpus = open_corpus(config)
+        self.threads = config.bm25_threads or os.cpu_count() or 1
+        self.timings = BatchTimings()
+
+    def _search(self, query: str, num: int = None, return_score: bool = False):
+        results, scores = self._batch_search([query], num, True)
+        if return_score:
+            return results[0], scores[0]
+        else:
+            return results[0]
+
     def _batch_search(self, query_list: List[str], num: int = None, return_score: bool = False):
+        if num is None:
+            num = self.topk
+        start = time.perf_counter()
+        batch_idxs, batch_scores = self.index.search(query_list, num, n_threads=min(self.threads, len(query_list)))
+        searched = time.perf_counter()
+
+        # Rows without a matching term are -1; keep only real hits, like the Lucene backend
+        keep = batch_idxs >= 0
+        flat_docs = load_docs(self.corpus, batch_idxs[keep])
         results = []
         scores = []
-        for query in query_list:
-            item_result, item_score = self._search(query, num, True)
-            results.append(item_result)
-            scores.append(item_score)
+        offset = 0
+        for row_keep, row_scores in zip(keep, batch_scores):
+            n_hits = int(row_keep.sum())
+            if 0 < n_hits < num:
+                warnings.warn('Not enough documents retrieved!')
+            results.append(flat_docs[offset:offset + n_hits])
+            scores.append(row_scores[row_keep].tolist())
+            offset += n_hits
+        self.timings.record(len(query_list), searched - start, time.perf_counter() - searched)
+
         if return_score:
             return results, scores
         else:
             return results
 
+    def stats(self):
+        return {"threads": self.threads, **self.timings.stats()}
+
 class DenseRetriever(BaseRetriever):
     def __init__(self, config):
         super().__init__(config)
-        self.index = faiss.read_index(self.index_path)
-        if config.faiss_gpu:
-            co = faiss.GpuMultipleClonerOptions()
-            co.useFloat16 = True
-            co.shard = True
-            self.index = faiss.index_cpu_to_all_gpus(self.index, co=co)
-        print(f"加载索引文件: {args.index_path}")
-
-        self.corpus = load_corpus(self.corpus_path)
-        print(f"加载语料文件: {args.corpus_path}") 
-        self.encoder = Encoder(
-            model_name = self.retrieval_method,
-            model_path = config.retrieval_model_path,
-            pooling_method = config.retrieval_pooling_method,
-            max_length = config.retrieval_query_max_length,
-            use_fp16 = config.retrieval_use_fp16
-        )
+        if config.faiss_threads:
+            faiss.omp_set_num_threads(config.faiss_threads)
+        # Corpus, encoder and index load concurrently; each is mostly file I/O or native code
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="load") as pool:
+            corpus_future = pool.submit(open_corpus, config)
+            encoder_future = pool.submit(self._load_encoder, config)
+            with progress.stage("index"):
+                self.index = load_index(
+                    self.index_path,
+                    use_mmap=config.faiss_mmap and not config.faiss_gpu,
+                    nprobe=config.faiss_nprobe,
+                    ef_search=config.faiss_ef_search,
+                )
+                if config.faiss_gpu:
+                    co = faiss.GpuMultipleClonerOptions()
+                    co.useFloat16 = True
+                    co.shard = True
+                    self.index = faiss.index_cpu_to_all_gpus(self.index, co=co)
+            print(f"加载索引文件: {self.index_path}")
+            self.corpus = corpus_future.result()
+            print(f"加载语料文件: {config.doc_store_path or config.corpus_path}")
+            self.encoder = encoder_future.result()
         self.topk = config.retrieval_topk
         self.batch_size = config.retrieval_batch_size
+        with progress.stage("query_cache"):
+            self.query_cache = QueryCache(
+                embedding_bytes=config.cache_embeddings_mb * 1024 ** 2,
+                result_bytes=config.cache_results_mb * 1024 ** 2,
+                persist_path=config.cache_path,
+                fingerprint=(
+                    self.retrieval_method, config.retrieval_model_path, config.retrieval_pooling_method,
+                    config.retrieval_query_max_length, self.index_path, os.path.getmtime(self.index_path),
+                    config.faiss_nprobe, config.faiss_ef_search, config.encoder_backend,
+                ),
+            )
+
+    def _load_encoder(self, config):
+        with progress.stage("encoder"):
+            encoder = Encoder(
+                model_name = self.retrieval_method,
+                model_path = config.retrieval_model_path,
+                pooling_method = config.retrieval_pooling_method,
+                max_length = config.retrieval_query_max_length,
+                use_fp16 = config.retrieval_use_fp16,
+                device = config.encoder_device,
+                backend = config.encoder_backend,
+                num_threads = config.encoder_threads,
+                compile = config.encoder_compile,
+                bucket_size = config.encoder_bucket_size,
+                onnx_path = config.encoder_onnx_path,
+            )
+            if config.encoder_tolerance is not None:
+                check_tolerance(encoder, config.encoder_tolerance)
+        return encoder
+
+    def _search_ids(self, query_list: List[str], num: int):
+        """Doc ids and scores for query_list, encoding / searching only what the query cache misses"""
+        cache = self.query_cache
+        keys = [normalize_query(query) for query in query_list]
+        idxs = np.full((len(keys), num), -1, dtype=np.int64)
+        scores = np.zeros((len(keys), num), dtype=np.float32)
+
+        to_search = []
+        for i, key in enumerate(keys):
+            hit = cache.get_result(key, num)
+            if hit is None:
+                to_search.append(i)
+            else:
+                idxs[i], scores[i] = hit
+        if not to_search:
+            return idxs, scores
+
+        query_emb = np.empty((len(to_search), self.index.d), dtype=np.float32)
+        to_encode = []
+        for row, i in enumerate(to_search):
+            cached = cache.get_embedding(keys[i])
+            if cached is None:
+                to_encode.append(row)
+            else:
+                query_emb[row] = cached
+        if to_encode:
+            start = time.perf_counter()
+            encoded = self.encoder.encode([keys[to_search[row]] for row in to_encode])
+            cache.record_encode(len(to_encode), time.perf_counter() - start)
+            query_emb[to_encode] = encoded
+            for row, emb in zip(to_encode, encoded):
+                cache.put_embedding(keys[to_search[row]], emb)
+
+        start = time.perf_counter()
+        found_scores, found_idxs = self.index.search(query_emb, k=num)
+        cache.record_search(len(to_search), time.perf_counter() - start)
+        idxs[to_search] = found_idxs
+        scores[to_search] = found_scores
+        for row, i in enumerate(to_search):
+            cache.put_result(keys[i], num, found_idxs[row], found_scores[row])
+        return idxs, scores
 
     def _search(self, query: str, num: int = None, return_score: bool = False):
         if num is None:
             num = self.topk
-        query_emb = self.encoder.encode(query)
-        scores, idxs = self.index.search(query_emb, k=num)
+        idxs, scores = self._search_ids([query], num)
         idxs = idxs[0]
         scores = scores[0]
         results = load_docs(self.corpus, idxs)
@@ -254,16 +424,14 @@ class DenseRetriever(BaseRetriever):
         
         results = []
         scores = []
-        for start_idx in tqdm(range(0, len(query_list), self.batch_size), desc='Retrieval process: '):
+        for start_idx in tqdm(range(0, len(query_list), self.batch_size), desc='Retrieval process: ',
+                              disable=len(query_list) <= self.batch_size):
             query_batch = query_list[start_idx:start_idx + self.batch_size]
-            batch_emb = self.encoder.encode(query_batch)
-            batch_scores, batch_idxs = self.index.search(batch_emb, k=num)
+            batch_idxs, batch_scores = self._search_ids(query_batch, num)
             batch_scores = batch_scores.tolist()
-            batch_idxs = batch_idxs.tolist()
 
-            # load_docs is not vectorized, but is a python list approach
-            flat_idxs = sum(batch_idxs, [])
-            batch_results = load_docs(self.corpus, flat_idxs)
+            # one fetch for the whole (batch x topk) id matrix
+            batch_results = load_docs(self.corpus, batch_idxs.reshape(-1))
             # chunk them back
             batch_results = [batch_results[i*num : (i+1)*num] for i in range(len(batch_idxs))]
             
@@ -277,6 +445,8 @@ class DenseRetriever(BaseRetriever):
 def get_retriever(config):
     if config.retrieval_method == "bm25":
         return BM25Retriever(config)
+    elif config.retrieval_method == "bm25s":
+        return BM25sRetriever(config)
     else:
         return DenseRetriever(config)
 
@@ -296,27 +466,63 @@ class Config:
         retrieval_topk: int = 10,
         index_path: str = "./index/bm25",
         corpus_path: str = "./data/corpus.jsonl",
+        doc_store_path: str = None,
         dataset_path: str = "./data",
         data_split: str = "train",
         faiss_gpu: bool = True,
+        faiss_mmap: bool = False,
+        faiss_nprobe: int = None,
+        faiss_ef_search: int = None,
+        faiss_threads: int = None,
         retrieval_model_path: str = "./model",
         retrieval_pooling_method: str = "mean",
         retrieval_query_max_length: int = 256,
         retrieval_use_fp16: bool = False,
-        retrieval_batch_size: int = 128
+        retrieval_batch_size: int = 128,
+        cache_embeddings_mb: int = 256,
+        cache_results_mb: int = 64,
+        cache_path: str = None,
+        build_snapshot: bool = False,
+        bm25_threads: int = None,
+        bm25_doc_cache_mb: int = 256,
+        encoder_device: str = "cuda",
+        encoder_backend: str = "torch",
+        encoder_threads: int = None,
+        encoder_bucket_size: int = 0,
+        encoder_compile: bool = False,
+        encoder_onnx_path: str = None,
+        encoder_tolerance: float = None
     ):
         self.retrieval_method = retrieval_method
         self.retrieval_topk = retrieval_topk
         self.index_path = index_path
         self.corpus_path = corpus_path
+        self.doc_store_path = doc_store_path
         self.dataset_path = dataset_path
         self.data_split = data_split
         self.faiss_gpu = faiss_gpu
+        self.faiss_mmap = faiss_mmap
+        self.faiss_nprobe = faiss_nprobe
+        self.faiss_ef_search = faiss_ef_search
+        self.faiss_threads = faiss_threads
         self.retrieval_model_path = retrieval_model_path
         self.retrieval_pooling_method = retrieval_pooling_method
         self.retrieval_query_max_length = retrieval_query_max_length
         self.retrieval_use_fp16 = retrieval_use_fp16
         self.retrieval_batch_size = retrieval_batch_size
+        self.cache_embeddings_mb = cache_embeddings_mb
+        self.cache_results_mb = cache_results_mb
+        self.cache_path = cache_path
+        self.build_snapshot = build_snapshot
+        self.bm25_threads = bm25_threads
+        self.bm25_doc_cache_mb = bm25_doc_cache_mb
+        self.encoder_device = encoder_device
+        self.encoder_backend = encoder_backend
+        self.encoder_threads = encoder_threads
+        self.encoder_bucket_size = encoder_bucket_size
+        self.encoder_compile = encoder_compile
+        self.encoder_onnx_path = encoder_onnx_path
+        self.encoder_tolerance = encoder_tolerance
 
 
 class QueryRequest(BaseModel):
@@ -330,23 +536,75 @@ app = FastAPI()
 # 1) Build a config (could also parse from arguments).
 #    In real usage, you'd parse your CLI arguments or environment variables.
 config = Config(
-    retrieval_method = "e5",  # or "dense"
+    retrieval_method = args.retrieval_method,  # "bm25", "bm25s" or the dense encoder name ("e5")
     index_path=args.index_path,
     corpus_path=args.corpus_path,
+    doc_store_path=args.doc_store,
     retrieval_topk=args.topk,
-    faiss_gpu=True,
+    faiss_gpu=not args.faiss_cpu,
+    # Workers share the index through the page cache instead of each holding a copy
+    faiss_mmap=args.index_mmap or args.workers > 1,
+    faiss_nprobe=args.nprobe,
+    faiss_ef_search=args.ef_search,
+    faiss_threads=args.faiss_threads or worker_threads,
     retrieval_model_path=args.retriever_model,
     retrieval_pooling_method="mean",
     retrieval_query_max_length=256,
     retrieval_use_fp16=True,
     retrieval_batch_size=512,
+    cache_embeddings_mb=args.cache_embeddings_mb,
+    cache_results_mb=args.cache_results_mb,
+    cache_path=args.cache_path,
+    build_snapshot=args.build_snapshot,
+    bm25_threads=args.bm25_threads or worker_threads,
+    bm25_doc_cache_mb=args.bm25_doc_cache_mb,
+    encoder_device=args.encoder_device,
+    encoder_backend=args.encoder_backend,
+    encoder_threads=args.encoder_threads or worker_threads,
+    encoder_bucket_size=args.encoder_bucket_size,
+    encoder_compile=args.encoder_compile,
+    encoder_onnx_path=args.encoder_onnx_path,
+    encoder_tolerance=args.encoder_tolerance,
 )
 
-# 2) Instantiate a global retriever so it is loaded once and reused.
-retriever = get_retriever(config)
+# 2) A global retriever, loaded once and reused. It is built in a background thread at
+#    startup so the server listens (and reports progress on /health, /ready) right away.
+retriever = None
+
+
+def load_retriever():
+    global retriever
+    retriever = get_retriever(config)
+
+# 3) Micro-batch concurrent requests into one encode + index search.
+batcher = None
+if args.batch_max_queries > 0:
+    batcher = MicroBatcher(
+        lambda queries, num: retriever.batch_search(query_list=queries, num=num, return_score=True),
+        max_batch_queries=args.batch_max_queries,
+        max_wait_ms=args.batch_max_wait_ms,
+        max_queue_queries=args.batch_max_queue,
+    )
+
+
+@app.on_event("startup")
+async def start_batcher():
+    progress.start(load_retriever)
+    if batcher is not None:
+        batcher.start()
+
+
+@app.on_event("shutdown")
+async def stop_batcher():
+    if batcher is not None:
+        await batcher.stop()
+    query_cache = getattr(retriever, "query_cache", None)
+    if query_cache is not None:
+        query_cache.save()
+
 
 @app.post("/retrieve")
-def retrieve_endpoint(request: QueryRequest):
+async def retrieve_endpoint(request: QueryRequest):
     """
     Endpoint that accepts queries and performs retrieval.
     Input format:
@@ -356,16 +614,22 @@ def retrieve_endpoint(request: QueryRequest):
       "return_scores": true
     }
     """
+    if not progress.ready:
+        raise HTTPException(status_code=503, detail=f"Retriever not ready: {progress.report()['status']}")
     if not request.topk:
         request.topk = config.retrieval_topk  # fallback to default
 
     # Perform batch retrieval
-    results, scores = retriever.batch_search(
-        query_list=request.queries,
-        num=request.topk,
-        return_score=request.return_scores
-    )
-    
+    if batcher is not None:
+        try:
+            results, scores = await batcher.submit(request.queries, request.topk)
+        except QueueFullError as e:
+            raise HTTPException(status_code=503, detail=f"Retrieval queue full: {e}")
+    else:
+        results, scores = await run_in_threadpool(
+            retriever.batch_search, query_list=request.queries, num=request.topk, return_score=True
+        )
+
     # Format response
     resp = []
     for i, single_result in enumerate(results):
@@ -380,7 +644,45 @@ def retrieve_endpoint(request: QueryRequest):
     return {"result": resp}
 
 
+@app.get("/stats")
+def stats_endpoint():
+    """
+    Micro-batching counters (queue depth, batch sizes, flush reasons, wait / search time),
+    query cache hit rates with encode / index search latency, and retriever-specific
+    timings (BM25: per-batch Lucene search / document fetch time)
+    """
+    query_cache = getattr(retriever, "query_cache", None)
+    return {
+        "worker": os.getpid(),
+        "batcher": batcher.stats() if batcher is not None else None,
+        "cache": query_cache.stats() if query_cache is not None else None,
+        "retriever": retriever.stats() if retriever is not None else None,
+    }
+
+
+@app.get("/health")
+def health_endpoint():
+    """
+    Liveness: 200 while loading or ready, 500 once loading failed. Reports every loading
+    stage (corpus, index, encoder, ...) with its state and elapsed seconds
+    """
+    report = progress.report()
+    return JSONResponse(report, status_code=500 if report["status"] == "failed" else 200)
+
+
+@app.get("/ready")
+def ready_endpoint():
+    """Readiness: 200 once the retriever is loaded and /retrieve can serve, 503 before"""
+    report = progress.report()
+    return JSONResponse(report, status_code=200 if report["ready"] else 503)
+
+
 if __name__ == "__main__":
-    # 3) Launch the server. By default, it listens on http://127.0.0.1:5003
+    # 4) Launch the server. By default, it listens on http://127.0.0.1:5003
     print('开始启动服务')
-    uvicorn.run(app, host="0.0.0.0", port=5003)
\ No newline at end of file
+    if args.workers > 1:
+        # Each worker process imports this module with the same arguments and loads the retriever
+        # from the memory-mapped files; the kernel spreads connections to the shared port across them
+        uvicorn.run("retrieval_server:app", host=args.host, port=args.port, workers=args.workers)
+    else:
+        uvicorn.run(app, host=args.host, port=args.port)
\ No newline at end of file
@@ -17,9 +17,14 @@ def test_server_health(base_url: str) -> bool:
     测试服务器是否正常响应
     """
     try:
-        # 尝试访问根路径
-        response = requests.get(base_url, timeout=5)
+        # /health 报告加载进度 (corpus / index / encoder)
+        response = requests.get(f"{base_url}/health", timeout=5)
         print(f"✓ 服务器响应状态码: {response.status_code}")
+        if response.status_code in (200, 500):
+            report = response.json()
+            print(f"  加载状态: {report.get('status')}")
+            for name, stage in report.get('stages', {}).items():
+                print(f"    {name}: {stage['state']} ({stage['seconds'] or 0:.1f}s)")
         return True
     except requests.exceptions.ConnectionError:
         print(f"✗ 无法连接到服务器 {base_url}")
@@ -32,12 +32,15 @@ MAX_TOKENS = 8192
 from Stage_1.tool_prompts import TOOL_GENERATE_USER, TOOL_GENERATE_SYSTEM
 
 
-# Load text vector model and BM25
+# Load text vector model; BM25 statistics are maintained incrementally by the similarity index
 from sentence_transformers import SentenceTransformer
-import bm25s
+from Stage_1.similarity_index import VariantSimilarityIndex
 
 # Model path configuration - update this path to your local model
+# (a small model such as all-MiniLM-L6-v2 is enough on CPU-only machines)
 MODEL_PATH = os.getenv("SENTENCE_TRANSFORMER_MODEL_PATH", "./models/bge-m3")
+# Encoder device: "cpu", "cuda", ... (default: cuda when available)
+SIMILARITY_DEVICE = os.getenv("SIMILARITY_DEVICE", "")
 tokenizer = AutoTokenizer.from_pretrained(MODEL_PATH)
 print("✅ Vector model loaded successfully")
 
@@ -124,14 +127,25 @@ def parse_llm_json_output(llm_output):
 
 # ===================== Similarity Detection =====================
 class AdvancedSimilarityChecker:
-    def __init__(self, model_name):
-        print(f"Loading vector model: {model_name}")
-        self.model = SentenceTransformer(model_name)
+    """
+    Scores a candidate variant against the accepted ones.
+
+    Accepted variants are kept in a VariantSimilarityIndex: each one is encoded
+    once, and BM25 statistics are updated incrementally, so a check only encodes
+    the candidate instead of re-encoding and re-indexing the whole history.
+    """
+    def __init__(self, model_name, device=None, batch_size=64):
         import torch
-        if torch.cuda.is_available():
-            self.model = self.model.cuda()
+        device = device or SIMILARITY_DEVICE or ("cuda" if torch.cuda.is_available() else "cpu")
+        print(f"Loading vector model: {model_name} ({device})")
+        self.model = SentenceTransformer(model_name, device=device)
+        self.index = VariantSimilarityIndex(self.encode, batch_size=batch_size)
+        self._last_candidate = None     # (tool, embedding) of the last checked variant
         print("✅ Vector model loading completed")
 
+    def encode(self, texts):
+        return self.model.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+
     def extract_text(self, tool_json):
         if isinstance(tool_json, dict):
             name = tool_json.get("name", "")
@@ -144,25 +158,29 @@ class AdvancedSimilarityChecker:
         norm = np.linalg.norm(v1) * np.linalg.norm(v2)
         return float(dot / norm) if norm else 0.0
 
+    def sync(self, existing_tools):
+        """Index tools appended to existing_tools since the last call"""
+        if len(existing_tools) < len(self.index):
+            self.index = VariantSimilarityIndex(self.encode, batch_size=self.index.batch_size)
+        pending = existing_tools[len(self.index):]
+        if not pending:
+            return
+        texts = [self.extract_text(t) for t in pending]
+        if self._last_candidate is not None and len(pending) == 1 and pending[0] is self._last_candidate[0]:
+            # The accepted candidate was already encoded during its check
+            self.index.add(texts, embeddings=self._last_candidate[1][None, :])
+        else:
+            self.index.add(texts)
+        self._last_candidate = None
+
     def check_variant_similarity(self, new_tool, existing_tools, cos_th=0.7, bm25_th=0.6):
         if not existing_tools:
             return False, 0, 0, "No historical tools, skip check"
 
-        new_text = self.extract_text(new_tool)
-        texts = [self.extract_text(t) for t in existing_tools]
-        all_texts = [new_text] + texts
-        embs = self.model.encode(all_texts, convert_to_numpy=True)
-        new_emb, old_embs = embs[0], embs[1:]
-        cos_scores = [self.cosine_similarity(new_emb, e) for e in old_embs]
-
-        retriever = bm25s.BM25(corpus=texts)
-        retriever.index(bm25s.tokenize(texts))
-        query_tok = bm25s.tokenize([new_text])
-        _, scores = retriever.retrieve(query_tok, k=len(texts))
-        bm_scores = [s for s in scores[0]]
+        self.sync(existing_tools)
+        avg_cos, avg_bm, new_emb = self.index.score(self.extract_text(new_tool))
+        self._last_candidate = (new_tool, new_emb)
 
-        avg_cos = np.mean(cos_scores)
-        avg_bm = np.mean(bm_scores)
         cos_ok = avg_cos > cos_th
         bm_ok = avg_bm < bm25_th
         if cos_ok and bm_ok:
@@ -248,6 +266,8 @@ async def main():
         print(f"📂 Loaded {len(existing)} variants")
     except FileNotFoundError:
         print("⚠️ File not found, starting from scratch")
+    # Encode the loaded variants once, in batches
+    similarity_checker.sync(existing)
 
     target = 20
     attempt = 0
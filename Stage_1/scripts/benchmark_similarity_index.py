@@ -0,0 +1,111 @@
+# Micro-benchmark: per-check re-encode/re-index vs. the incremental VariantSimilarityIndex
+#
+# Run from the project root:
+#   python -m Stage_1.scripts.benchmark_similarity_index --sizes 1000 5000 10000
+#   python -m Stage_1.scripts.benchmark_similarity_index --model sentence-transformers/all-MiniLM-L6-v2 --device cpu
+#
+# Without --model a hashing bag-of-words encoder stands in for the vector model, which
+# isolates the indexing / scoring cost. When bm25s is installed the incremental BM25
+# means are also checked against a freshly built bm25s index.
+import argparse
+import random
+import time
+import zlib
+
+import numpy as np
+
+from Stage_1.similarity_index import VariantSimilarityIndex
+
+WORDS = (
+    "search query weather forecast city stock price ticker flight hotel booking date "
+    "currency exchange rate translate text language news article topic recipe ingredient "
+    "calendar event reminder email send contact map route distance music song artist "
+    # Stopwords, which bm25s drops: real descriptions are full of them
+    "the a an of to for in on with and or by from is are this that it its"
+).split()
+
+
+def make_tool_texts(rng, n, words=18):
+    return [
+        f"tool_{i}_{rng.choice(WORDS)}: " + " ".join(rng.choice(WORDS) for _ in range(words))
+        for i in range(n)
+    ]
+
+
+def hashing_encoder(dim=384):
+    """Deterministic bag-of-words random projection (no model download needed)"""
+    def encode(texts):
+        out = np.zeros((len(texts), dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in text.lower().split():
+                seed = zlib.crc32(token.encode("utf-8"))
+                out[row] += np.random.default_rng(seed).standard_normal(dim, dtype=np.float32)
+        return out
+    return encode
+
+
+def naive_check(encode, new_text, texts):
+    """The previous check: encode everything and rebuild BM25 on every candidate"""
+    embs = encode([new_text] + texts)
+    new_emb, old_embs = embs[0], embs[1:]
+    norms = np.linalg.norm(old_embs, axis=1) * np.linalg.norm(new_emb)
+    avg_cos = float(np.mean(old_embs @ new_emb / np.where(norms == 0, 1, norms)))
+    avg_bm = None
+    try:
+        import bm25s
+        retriever = bm25s.BM25(corpus=texts)
+        retriever.index(bm25s.tokenize(texts, show_progress=False), show_progress=False)
+        _, scores = retriever.retrieve(bm25s.tokenize([new_text], show_progress=False), k=len(texts), show_progress=False)
+        avg_bm = float(np.mean(scores[0]))
+    except ImportError:
+        pass
+    return avg_cos, avg_bm
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Stage 1 variant similarity checks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 10000], help="Accepted variant counts")
+    parser.add_argument("--checks", type=int, default=20, help="Candidates scored per size")
+    parser.add_argument("--model", default="", help="SentenceTransformer model (default: hashing encoder)")
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--skip-naive", action="store_true", help="Only time the incremental index")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.model:
+        from sentence_transformers import SentenceTransformer
+        model = SentenceTransformer(args.model, device=args.device)
+        encode = lambda texts: model.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+    else:
+        encode = hashing_encoder()
+
+    for size in args.sizes:
+        rng = random.Random(args.seed)
+        texts = make_tool_texts(rng, size)
+        candidates = make_tool_texts(rng, args.checks)
+
+        start = time.perf_counter()
+        index = VariantSimilarityIndex(encode)
+        index.add(texts)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        results = [index.score(text)[:2] for text in candidates]
+        incremental = (time.perf_counter() - start) / args.checks
+
+        line = f"variants={size:<6} build={build:.2f}s incremental={incremental * 1000:.2f}ms/check"
+        if not args.skip_naive:
+            start = time.perf_counter()
+            naive_results = [naive_check(encode, text, texts) for text in candidates]
+            naive = (time.perf_counter() - start) / args.checks
+            line += f" naive={naive * 1000:.2f}ms/check speedup={naive / incremental:.1f}x"
+            cos_diff = max(abs(a[0] - b[0]) for a, b in zip(results, naive_results))
+            line += f" max_cos_diff={cos_diff:.2e}"
+            if naive_results[0][1] is not None:
+                bm_diff = max(abs(a[1] - b[1]) for a, b in zip(results, naive_results))
+                line += f" max_bm25_diff={bm_diff:.2e}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
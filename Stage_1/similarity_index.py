@@ -0,0 +1,141 @@
+import math
+import re
+from collections import Counter
+
+import numpy as np
+from bm25s.stopwords import STOPWORDS_EN
+
+# Same tokenization as bm25s.tokenize defaults (lowercase, English stopwords removed)
+TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+STOPWORDS = frozenset(STOPWORDS_EN)
+
+
+def bm25_tokenize(text):
+    # Empty (or all-stopword) texts give no tokens, as in bm25s: length 0, never matched
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+class IncrementalBM25:
+    """
+    BM25 (Lucene variant, bm25s defaults k1=1.5, b=0.75) over a growing corpus.
+
+    Adding a document only updates its postings, document frequencies and the
+    length statistics; no index is rebuilt. mean_score() returns the mean score
+    of a query over every document, as bm25s.BM25.retrieve(k=len(corpus)) would.
+    """
+    def __init__(self, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings = {}          # token -> ([doc ids], [term frequencies])
+        self.doc_lengths = []
+        self.total_length = 0
+        self._posting_arrays = {}   # token -> (doc id array, tf array), rebuilt lazily
+
+    def __len__(self):
+        return len(self.doc_lengths)
+
+    def add(self, text):
+        doc_id = len(self.doc_lengths)
+        tokens = bm25_tokenize(text)
+        for token, tf in Counter(tokens).items():
+            doc_ids, tfs = self.postings.setdefault(token, ([], []))
+            doc_ids.append(doc_id)
+            tfs.append(tf)
+            self._posting_arrays.pop(token, None)
+        self.doc_lengths.append(len(tokens))
+        self.total_length += len(tokens)
+
+    def _arrays(self, token):
+        arrays = self._posting_arrays.get(token)
+        if arrays is None:
+            doc_ids, tfs = self.postings[token]
+            arrays = (np.asarray(doc_ids, dtype=np.int64), np.asarray(tfs, dtype=np.float32))
+            self._posting_arrays[token] = arrays
+        return arrays
+
+    def mean_score(self, text):
+        n_docs = len(self.doc_lengths)
+        if not n_docs:
+            return 0.0
+        doc_lengths = np.asarray(self.doc_lengths, dtype=np.float32)
+        avg_length = self.total_length / n_docs
+        if not avg_length:
+            return 0.0
+        length_norm = self.k1 * ((1 - self.b) + self.b * doc_lengths / avg_length)
+        total = 0.0
+        for token in bm25_tokenize(text):
+            if token not in self.postings:
+                continue
+            doc_ids, tfs = self._arrays(token)
+            idf = math.log(1 + (n_docs - len(doc_ids) + 0.5) / (len(doc_ids) + 0.5))
+            total += idf * float(np.sum(tfs / (length_norm[doc_ids] + tfs)))
+        return total / n_docs
+
+
+class VariantSimilarityIndex:
+    """
+    Incremental similarity store for accepted tool variants.
+
+    Each variant is encoded once; normalized embeddings live in a preallocated
+    matrix, so cosine scores against all variants are one matrix-vector product.
+    BM25 statistics are updated in place as variants are added.
+    """
+    def __init__(self, encode, batch_size=64):
+        # encode(list_of_texts) -> np.ndarray of shape (n, dim)
+        self.encode = encode
+        self.batch_size = batch_size
+        self.texts = []
+        self.embeddings = None
+        self.bm25 = IncrementalBM25()
+
+    def __len__(self):
+        return len(self.texts)
+
+    @staticmethod
+    def _normalize(vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def embed(self, texts):
+        return self._normalize(self.encode(list(texts)))
+
+    def _append_embeddings(self, vectors):
+        count = len(self.texts)
+        needed = count + len(vectors)
+        if self.embeddings is None:
+            self.embeddings = np.zeros((max(needed, 64), vectors.shape[1]), dtype=np.float32)
+        elif needed > self.embeddings.shape[0]:
+            grown = np.zeros((max(needed, 2 * self.embeddings.shape[0]), self.embeddings.shape[1]), dtype=np.float32)
+            grown[:count] = self.embeddings[:count]
+            self.embeddings = grown
+        self.embeddings[count:needed] = vectors
+
+    def add(self, texts, embeddings=None):
+        """Add texts, encoding them in batches unless precomputed embeddings are given"""
+        texts = list(texts)
+        if not texts:
+            return
+        if embeddings is None:
+            embeddings = np.concatenate([
+                self.embed(texts[i:i + self.batch_size]) for i in range(0, len(texts), self.batch_size)
+            ])
+        else:
+            embeddings = self._normalize(embeddings).reshape(len(texts), -1)
+        self._append_embeddings(embeddings)
+        for text in texts:
+            self.bm25.add(text)
+            self.texts.append(text)
+
+    def score(self, text, embedding=None):
+        """
+        Returns:
+            (mean cosine similarity, mean BM25 score, normalized embedding of text)
+        """
+        if embedding is None:
+            embedding = self.embed([text])[0]
+        if not self.texts:
+            return 0.0, 0.0, embedding
+        cos_scores = self.embeddings[:len(self.texts)] @ embedding
+        return float(cos_scores.mean()), self.bm25.mean_score(text), embedding
@@ -1,3 +1,4 @@
+import argparse
 import json
 from typing import List, Dict, Any, Tuple
 import itertools
@@ -227,16 +228,225 @@ async def process_single_line(generator_label, line_data, generate_count, conten
             else:
                 print(f"💀 Data item {generate_count} failed after {max_retries} retries - ProcessId: {process_id}")
                 # Return original data with error markers
-                line_data["processing_error"] = f"Processing failed: {str(e)}"
-                line_data["reasoning"] = "Processing failed"
-                line_data["tool_select"] = "Processing failed"
-                line_data["route_select"] = "Processing failed"
-                return line_data
+                return mark_failed(line_data, f"Processing failed: {str(e)}", "Processing failed")
+
+def mark_failed(line_data, reason, label):
+    """Attach error markers to a data item that could not be labeled"""
+    line_data["processing_error"] = reason
+    line_data["reasoning"] = label
+    line_data["tool_select"] = label
+    line_data["route_select"] = label
+    return line_data
+
+
+def index_file_for(output_file):
+    """Sidecar index of a streaming output file: one {"line", "offset", "ok"} entry per written result"""
+    return output_file + ".idx"
+
+
+def load_labeled_lines(output_file, index_file):
+    """
+    Read the sidecar index of a previous streaming run.
+
+    Returns:
+        (labeled, entries): line numbers labeled successfully, and every index entry
+        whose output record was fully written.
+    """
+    labeled = set()
+    entries = []
+    if not os.path.exists(index_file) or not os.path.exists(output_file):
+        return labeled, entries
+    output_size = os.path.getsize(output_file)
+    with open(index_file, "r", encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # truncated last entry
+            if entry["offset"] >= output_size:
+                continue
+            entries.append(entry)
+            if entry["ok"]:
+                labeled.add(entry["line"])
+    return labeled, entries
+
+
+def truncate_partial_line(path):
+    """Drop a half-written last record left behind by a crash"""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return
+    with open(path, "rb+") as f:
+        data = f.read()
+        if data.endswith(b"\n"):
+            return
+        f.truncate(data.rfind(b"\n") + 1)
+
+
+def _reorder_paths(output_file, index_file):
+    """(ordered output, ordered index, marker) written by reorder_output before it swaps files in"""
+    return output_file + ".ordered", index_file + ".ordered", output_file + ".reordered"
+
+
+def recover_reorder(output_file, index_file):
+    """
+    Finish or discard a reorder interrupted by a crash.
+
+    The marker is created only once both ordered files are complete, so with the marker
+    the remaining replaces are rolled forward; without it the partial ordered files are
+    dropped and the original (output, index) pair is still consistent.
+    """
+    ordered_file, ordered_index, marker = _reorder_paths(output_file, index_file)
+    if os.path.exists(marker):
+        for src, dst in ((ordered_file, output_file), (ordered_index, index_file)):
+            if os.path.exists(src):
+                os.replace(src, dst)
+        os.remove(marker)
+        print(f"🔁 Completed an interrupted reorder of {output_file}")
+        return
+    for path in (ordered_file, ordered_index):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def reorder_output(output_file, index_file):
+    """Rewrite a streaming output file in input order; the latest result wins for retried lines"""
+    recover_reorder(output_file, index_file)
+    _, entries = load_labeled_lines(output_file, index_file)
+    latest = {}
+    for entry in entries:
+        latest[entry["line"]] = entry
+    ordered_file, ordered_index, marker = _reorder_paths(output_file, index_file)
+    with open(output_file, "rb") as src, open(ordered_file, "wb") as dst, open(ordered_index, "w", encoding='utf-8') as idx:
+        for line_number in sorted(latest):
+            entry = latest[line_number]
+            src.seek(entry["offset"])
+            record = src.readline()
+            idx.write(json.dumps({"line": line_number, "offset": dst.tell(), "ok": entry["ok"]}) + '\n')
+            dst.write(record)
+        for f in (dst, idx):
+            f.flush()
+            os.fsync(f.fileno())
+    # The two replaces are not atomic together; the marker lets recover_reorder finish them
+    with open(marker, "w") as f:
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(ordered_file, output_file)
+    os.replace(ordered_index, index_file)
+    os.remove(marker)
+    print(f"📝 Output reordered by input line: {len(latest)} items in {output_file}")
+
+
+def read_input(input_file, max_lines, residue_file):
+    """
+    Yield (line_data, line_number) for the first max_lines lines (0 = no limit)
+    and stream the remaining lines to residue_file.
+    """
+    residue_count = 0
+    with open(input_file, "r") as f, open(residue_file, "w", encoding='utf-8') as rf:
+        for line_number, line in enumerate(f, 1):
+            try:
+                line_data = json.loads(line)
+            except json.JSONDecodeError as e:
+                print(f"Data item {line_number} JSON parsing failed: {e}")
+                continue
+            if max_lines and line_number > max_lines:
+                rf.write(json.dumps(line_data, ensure_ascii=False) + '\n')
+                residue_count += 1
+            else:
+                yield line_data, line_number
+    print(f"💾 {residue_count} remaining data items saved to: {residue_file}")
+
+
+async def run_streaming(generator_label, input_file, output_file, residue_file, max_lines, concurrency, resume):
+    """
+    Label the input with at most `concurrency` items in flight, appending each result
+    to output_file as soon as it completes. A sidecar index records the input line
+    number and byte offset of every result, so --resume can skip labeled lines and
+    the output is rewritten in input order at the end.
+    """
+    index_file = index_file_for(output_file)
+    labeled = set()
+    if resume:
+        recover_reorder(output_file, index_file)
+        truncate_partial_line(output_file)
+        labeled, _ = load_labeled_lines(output_file, index_file)
+        print(f"🔁 Resuming: {len(labeled)} lines already labeled will be skipped")
+    else:
+        for path in (output_file, index_file, *_reorder_paths(output_file, index_file)):
+            if os.path.exists(path):
+                os.remove(path)
+
+    success_count = 0
+    error_count = 0
+    skipped_count = 0
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks = set()
+
+    with open(output_file, "ab") as out, open(index_file, "a", encoding='utf-8') as idx:
+        def write_result(line_data, line_number, ok):
+            offset = out.tell()
+            out.write((json.dumps(line_data, ensure_ascii=False) + '\n').encode('utf-8'))
+            out.flush()
+            idx.write(json.dumps({"line": line_number, "offset": offset, "ok": ok}) + '\n')
+            idx.flush()
+
+        async def label_one(line_data, line_number):
+            nonlocal success_count, error_count
+            try:
+                result = await process_single_line(generator_label, line_data, line_number)
+            except Exception as e:
+                print(f"❌ Data item {line_number} processing exception: {e}")
+                result = mark_failed(line_data, f"Processing exception: {str(e)}", "Processing exception")
+            finally:
+                semaphore.release()
+            ok = "processing_error" not in result
+            write_result(result, line_number, ok)
+            if ok:
+                success_count += 1
+            else:
+                error_count += 1
+            done = success_count + error_count
+            if done % 100 == 0:
+                print(f"📝 Saved {done} processing results")
+
+        for line_data, line_number in read_input(input_file, max_lines, residue_file):
+            if line_number in labeled:
+                skipped_count += 1
+                continue
+            await semaphore.acquire()
+            task = asyncio.create_task(label_one(line_data, line_number))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    reorder_output(output_file, index_file)
+
+    print(f"\n📊 Processing completion statistics:")
+    print(f"   Skipped (already labeled): {skipped_count}")
+    print(f"   Success count: {success_count}")
+    print(f"   Failure count: {error_count}")
+    print(f"   Concurrency: {concurrency}")
+    print(f"   Processing results saved to: {output_file}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Label tool_select / route_select for multi-hop QA data.")
+    parser.add_argument("--input", default=os.getenv("INPUT_FILE", "Stage_2/original_data/HotpotQA/bridge_hp.jsonl"))
+    parser.add_argument("--output", default=os.getenv("OUTPUT_FILE", "Stage_2/label_data/output.jsonl"))
+    parser.add_argument("--residue", default=os.getenv("RESIDUE_FILE", "Stage_2/label_data/residue.jsonl"))
+    parser.add_argument("--max-lines", type=int, default=5000, help="Only label the first N lines (0 = all); the rest go to the residue file")
+    parser.add_argument("--concurrency", type=int, default=10, help="Number of concurrent API requests")
+    parser.add_argument("--stream", action="store_true", help="Write each result as soon as it completes (with a sidecar .idx file)")
+    parser.add_argument("--resume", action="store_true", help="Streaming mode: skip line numbers already labeled in the output")
+    return parser.parse_args()
+
 
 async def main():
+    args = parse_args()
     # Configuration parameters
-    MAX_LINES = 5000  # Only process first 5000 lines
-    CONCURRENCY = 10  # Concurrency count
+    MAX_LINES = args.max_lines  # Only process the first MAX_LINES lines (0 = all)
+    CONCURRENCY = args.concurrency  # Concurrency count
     
     generator_label = LLMGenerateLabel(
         model=model,
@@ -244,15 +454,17 @@ async def main():
         max_tokens=max_tokens
     )
     
-    # ── Configure these paths before running ──────────────────────────────────
-    input_file   = os.getenv("INPUT_FILE",   "Stage_2/original_data/HotpotQA/bridge_hp.jsonl")
-    output_file  = os.getenv("OUTPUT_FILE",  "Stage_2/label_data/output.jsonl")
-    residue_file = os.getenv("RESIDUE_FILE", "Stage_2/label_data/residue.jsonl")
-    # ──────────────────────────────────────────────────────────────────────────
+    input_file   = args.input
+    output_file  = args.output
+    residue_file = args.residue
 
     # Ensure output directories exist
-    os.makedirs(os.path.dirname(output_file),  exist_ok=True)
-    os.makedirs(os.path.dirname(residue_file), exist_ok=True)
+    os.makedirs(os.path.dirname(output_file) or ".",  exist_ok=True)
+    os.makedirs(os.path.dirname(residue_file) or ".", exist_ok=True)
+
+    if args.stream or args.resume:
+        await run_streaming(generator_label, input_file, output_file, residue_file, MAX_LINES, CONCURRENCY, args.resume)
+        return
 
     # Read data and separate processed and remaining data
     processed_data = []
@@ -266,7 +478,7 @@ async def main():
             try:
                 line_data = json.loads(line)
                 
-                if generate_count <= MAX_LINES:
+                if not MAX_LINES or generate_count <= MAX_LINES:
                     # First MAX_LINES lines for processing
                     processed_data.append((line_data, generate_count))
                 else:
@@ -327,12 +539,7 @@ async def main():
             if isinstance(result, Exception):
                 print(f"❌ Data item {original_count} processing exception: {result}")
                 # Create error result
-                line_data = processed_data[i][0]
-                line_data["processing_error"] = f"Processing exception: {str(result)}"
-                line_data["reasoning"] = "Processing exception"
-                line_data["tool_select"] = "Processing exception"
-                line_data["route_select"] = "Processing exception"
-                processed_line = line_data
+                processed_line = mark_failed(processed_data[i][0], f"Processing exception: {str(result)}", "Processing exception")
                 error_count += 1
             else:
                 processed_line = result
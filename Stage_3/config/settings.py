@@ -15,3 +15,10 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__fil
 
 TOOL_BANK_DIR = os.path.join(BASE_DIR, "Stage_3", "tool_bank", "tools")
 TARGET_GENERAL_FILE = os.path.join(TOOL_BANK_DIR, "general_information_search.jsonl")
+
+# Per-key budgets for the APICaller key pool (0 disables the limit)
+KEY_RPM_LIMIT = int(os.getenv("KEY_RPM_LIMIT", "0"))
+KEY_TPM_LIMIT = int(os.getenv("KEY_TPM_LIMIT", "0"))
+# Jittered exponential backoff applied to a failing key only
+KEY_BACKOFF_BASE = 2
+KEY_BACKOFF_MAX = DEFAULT_RETRY_DELAY
@@ -1,38 +1,43 @@
-import asyncio
-import itertools
 import os
 import re
+import time
 from openai import AsyncOpenAI, APIConnectionError, RateLimitError, APITimeoutError, InternalServerError
 from Stage_3.config.api_keys import API_KEYS
-from Stage_3.config.settings import DEFAULT_MODEL, DEFAULT_RETRY_ATTEMPTS, DEFAULT_RETRY_DELAY
+from Stage_3.config.settings import DEFAULT_MODEL, DEFAULT_RETRY_ATTEMPTS
+from Stage_3.config.settings import KEY_RPM_LIMIT, KEY_TPM_LIMIT, KEY_BACKOFF_BASE, KEY_BACKOFF_MAX
+from Stage_3.core.key_pool import APIKeyPool
+from Stage_3.utils.response_cache import ResponseCache
 
 class APICaller:
     def __init__(
         self,
         model: str = DEFAULT_MODEL,
         retry_attempts_per_key: int = DEFAULT_RETRY_ATTEMPTS,  
-        retry_delay: int = DEFAULT_RETRY_DELAY,
-        max_keys_to_try: int = 20  
+        retry_delay: int = KEY_BACKOFF_MAX,
+        max_keys_to_try: int = 20,
+        rpm_limit: int = KEY_RPM_LIMIT,
+        tpm_limit: int = KEY_TPM_LIMIT,
+        cache: ResponseCache = None
     ):
         self.model = model
         self.retry_attempts_per_key = retry_attempts_per_key
         self.retry_delay = retry_delay
         self.max_keys_to_try = max_keys_to_try or len(API_KEYS)
+        self.cache = cache
         
         # Determine base URL from environment variable (defaults to OpenAI)
         self.is_gpt_model = self._is_gpt_model(model)
         base_url = os.getenv("API_BASE_URL", "https://api.openai.com/v1")
         self.print(f"[APICaller] Model: {model}, using base_url: {base_url}")
 
-        self.api_keys_info = [
-            {
-                "key": key,
-                "client": AsyncOpenAI(api_key=key, base_url=base_url),
-                "count": 0
-            }
-            for key in API_KEYS
-        ]
-        self.client_cycler = itertools.cycle(self.api_keys_info)
+        # retry_delay is now the upper bound of the per-key exponential backoff
+        self.key_pool = APIKeyPool(
+            [(key, AsyncOpenAI(api_key=key, base_url=base_url)) for key in API_KEYS],
+            rpm_limit=rpm_limit,
+            tpm_limit=tpm_limit,
+            backoff_base=KEY_BACKOFF_BASE,
+            backoff_max=retry_delay,
+        )
     
     def _is_gpt_model(self, model: str) -> bool:
         """判断是否为GPT系列模型"""
@@ -46,59 +51,99 @@ class APICaller:
         model_lower = model.lower()
         return any(pattern in model_lower for pattern in gpt_patterns)
     
+    @staticmethod
+    def _estimate_tokens(messages: list, max_tokens: int) -> int:
+        """Rough token estimate (~4 chars per token) used for the per-key TPM budget"""
+        return sum(len(str(message.get("content", ""))) for message in messages) // 4 + max_tokens
+
+    @staticmethod
+    def _retry_after(error) -> float:
+        response = getattr(error, "response", None)
+        try:
+            return float(response.headers.get("retry-after"))
+        except (AttributeError, TypeError, ValueError):
+            return 0.0
+
+    def stats(self) -> list:
+        """Live per-key counters: requests, failures, 429s, RPM/TPM in window, latency, cooldown"""
+        return self.key_pool.stats()
+
     async def generate(self, messages: list, max_tokens: int = 8192, temperature: float = 0.0) -> str:
-        keys_tried = 0
+        """Generate a completion, serving byte-identical requests from the response cache when enabled"""
+        cache_key = None
+        if self.cache:
+            cache_key = ResponseCache.make_key(self.model, messages, temperature, max_tokens)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self.print("[APICaller] Cache hit")
+                return cached
+            if self.cache.offline:
+                self.print("[APICaller] Cache miss in replay mode, skipping API call")
+                return None
+
+        response_txt = await self._generate(messages, max_tokens, temperature)
+        if self.cache:
+            self.cache.put(cache_key, response_txt)
+        return response_txt
+
+    async def _generate(self, messages: list, max_tokens: int, temperature: float) -> str:
+        if not len(self.key_pool):
+            self.print("[APICaller] No API keys configured.")
+            return None
+
         max_keys = min(self.max_keys_to_try, len(API_KEYS))
+        max_attempts = max_keys * self.retry_attempts_per_key
+        estimated_tokens = self._estimate_tokens(messages, max_tokens)
         
-        for key_attempt in range(max_keys):
-            client_wrapper = next(self.client_cycler)
-            client = client_wrapper["client"]
-            keys_tried += 1
-            
-            self.print(f"[APICaller] Trying API key ...{client_wrapper['key'][-4:]} (key {keys_tried}/{max_keys})")
-            
-            for attempt in range(self.retry_attempts_per_key):
-                try:
-                    client_wrapper["count"] += 1
-
-                    response = await client.chat.completions.create(
-                        model=self.model,
-                        messages=messages,
-                        max_tokens=max_tokens,
-                        temperature=temperature,
-                    )
-                    response_txt = response.choices[0].message.content
-                    self.print(f"[APICaller] Success with key ...{client_wrapper['key'][-4:]} on attempt {attempt + 1}")
-                    return response_txt
+        for attempt in range(max_attempts):
+            # Dispatch to the healthiest key right away; only wait if every key is cooling down or over budget
+            key_state, token_event = await self.key_pool.acquire(estimated_tokens)
+            start = time.monotonic()
+            try:
+                response = await key_state.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                )
+                # Read the content before releasing, so a malformed response is released once, as a failure
+                response_txt = response.choices[0].message.content
+                usage = getattr(response, "usage", None)
+                self.key_pool.release(
+                    key_state, token_event, success=True,
+                    latency=time.monotonic() - start,
+                    tokens=getattr(usage, "total_tokens", None),
+                )
+                self.print(f"[APICaller] Success with key {key_state.short_key} on attempt {attempt + 1}")
+                return response_txt
+                
+            except RateLimitError as e:
+                delay = self.key_pool.release(
+                    key_state, token_event, success=False,
+                    latency=time.monotonic() - start,
+                    rate_limited=True, retry_after=self._retry_after(e),
+                )
+                self.print(
+                    f"[APICaller] Key {key_state.short_key} rate limited on attempt {attempt + 1}/{max_attempts}; cooling it down for {delay:.1f}s. Error: {e}"
+                )
+                
+            except (
+                APIConnectionError,
+                APITimeoutError,
+                InternalServerError,
+            ) as e:
+                delay = self.key_pool.release(key_state, token_event, success=False, latency=time.monotonic() - start)
+                self.print(
+                    f"[APICaller] API call for key {key_state.short_key} failed on attempt {attempt + 1}/{max_attempts}; cooling it down for {delay:.1f}s. Error: {e}"
+                )
                     
-                except (
-                    APIConnectionError,
-                    RateLimitError,
-                    APITimeoutError,
-                    InternalServerError,
-                ) as e:
-                    self.print(
-                        f"[APICaller] API call for key ...{client_wrapper['key'][-4:]} failed on attempt {attempt + 1}/{self.retry_attempts_per_key}. Error: {e}"
-                    )
-                    if attempt < self.retry_attempts_per_key - 1:
-                        self.print(f"[APICaller] Retrying same key in {self.retry_delay}s...")
-                        await asyncio.sleep(self.retry_delay)
-                        
-                except Exception as e:
-                    self.print(
-                        f"[APICaller] Unexpected error for key ...{client_wrapper['key'][-4:]} on attempt {attempt + 1}/{self.retry_attempts_per_key}. Error: {e}"
-                    )
-                    if attempt < self.retry_attempts_per_key - 1:
-                        self.print(f"[APICaller] Retrying same key in {self.retry_delay}s...")
-                        await asyncio.sleep(self.retry_delay)
-            
-            self.print(f"[APICaller] Key ...{client_wrapper['key'][-4:]} failed after {self.retry_attempts_per_key} attempts.")
-
-            if key_attempt < max_keys - 1:
-                self.print(f"[APICaller] Switching to next API key in {self.retry_delay}s...")
-                await asyncio.sleep(self.retry_delay)
+            except Exception as e:
+                delay = self.key_pool.release(key_state, token_event, success=False)
+                self.print(
+                    f"[APICaller] Unexpected error for key {key_state.short_key} on attempt {attempt + 1}/{max_attempts}; cooling it down for {delay:.1f}s. Error: {e}"
+                )
         
-        self.print(f"[APICaller] All {keys_tried} API keys failed after {self.retry_attempts_per_key} attempts each.")
+        self.print(f"[APICaller] All {max_attempts} attempts across {max_keys} API keys failed.")
         return None
     def print(self, *args, **kwargs):
         print(*args, **kwargs)
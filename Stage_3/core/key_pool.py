@@ -0,0 +1,157 @@
+import asyncio
+import random
+import time
+from collections import deque
+
+# Sliding window used for requests-per-minute / tokens-per-minute budgets and 429 history
+WINDOW_SECONDS = 60.0
+
+
+class KeyState:
+    """Live usage and health counters for a single API key"""
+    def __init__(self, key, client):
+        self.key = key
+        self.client = client
+        self.count = 0                  # total requests dispatched
+        self.successes = 0
+        self.failures = 0
+        self.rate_limited = 0           # total 429s
+        self.in_flight = 0
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+        self.latency_ewma = None
+        self.request_times = deque()    # dispatch timestamps within the window
+        self.token_events = deque()     # [timestamp, tokens] within the window
+        self.recent_429s = deque()      # 429 timestamps within the window
+
+    @property
+    def short_key(self):
+        return f"...{self.key[-4:]}"
+
+    def prune(self, now):
+        cutoff = now - WINDOW_SECONDS
+        while self.request_times and self.request_times[0] < cutoff:
+            self.request_times.popleft()
+        while self.token_events and self.token_events[0][0] < cutoff:
+            self.token_events.popleft()
+        while self.recent_429s and self.recent_429s[0] < cutoff:
+            self.recent_429s.popleft()
+
+    def tokens_in_window(self):
+        return sum(tokens for _, tokens in self.token_events)
+
+    def snapshot(self):
+        return {
+            "key": self.short_key,
+            "requests": self.count,
+            "successes": self.successes,
+            "failures": self.failures,
+            "rate_limited": self.rate_limited,
+            "in_flight": self.in_flight,
+            "rpm": len(self.request_times),
+            "tpm": self.tokens_in_window(),
+            "recent_429s": len(self.recent_429s),
+            "latency_ewma": round(self.latency_ewma, 3) if self.latency_ewma is not None else None,
+            "cooldown_remaining": round(max(0.0, self.cooldown_until - time.monotonic()), 1),
+        }
+
+
+class APIKeyPool:
+    """
+    Health-aware pool of API keys.
+
+    acquire() hands out the healthiest key that is not cooling down and still has
+    requests-per-minute / tokens-per-minute budget, and only waits when no key is
+    usable. A failing key is put on jittered exponential cooldown on its own, so the
+    other keys keep serving requests in the meantime.
+    """
+    def __init__(self, keys_and_clients, rpm_limit=0, tpm_limit=0, backoff_base=2.0, backoff_max=60.0, latency_alpha=0.2):
+        self.states = [KeyState(key, client) for key, client in keys_and_clients]
+        self.rpm_limit = rpm_limit      # 0 disables the budget
+        self.tpm_limit = tpm_limit
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.latency_alpha = latency_alpha
+
+    def __len__(self):
+        return len(self.states)
+
+    def _ready_at(self, state, estimated_tokens, now):
+        """Earliest time the key can take a request of estimated_tokens"""
+        state.prune(now)
+        ready = state.cooldown_until
+        if self.rpm_limit and len(state.request_times) >= self.rpm_limit:
+            ready = max(ready, state.request_times[0] + WINDOW_SECONDS)
+        if self.tpm_limit and state.token_events and state.tokens_in_window() + estimated_tokens > self.tpm_limit:
+            ready = max(ready, state.token_events[0][0] + WINDOW_SECONDS)
+        return ready
+
+    @staticmethod
+    def _health(state):
+        # Lower is healthier: recent 429s first, then failure streak, load and latency
+        latency = state.latency_ewma if state.latency_ewma is not None else 0.0
+        return (len(state.recent_429s), state.consecutive_failures, state.in_flight, latency)
+
+    async def acquire(self, estimated_tokens=0):
+        """
+        Wait for and reserve the healthiest usable key.
+
+        Returns:
+            (state, token_event): pass both back to release() once the request finishes.
+        """
+        while True:
+            now = time.monotonic()
+            ready_times = {id(state): self._ready_at(state, estimated_tokens, now) for state in self.states}
+            usable = [state for state in self.states if ready_times[id(state)] <= now]
+            if usable:
+                state = min(usable, key=self._health)
+                state.count += 1
+                state.in_flight += 1
+                state.request_times.append(now)
+                token_event = [now, estimated_tokens]
+                state.token_events.append(token_event)
+                return state, token_event
+            wait = min(ready_times.values()) - now
+            await asyncio.sleep(min(max(wait, 0.05), 5.0))
+
+    def release(self, state, token_event, success, latency=None, tokens=None, rate_limited=False, retry_after=None):
+        """
+        Record the outcome of a request dispatched with state.
+
+        Returns:
+            float: cooldown in seconds applied to the key (0 on success).
+        """
+        now = time.monotonic()
+        state.in_flight -= 1
+        if tokens is not None:
+            # Replace the estimate recorded at dispatch with the actual usage
+            token_event[1] = tokens
+        if latency is not None:
+            if state.latency_ewma is None:
+                state.latency_ewma = latency
+            else:
+                state.latency_ewma = self.latency_alpha * latency + (1 - self.latency_alpha) * state.latency_ewma
+
+        if success:
+            state.successes += 1
+            state.consecutive_failures = 0
+            return 0.0
+
+        state.failures += 1
+        state.consecutive_failures += 1
+        if rate_limited:
+            state.rate_limited += 1
+            state.recent_429s.append(now)
+        delay = min(self.backoff_max, self.backoff_base * (2 ** (state.consecutive_failures - 1)))
+        delay *= random.uniform(0.5, 1.5)
+        if retry_after:
+            delay = max(delay, retry_after)
+        state.cooldown_until = max(state.cooldown_until, now + delay)
+        return delay
+
+    def stats(self):
+        """Live per-key counters"""
+        now = time.monotonic()
+        for state in self.states:
+            state.prune(now)
+        return [state.snapshot() for state in self.states]
@@ -14,11 +14,13 @@ from Stage_3.core.mcp_client import MCPCaller
 from Stage_3.services.data_processor import DataProcessor
 from Stage_3.services.tool_manager import ToolManager
 from Stage_3.services.conversation_generator import ConversationGenerator
+from Stage_3.services.run_journal import RunJournal, hash_line
+from Stage_3.utils.response_cache import ResponseCache
 from Stage_3.config.settings import DEFAULT_MODEL, DEFAULT_MAX_TOKENS, DEFAULT_TEMPERATURE
 
 # === Validation-related modules ===
 from Stage_4.config.api_keys import API_KEYS
-from Stage_4.config.settings import API_CONFIG
+from Stage_4.config.settings import API_CONFIG, CACHE_CONFIG
 from Stage_4.core.llm_client import AsyncLLMGenerateLabel
 from Stage_4.validators.validation_engine import ValidationEngine
 from Stage_4.utils.helpers import parse_llm_result
@@ -32,11 +34,18 @@ class IntegratedDataGenerator:
         self.model = model
         self.mcp_api_url = mcp_api_url
         
+        # Opt-in response cache shared by generation and judging (see CACHE_CONFIG)
+        self.response_cache = ResponseCache.from_config(CACHE_CONFIG)
+        
         # Initialize generation components
-        self.api_caller = APICaller(model=model)
+        self.api_caller = APICaller(model=model, cache=self.response_cache)
         self.mcp_client = MCPCaller() if mcp_api_url else None
         self.data_processor = DataProcessor()
         self.tool_manager = ToolManager()
+        self.conversation_generator = ConversationGenerator(
+            call_claude_api=self.call_claude_api,
+            call_llm_api=None
+        )
         
         # Initialize validation components
         self.llm_generator = AsyncLLMGenerateLabel(
@@ -44,7 +53,8 @@ class IntegratedDataGenerator:
             API_CONFIG["url"], 
             API_CONFIG["model"], 
             API_CONFIG["temperature"], 
-            API_CONFIG["max_tokens"]
+            API_CONFIG["max_tokens"],
+            cache=self.response_cache
         )
         self.validation_engine = ValidationEngine()
     
@@ -59,7 +69,7 @@ class IntegratedDataGenerator:
             print(f"Failed to connect to MCP server: {e}")
             self.mcp_client = None
 
-    async def call_claude_api(self, session, model, temperature, max_tokens, messages, system_prompt):
+    async def call_claude_api(self, model, temperature, max_tokens, messages, system_prompt):
         """
         Call the LLM API (supports both Claude and GPT models)
         
@@ -68,7 +78,6 @@ class IntegratedDataGenerator:
         - Claude models (claude-3, claude-sonnet, etc.)
         
         Args:
-            session: aiohttp session (not used, kept for compatibility)
             model: model name (used for detection)
             temperature: temperature parameter
             max_tokens: max tokens to generate
@@ -102,15 +111,16 @@ class IntegratedDataGenerator:
         )
     
     async def generate_multihop_data(self, cases, **kwargs):
-        """Generate multi-hop data"""
-        kwargs['call_claude_api'] = self.call_claude_api
-        kwargs['call_llm_api'] = None
-        
-        generator = ConversationGenerator(**kwargs)
-        return await generator.process(cases)
+        """Generate multi-hop data; kwargs carry the per-sample state"""
+        return await self.conversation_generator.process(cases, **kwargs)
     
-    async def validate_generated_data(self, complete_data, original_data, case_type, session):
-        """Validate generated data and return scoring information"""
+    async def validate_generated_data(self, complete_data, original_data, case_type, session, judge=None):
+        """
+        Validate generated data and return scoring information.
+        
+        Rule validation always runs inline. The LLM judge call goes through the judge
+        coroutine when given (e.g. JudgePool.judge), otherwise straight to the API.
+        """
         try:
             print("1. Start constructing the validation data format...")
             
@@ -169,7 +179,10 @@ class IntegratedDataGenerator:
                 )}
             ]
             
-            llm_result = await self.llm_generator.call_llm_api(session, messages)
+            if judge is not None:
+                llm_result = await judge(messages)
+            else:
+                llm_result = await self.llm_generator.call_llm_api(session, messages)
             
             if llm_result:
                 gpt_score, parse_error = parse_llm_result(llm_result)
@@ -228,6 +241,9 @@ class IntegratedDataGenerator:
         try:
             if self.mcp_client:
                 await self.mcp_client.cleanup()
+            if self.response_cache:
+                print(f"LLM response cache: {self.response_cache.stats()}")
+                self.response_cache.close()
             print("Resources cleaned up successfully")
         except Exception as e:
             print(f"Error during resource cleanup: {e}")
@@ -257,8 +273,20 @@ def save_score_result(score_info, score_output_file):
         return False
 
 
-async def process_and_validate_single_data(data_generator, data_item, config, output_file, score_output_file, line_num, case_type, session):
-    """Process and validate a single data item"""
+async def process_and_validate_single_data(data_generator, data_item, config, output_file, score_output_file, line_num, case_type, session, records=None, judge=None):
+    """
+    Process and validate a single data item.
+    
+    When a records list is given, (output_file, record) entries are appended to it
+    instead of being written, so the caller's writer task can persist them.
+    judge is forwarded to validate_generated_data to route the LLM judge call.
+    """
+    def save(result, path, save_func):
+        if records is None:
+            return save_func(result, path)
+        records.append((path, result))
+        return True
+
     try:
         print(f"\n=== Start processing line {line_num}, target case: {case_type} ===")
         
@@ -323,7 +351,7 @@ async def process_and_validate_single_data(data_generator, data_item, config, ou
         # Step 2: Validate data and get scores
         print("Step 2: Start data validation")
         is_valid, validation_message, score_info = await data_generator.validate_generated_data(
-            complete_data, data_item, case_type, session
+            complete_data, data_item, case_type, session, judge=judge
         )
         
         # Add UUID and generated data to score info
@@ -333,7 +361,7 @@ async def process_and_validate_single_data(data_generator, data_item, config, ou
         
         # Step 3: Save score info (always save)
         if score_info:
-            save_score_result(score_info, score_output_file)
+            save(score_info, score_output_file, save_score_result)
             print(f"Score saved: rule={score_info['rule_score']}, GPT={score_info['gpt_score']}, total={score_info['total_score']}")
         
         if not is_valid:
@@ -342,7 +370,7 @@ async def process_and_validate_single_data(data_generator, data_item, config, ou
         
         # Step 4: Save successfully validated data
         print("Step 4: Save validated data")
-        success = save_validated_result(complete_data, output_file)
+        success = save(complete_data, output_file, save_validated_result)
         
         if success:
             print(f"✅ Line {line_num} processed successfully and saved")
@@ -365,11 +393,304 @@ async def process_and_validate_single_data(data_generator, data_item, config, ou
             "uuid": str(uuid.uuid4()) if 'unique_id' not in locals() else unique_id,
             "data": result[0] if 'result' in locals() and result else None
         }
-        save_score_result(error_score_info, score_output_file)
+        save(error_score_info, score_output_file, save_score_result)
         
         return False, f"Processing exception: {str(e)}"
 
 
+class OrderedResultWriter:
+    """
+    Single writer task for all cases.
+    
+    Jobs submit their records under the sequence number they were scheduled with;
+    records are written in sequence order, so the output files do not depend on
+    which concurrent job happens to finish first. Output files stay open and are
+    flushed and fsynced every flush_every jobs; the journal is written and fsynced
+    only after them, so a journaled success always has its validated record on disk.
+    """
+    def __init__(self, journal=None, flush_every=20):
+        self.queue = asyncio.Queue()
+        self.pending = {}
+        self.next_seq = 0
+        self.journal = journal
+        self.flush_every = flush_every
+        self.handles = {}
+        self.unflushed = 0
+
+    def submit(self, seq, records, journal_entry=None):
+        self.queue.put_nowait((seq, records, journal_entry))
+
+    async def close(self):
+        self.queue.put_nowait(None)
+
+    def _handle(self, path):
+        if path not in self.handles:
+            self.handles[path] = open(path, 'a', encoding='utf-8')
+        return self.handles[path]
+
+    def _write(self, item):
+        records, journal_entry = item
+        for path, record in records:
+            try:
+                self._handle(path).write(json.dumps(record, ensure_ascii=False) + '\n')
+            except Exception as e:
+                print(f"Error saving result to {path}: {e}")
+        if self.journal and journal_entry:
+            self.journal.record(*journal_entry)
+        self.unflushed += 1
+        if self.unflushed >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        for handle in self.handles.values():
+            handle.flush()
+            os.fsync(handle.fileno())
+        if self.journal:
+            self.journal.flush()
+        self.unflushed = 0
+
+    async def run(self):
+        try:
+            while True:
+                item = await self.queue.get()
+                if item is None:
+                    break
+                seq, records, journal_entry = item
+                self.pending[seq] = (records, journal_entry)
+                while self.next_seq in self.pending:
+                    self._write(self.pending.pop(self.next_seq))
+                    self.next_seq += 1
+            # Write whatever is left (e.g. after cancellation) in sequence order
+            for seq in sorted(self.pending):
+                self._write(self.pending.pop(seq))
+        finally:
+            self.flush()
+            for handle in self.handles.values():
+                handle.close()
+
+
+class JudgePool:
+    """
+    LLM-judge stage of the generation pipeline.
+    
+    A fixed number of workers consume judge requests from a queue, so judge
+    latency and concurrency are independent of how many generations are running.
+    """
+    def __init__(self, llm_generator, session, concurrency):
+        self.llm_generator = llm_generator
+        self.session = session
+        self.concurrency = concurrency
+        self.queue = asyncio.Queue()
+        self.workers = []
+        self.busy = 0
+        self.judged = 0
+
+    def start(self):
+        self.workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+
+    async def _worker(self):
+        while True:
+            item = await self.queue.get()
+            if item is None:
+                break
+            messages, future = item
+            if future.cancelled():
+                continue
+            self.busy += 1
+            try:
+                result = await self.llm_generator.call_llm_api(self.session, messages)
+                if not future.done():
+                    future.set_result(result)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                self.busy -= 1
+                self.judged += 1
+
+    async def judge(self, messages):
+        """Queue one judge request and wait for its result"""
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((messages, future))
+        return await future
+
+    def stats(self):
+        return {"queued": self.queue.qsize(), "busy": self.busy, "judged": self.judged}
+
+    async def close(self):
+        for _ in self.workers:
+            self.queue.put_nowait(None)
+        await asyncio.gather(*self.workers, return_exceptions=True)
+
+
+async def run_generation_scheduler(data_generator, lines, cases_config, base_config, session, max_in_flight, journal=None):
+    """
+    Run (line, case) jobs as a generate -> validate pipeline.
+    
+    At most max_in_flight jobs are in the generation stage (generation plus inline
+    rule validation) at once across all cases. Jobs that pass the rules hand off
+    to a JudgePool with its own concurrency (base_config['judge_concurrency']) and
+    free their generation slot, so slow judging does not hold back new generations.
+    A case never has more jobs in the pipeline than it still needs to reach its
+    target_count, so scheduling for a case stops once its quota is met or it runs
+    out of attempts.
+    
+    (line, case) pairs that already succeeded, are still in the pipeline, or were
+    already tried in the current pass are skipped. This state is kept in memory and
+    updated as each job finishes; with a RunJournal it is seeded from previous runs,
+    and the writer only makes the finished jobs durable, in sequence order.
+    
+    Returns:
+        (case_success_counts, case_attempt_counts)
+    """
+    case_success_counts = {case: journal.case_success_counts[case] if journal else 0 for case in cases_config}
+    case_attempt_counts = {case: journal.case_attempt_counts[case] if journal else 0 for case in cases_config}
+    case_in_flight = {case: 0 for case in cases_config}
+    line_cursors = {case: 0 for case in cases_config}
+    line_passes = {case: 0 for case in cases_config}
+    line_hashes = [hash_line(line) for line in lines]
+    max_attempts_per_case = len(lines) * 2
+    succeeded = set(journal.succeeded) if journal else set()           # {(line_hash, case)}
+    pair_attempts = defaultdict(int, journal.attempts if journal else {})  # (line_hash, case) -> finished attempts
+    pairs_in_flight = set()
+
+    if journal:
+        for case in cases_config:
+            if case_attempt_counts[case]:
+                print(f"Resuming {case}: {case_success_counts[case]}/{cases_config[case][0]} validated, {case_attempt_counts[case]} attempts journaled")
+
+    writer = OrderedResultWriter(journal, base_config.get('flush_every', 20))
+    writer_task = asyncio.create_task(writer.run())
+    judge_pool = JudgePool(data_generator.llm_generator, session, base_config.get('judge_concurrency', max_in_flight))
+    judge_pool.start()
+    generation_slots = asyncio.Semaphore(max_in_flight)
+    tasks = set()
+    seq = 0
+
+    def needs_more(case):
+        target_count = cases_config[case][0]
+        return (case_success_counts[case] + case_in_flight[case] < target_count and
+                case_attempt_counts[case] < max_attempts_per_case)
+
+    def is_done(key, passes):
+        """True if the pair succeeded, is in the pipeline, or was attempted in the current pass"""
+        return key in succeeded or key in pairs_in_flight or pair_attempts[key] > passes
+
+    def next_data_item(case):
+        """
+        Advance the case's cursor to the next usable line. Unusable lines count as attempts;
+        lines that are done do not (they were counted when attempted).
+        """
+        skipped = 0
+        while needs_more(case) and skipped <= 2 * len(lines):
+            if line_cursors[case] >= len(lines):
+                line_cursors[case] = 0
+                line_passes[case] += 1
+            index = line_cursors[case]
+            line_cursors[case] += 1
+            if is_done((line_hashes[index], case), line_passes[case]):
+                skipped += 1
+                continue
+            case_attempt_counts[case] += 1
+            line = lines[index].strip()
+            if not line:
+                continue
+            try:
+                data_item = json.loads(line)
+            except Exception as e:
+                print(f"Data processing exception: {e}")
+                continue
+            if 'tool_select' in data_item:
+                return index, data_item
+        return None, None
+
+    async def run_job(job_seq, case, index, data_item, attempt):
+        _, output_path, score_path = cases_config[case]
+        records = []
+        success, message = None, "Cancelled"
+        slot_held = True
+
+        def release_generation_slot():
+            nonlocal slot_held
+            if slot_held:
+                slot_held = False
+                generation_slots.release()
+
+        async def judge(messages):
+            # Generation and rule validation are done: hand the slot to the next generation
+            release_generation_slot()
+            return await judge_pool.judge(messages)
+
+        try:
+            success, message = await process_and_validate_single_data(
+                data_generator, data_item, base_config, output_path, score_path,
+                attempt, case, session, records=records, judge=judge
+            )
+        except Exception as e:
+            success, message = False, f"Data processing exception: {e}"
+        finally:
+            release_generation_slot()
+            case_in_flight[case] -= 1
+            pairs_in_flight.discard((line_hashes[index], case))
+            if success is not None:
+                pair_attempts[(line_hashes[index], case)] += 1
+                if success:
+                    succeeded.add((line_hashes[index], case))
+            # Cancelled jobs leave no journal entry, so they are retried on restart
+            journal_entry = (line_hashes[index], case, success, message) if success is not None else None
+            writer.submit(job_seq, records, journal_entry)
+
+        if success:
+            case_success_counts[case] += 1
+            print(f"🎉 {case} progress: {case_success_counts[case]}/{cases_config[case][0]} (attempts: {case_attempt_counts[case]}, judge: {judge_pool.stats()})")
+        else:
+            print(f"❌ {case} attempt {attempt} failed: {message}")
+        return success, message
+
+    case_order = list(cases_config)
+    rotation = 0
+
+    def next_job():
+        """Pick the next (case, index, data_item) round-robin across cases that still need data"""
+        nonlocal rotation
+        for offset in range(len(case_order)):
+            case = case_order[(rotation + offset) % len(case_order)]
+            index, data_item = next_data_item(case)
+            if data_item is not None:
+                rotation = (rotation + offset + 1) % len(case_order)
+                return case, index, data_item
+        return None
+
+    try:
+        while True:
+            await generation_slots.acquire()
+            job = next_job()
+            if job is None:
+                generation_slots.release()
+                if not tasks:
+                    break
+                # Nothing to schedule until a running job finishes and quotas are updated
+                await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                continue
+            case, index, data_item = job
+            case_in_flight[case] += 1
+            pairs_in_flight.add((line_hashes[index], case))
+            task = asyncio.create_task(run_job(seq, case, index, data_item, case_attempt_counts[case]))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            seq += 1
+    finally:
+        for task in list(tasks):
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        await judge_pool.close()
+        await writer.close()
+        await writer_task
+
+    return case_success_counts, case_attempt_counts
+
+
 async def main():
     """Main function"""
     # Configuration for case C: case_name -> (limit, validated_output_file, score_output_file)
@@ -393,6 +714,10 @@ async def main():
         'virtual_tool_number_max': 8,
         'max_tokens': 8192,
         'temperature': 0.0,
+        'max_in_flight': 16,  # ← concurrent (line, case) generations across all cases
+        'judge_concurrency': 8,  # ← concurrent Stage 4 LLM judge calls
+        'flush_every': 20,    # ← flush output files and the run journal every N finished jobs
+        'journal_file': "output/run_journal.jsonl",  # ← delete to start the run from scratch
         'input_file': "Stage_2/label_data/output.jsonl",  # ← output from Stage 2
     }
     
@@ -422,69 +747,25 @@ async def main():
                 score_file.touch()
                 print(f"Created score file for {case_name}: {score_file}")
         
-        # Count success attempts per case
-        case_success_counts = {case: 0 for case in c_cases_config.keys()}
-        case_attempt_counts = {case: 0 for case in c_cases_config.keys()}
-        
         # Read all raw data
         with open(input_file, 'r', encoding='utf-8') as f:
             lines = f.readlines()
         
         print(f"Total {len(lines)} raw data items read")
         
-        # Generate and validate data for each case
-        async with aiohttp.ClientSession() as session:
-            for case_name, (target_count, output_path, score_path) in c_cases_config.items():
-                print(f"\n{'='*50}")
-                print(f"Start generating data for {case_name}, target count: {target_count}")
-                print(f"{'='*50}")
-                
-                line_index = 0
-                max_attempts_per_case = len(lines) * 2
-                
-                while (case_success_counts[case_name] < target_count and 
-                       case_attempt_counts[case_name] < max_attempts_per_case):
-                    
-                    if line_index >= len(lines):
-                        line_index = 0
-                    
-                    line = lines[line_index].strip()
-                    line_index += 1
-                    case_attempt_counts[case_name] += 1
-                    
-                    if not line:
-                        continue
-                    
-                    try:
-                        data_item = json.loads(line)
-                        
-                        if 'tool_select' not in data_item:
-                            continue
-                        
-                        # Process and validate data
-                        success, message = await process_and_validate_single_data(
-                            data_generator, data_item, base_config, output_path, score_path,
-                            case_attempt_counts[case_name], case_name, session
-                        )
-                        
-                        if success:
-                            case_success_counts[case_name] += 1
-                            print(f"🎉 {case_name} progress: {case_success_counts[case_name]}/{target_count} (attempts: {case_attempt_counts[case_name]})")
-                        else:
-                            print(f"❌ Attempt {case_attempt_counts[case_name]} failed: {message}")
-                        
-                        # Add delay to avoid API limits
-                        await asyncio.sleep(2)
-                        
-                    except Exception as e:
-                        print(f"Data processing exception: {e}")
-                        continue
-                
-                success_rate = (case_success_counts[case_name] / case_attempt_counts[case_name] * 100) if case_attempt_counts[case_name] > 0 else 0
-                print(f"\n{case_name} completed!")
-                print(f"Validated successfully: {case_success_counts[case_name]}/{target_count}")
-                print(f"Total attempts: {case_attempt_counts[case_name]}")
-                print(f"Success rate: {success_rate:.2f}%")
+        # Generate and validate data for all cases concurrently
+        max_in_flight = base_config['max_in_flight']
+        print(f"\n{'='*50}")
+        print(f"Start generating data for {len(c_cases_config)} case(s), max in-flight jobs: {max_in_flight}")
+        print(f"{'='*50}")
+        journal = RunJournal(base_config['journal_file'])
+        try:
+            async with aiohttp.ClientSession() as session:
+                case_success_counts, case_attempt_counts = await run_generation_scheduler(
+                    data_generator, lines, c_cases_config, base_config, session, max_in_flight, journal
+                )
+        finally:
+            journal.close()
         
         # Final summary
         print(f"\n{'='*50}")
@@ -511,6 +792,10 @@ async def main():
         print(f"Total attempts: {total_attempts}")
         print(f"Overall success rate: {overall_success_rate:.2f}%")
         
+        print("\nAPI key usage:")
+        for key_stats in data_generator.api_caller.stats():
+            print(f"  {key_stats}")
+        
     except Exception as e:
         print(f"Main program execution error: {e}")
         import traceback
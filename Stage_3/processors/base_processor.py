@@ -5,13 +5,23 @@ import json
 import random
 import re
 import ast
-import aiohttp
 from Stage_3.utils.text_utils import extract_tags_as_str_list, parse_jsonl_string
-from Stage_3.utils.bm25_utils import BM25Processor
+from Stage_3.utils.bm25_utils import BM25Processor, BM25Index
 from Stage_3.utils.file_utils import FileProcessor
 
 class BaseProcessor(ABC):
     def __init__(self, **kwargs):
+        # Shared across samples: API callbacks (one APICaller per run) and helpers
+        self.call_llm_api = kwargs.get('call_llm_api')
+        self.call_claude_api = kwargs.get('call_claude_api')
+        
+        self.bm25_processor = BM25Processor()
+        self.file_processor = FileProcessor()
+        
+        self.load_sample(**kwargs)
+    
+    def load_sample(self, **kwargs):
+        """Set the per-sample state used by process()"""
         # Basic configs
         self.system_prompt = kwargs.get('system_prompt')
         self.tool_list = kwargs.get('random_all_tools_content') # All tools in tool_prompt except the golden tool
@@ -40,25 +50,37 @@ class BaseProcessor(ABC):
         self.gold_contents = kwargs.get('gold_contents')
         self.all_contents = kwargs.get('all_contents')
         
-        # API calling
-        self.call_llm_api = kwargs.get('call_llm_api')
-        self.call_claude_api = kwargs.get('call_claude_api')
-        
-    
-        self.bm25_processor = BM25Processor()
-        self.file_processor = FileProcessor()
+        # BM25 index over all_contents, built on first retrieval and reused for every tool_call
+        self.bm25_index = None
         
         self.type = kwargs.get('type', self.wheel_type)  
     
+    async def run(self, **sample):
+        """Process one sample on a shallow per-call copy, so concurrent samples never share state"""
+        worker = copy.copy(self)
+        worker.load_sample(**sample)
+        return await worker.process()
     
+
     def extract_tags_as_str_list(self, text, tag, return_as_list=True):
         return extract_tags_as_str_list(text, tag, return_as_list)
     
     def parse_jsonl_string(self, data_string):
         return parse_jsonl_string(data_string)
     
+    def get_bm25_index(self, corpus, language='english'):
+        """Return the cached BM25 index for corpus, rebuilding it only when the corpus changes"""
+        if self.bm25_index is None or self.bm25_index.corpus is not corpus:
+            self.bm25_index = BM25Index(corpus, language, tokenizer=self.bm25_processor.tokenize)
+        return self.bm25_index
+
     def bm25s_function(self, corpus, query, top_k_min, top_k_max, language='english'):
-        return self.bm25_processor.bm25s_function(corpus, query, top_k_min, top_k_max, language)
+        return self.get_bm25_index(corpus, language).retrieve(query, top_k_min, top_k_max)
+
+    def bm25s_batch(self, tool_calls, top_k_min, top_k_max, language='english'):
+        """Retrieve distractor documents from all_contents for every tool_call of one turn"""
+        queries = [json.loads(tool_call)["arguments"]["query"] for tool_call in tool_calls]
+        return self.get_bm25_index(self.all_contents, language).retrieve_batch(queries, top_k_min, top_k_max)
     
     def deduplicate_rag_results(self, nested_list):
 
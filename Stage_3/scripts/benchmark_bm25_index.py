@@ -0,0 +1,70 @@
+# Micro-benchmark: per-call BM25 rebuild vs. the per-sample cached BM25Index
+#
+# Run from the project root:
+#   python -m Stage_3.scripts.benchmark_bm25_index --items 200 --queries 6
+import argparse
+import random
+import time
+
+from Stage_3.utils.bm25_utils import BM25Processor, BM25Index
+from Stage_3.config.settings import RAG_MIN_TOP_K, RAG_MAX_TOP_K
+
+WORDS = (
+    "film director american born novel album river city county team season league "
+    "university war battle king queen church species river album song band actor "
+    "politician company railway station province village mountain island award"
+).split()
+
+
+def make_hotpotqa_context(rng, paragraphs=10, sentences=4, words=25):
+    """Build an all_contents list shaped like one HotpotQA item (10 paragraphs x ~4 sentences)"""
+    contents = []
+    for p in range(paragraphs):
+        title = f"Title {p} {rng.choice(WORDS)}"
+        for s in range(rng.randint(2, sentences + 2)):
+            sentence = " ".join(rng.choice(WORDS) for _ in range(words)) + f" {p}-{s}."
+            contents.append({"title": title, "content": sentence})
+    return contents
+
+
+def make_queries(rng, n):
+    return [" ".join(rng.choice(WORDS) for _ in range(6)) for _ in range(n)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cached BM25 retrieval on HotpotQA-sized contexts")
+    parser.add_argument("--items", type=int, default=200, help="Number of synthetic data items")
+    parser.add_argument("--queries", type=int, default=6, help="tool_call queries per item (C/D cases issue 4-8)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    samples = [(make_hotpotqa_context(rng), make_queries(rng, args.queries)) for _ in range(args.items)]
+    processor = BM25Processor()
+
+    random.seed(args.seed)
+    start = time.perf_counter()
+    baseline = [
+        [processor.bm25s_function(contents, q, RAG_MIN_TOP_K, RAG_MAX_TOP_K) for q in queries]
+        for contents, queries in samples
+    ]
+    baseline_time = time.perf_counter() - start
+
+    random.seed(args.seed)
+    start = time.perf_counter()
+    cached = [
+        BM25Index(contents).retrieve_batch(queries, RAG_MIN_TOP_K, RAG_MAX_TOP_K)
+        for contents, queries in samples
+    ]
+    cached_time = time.perf_counter() - start
+
+    total = args.items * args.queries
+    print(f"Items: {args.items}, queries per item: {args.queries}, docs per item: ~{sum(len(c) for c, _ in samples) // args.items}")
+    print(f"Rebuild per query : {baseline_time:.3f}s ({baseline_time / total * 1000:.2f} ms/query)")
+    print(f"Cached index batch: {cached_time:.3f}s ({cached_time / total * 1000:.2f} ms/query)")
+    print(f"Speedup: {baseline_time / cached_time:.1f}x")
+    print(f"Identical results: {baseline == cached}")
+
+
+if __name__ == "__main__":
+    main()
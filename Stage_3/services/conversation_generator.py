@@ -2,41 +2,54 @@ from Stage_3.processors.case_processors import CaseA1Processor, CaseA2Processor,
 from Stage_3.processors.case_processors import CaseB1Processor, CaseB2Processor, CaseB3Processor, CaseB4Processor, CaseB5Processor, CaseB6Processor 
 from Stage_3.processors.case_processors import CaseC1Processor, CaseC3Processor, CaseC4Processor, CaseC5Processor, CaseC6Processor, CaseC7Processor, CaseC8Processor, CaseC9Processor, CaseC10Processor
 from Stage_3.processors.case_processors import CaseD1Processor, CaseD2Processor, CaseD3Processor, CaseD4Processor, CaseD5Processor, CaseD6Processor, CaseD7Processor, CaseD8Processor, CaseD9Processor, CaseD10Processor
+PROCESSOR_CLASSES = {
+    'case_A1': CaseA1Processor,
+    'case_A2': CaseA2Processor,
+    'case_A3': CaseA3Processor,
+    'case_A4': CaseA4Processor,
+    'case_B1': CaseB1Processor,
+    'case_B2': CaseB2Processor,
+    'case_B3': CaseB3Processor,
+    'case_B4': CaseB4Processor,
+    'case_B5': CaseB5Processor,
+    'case_B6': CaseB6Processor,
+    'case_C1': CaseC1Processor,
+    'case_C3': CaseC3Processor,
+    'case_C4': CaseC4Processor,
+    'case_C5': CaseC5Processor,
+    'case_C6': CaseC6Processor,
+    'case_C7': CaseC7Processor,
+    'case_C8': CaseC8Processor,
+    'case_C9': CaseC9Processor,
+    'case_C10': CaseC10Processor,
+    'case_D1': CaseD1Processor,
+    'case_D2': CaseD2Processor,
+    'case_D3': CaseD3Processor,
+    'case_D4': CaseD4Processor,
+    'case_D5': CaseD5Processor,
+    'case_D6': CaseD6Processor,
+    'case_D7': CaseD7Processor,
+    'case_D8': CaseD8Processor,
+    'case_D9': CaseD9Processor,
+    'case_D10': CaseD10Processor,
+}
+
+
 class ConversationGenerator:
+    """
+    Created once per run with the shared settings (call_claude_api, call_llm_api).
+    Processors are instantiated on first use; per-sample data is passed to process().
+    """
     def __init__(self, **kwargs):
-        self.processors = {
-            'case_A1': CaseA1Processor(**kwargs),
-            'case_A2': CaseA2Processor(**kwargs),
-            'case_A3': CaseA3Processor(**kwargs),
-            'case_A4': CaseA4Processor(**kwargs),
-            'case_B1': CaseB1Processor(**kwargs),
-            'case_B2': CaseB2Processor(**kwargs),
-            'case_B3': CaseB3Processor(**kwargs),
-            'case_B4': CaseB4Processor(**kwargs),
-            'case_B5': CaseB5Processor(**kwargs),
-            'case_B6': CaseB6Processor(**kwargs),
-            'case_C1': CaseC1Processor(**kwargs),
-            'case_C3': CaseC3Processor(**kwargs),
-            'case_C4': CaseC4Processor(**kwargs),
-            'case_C5': CaseC5Processor(**kwargs),
-            'case_C6': CaseC6Processor(**kwargs),
-            'case_C7': CaseC7Processor(**kwargs),
-            'case_C8': CaseC8Processor(**kwargs),
-            'case_C9': CaseC9Processor(**kwargs),
-            'case_C10': CaseC10Processor(**kwargs),
-            'case_D1': CaseD1Processor(**kwargs),
-            'case_D2': CaseD2Processor(**kwargs),
-            'case_D3': CaseD3Processor(**kwargs),
-            'case_D4': CaseD4Processor(**kwargs),
-            'case_D5': CaseD5Processor(**kwargs),
-            'case_D6': CaseD6Processor(**kwargs),
-            'case_D7': CaseD7Processor(**kwargs),
-            'case_D8': CaseD8Processor(**kwargs),
-            'case_D9': CaseD9Processor(**kwargs),
-            'case_D10': CaseD10Processor(**kwargs),
-        }
+        self.shared_kwargs = kwargs
+        self.processors = {}
     
-    async def process(self, processor_case):
-        if processor_case not in self.processors:
+    def get_processor(self, processor_case):
+        if processor_case not in PROCESSOR_CLASSES:
             raise ValueError(f"Unsupported processing type: {processor_case}")
-        return await self.processors[processor_case].process()
\ No newline at end of file
+        if processor_case not in self.processors:
+            self.processors[processor_case] = PROCESSOR_CLASSES[processor_case](**self.shared_kwargs)
+        return self.processors[processor_case]
+    
+    async def process(self, processor_case, **sample):
+        return await self.get_processor(processor_case).run(**sample)
@@ -0,0 +1,77 @@
+# Append-only run journal for resumable Stage 3 runs
+import hashlib
+import json
+import os
+import time
+from collections import defaultdict
+
+
+def hash_line(line):
+    """Stable identifier of an input line"""
+    return hashlib.sha1(line.strip().encode('utf-8')).hexdigest()
+
+
+class RunJournal:
+    """
+    Append-only JSONL record of every finished (input line, case) attempt.
+
+    Each entry stores the line hash, case, success flag and reason. On restart the
+    journal is replayed so that the scheduler can skip completed work (succeeded /
+    attempts) and resume per-case success / attempt counters where the previous run
+    stopped. A truncated last line (crash mid-write) is ignored.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.succeeded = set()                  # {(line_hash, case)}
+        self.attempts = defaultdict(int)        # (line_hash, case) -> attempts
+        self.case_success_counts = defaultdict(int)
+        self.case_attempt_counts = defaultdict(int)
+        self._load()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'a', encoding='utf-8')
+        # Entries reach the file only in flush(), so none is written ahead of the outputs it vouches for
+        self._pending = []
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                self._apply(entry["line_hash"], entry["case"], entry["success"])
+
+    def _apply(self, line_hash, case, success):
+        self.attempts[(line_hash, case)] += 1
+        self.case_attempt_counts[case] += 1
+        if success:
+            self.succeeded.add((line_hash, case))
+            self.case_success_counts[case] += 1
+
+    def record(self, line_hash, case, success, reason=""):
+        """Buffer one journal entry; call flush() to make it durable"""
+        self._apply(line_hash, case, success)
+        entry = {
+            "line_hash": line_hash,
+            "case": case,
+            "success": success,
+            "reason": reason,
+            "time": time.time(),
+        }
+        self._pending.append(json.dumps(entry, ensure_ascii=False) + '\n')
+
+    def flush(self):
+        if self._pending:
+            self._file.write(''.join(self._pending))
+            self._pending.clear()
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
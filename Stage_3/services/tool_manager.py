@@ -23,7 +23,7 @@ class ToolManager:
         with open(user_prompt_file, 'r') as file:
             user_prompt = file.read()
        
-        random_all_tools, good_tool_content, available_general_status, good_general_status, general_tool_name_and_content_from_files, good_tool_mapping = FileProcessor.load_random_tools_excluding_good_tools(tool_bank_file, good_tool)
+        random_all_tools, good_tool_content, available_general_status, good_general_status, general_tool_name_and_content_from_files, good_tool_mapping, _ = FileProcessor.load_random_tools_excluding_good_tools(tool_bank_file, good_tool)
 
         vritual_tool_number = random.randint(vritual_tool_number_min, vritual_tool_number_max)
         if good_general_status == "exist general_file":
@@ -61,6 +61,10 @@ class ToolManager:
         tool_prompt = tool_prompt_new.substitute(recall_tools = simulate_recall_tools)
 
         return new_random_all_tools_except_good_tool, system_prompt, tool_prompt, good_tool_content, user_prompt, general_tool_name_and_content, tool_prompt_general, new_random_all_tools_except_good_tool_general, good_tool_mapping, simulate_recall_tools_json, simulate_recall_tools_general_json
+    def load_tool_definitions(self, tools_dir):
+        """Load tool definitions from the shared in-memory tool bank"""
+        return FileProcessor.load_tool_definitions(tools_dir)
+
     def get_grouped_tool_calls_hybrid(self, messages_data, tools_dir):
        
 
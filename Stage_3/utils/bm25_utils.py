@@ -65,41 +65,66 @@ class BM25Processor:
     def bm25s_function(self, corpus: List[dict], query: str, top_k_min: int, top_k_max: int, language='english') -> List[dict]:
         """
         BM25 retrieval function that supports documents containing metadata.
+        Builds a one-off index; use BM25Index to query the same corpus repeatedly.
         """
-        if language == 'chinese':
-            bm25s.tokenizer = self.tokenize
-        
+        return BM25Index(corpus, language, tokenizer=self.tokenize).retrieve(query, top_k_min, top_k_max)
+
+
+class BM25Index:
+    """
+    Reusable BM25 index over a fixed list of {"title", "content"} documents.
+
+    The corpus is tokenized and indexed once; every retrieve call afterwards only
+    tokenizes the queries. Results (including the random top-k draw) are identical
+    to calling BM25Processor.bm25s_function once per query in the same order.
+    """
+    def __init__(self, corpus: List[dict], language='english', tokenizer=None):
+        if language == 'chinese' and tokenizer is not None:
+            bm25s.tokenizer = tokenizer
+
+        self.corpus = corpus
         # Extract 'content' fields for indexing and build a mapping from content to document
-        content_list = [doc["content"] for doc in corpus]
-        content_to_doc = {doc["content"]: doc for doc in corpus}
-        
-        # Tokenize the content for retrieval
-        corpus_tokens = bm25s.tokenize(content_list)
-        
-        # Initialize the BM25 retriever
-        retriever = bm25s.BM25(corpus=content_list)
-        
-        # Build the inverted index
-        retriever.index(corpus_tokens)
-        
-        # Tokenize the query
-        query_tokens = bm25s.tokenize(query)
-        
+        self.content_list = [doc["content"] for doc in corpus]
+        self.content_to_doc = {doc["content"]: doc for doc in corpus}
+
+        # Tokenize the content and build the inverted index
+        corpus_tokens = bm25s.tokenize(self.content_list)
+        self.retriever = bm25s.BM25(corpus=self.content_list)
+        self.retriever.index(corpus_tokens)
+
+    def _draw_top_k(self, top_k_min: int, top_k_max: int) -> int:
         # Randomly select a number of documents to return within the top-k range
         top_k = random.randint(top_k_min, top_k_max)
-        
-        corpus_size = len(content_list)
-        if top_k > corpus_size:
-            top_k = corpus_size
-        
-        # Retrieve the most relevant documents
-        docs, scores = retriever.retrieve(query_tokens, k=top_k)
-        
+        return min(top_k, len(self.content_list))
+
+    def _to_docs(self, doc_batch) -> List[dict]:
         # Match retrieved contents back to full documents using the mapping
-        retrieved_docs = []
-        for doc_batch in docs:  # 'docs' is a 2D list
-            for doc_content in doc_batch:  # Each element is a document content string
-                if doc_content in content_to_doc:
-                    retrieved_docs.append(content_to_doc[doc_content])
-        
-        return retrieved_docs
+        return [self.content_to_doc[doc_content] for doc_content in doc_batch if doc_content in self.content_to_doc]
+
+    def retrieve(self, query: str, top_k_min: int, top_k_max: int) -> List[dict]:
+        """Retrieve documents for a single query."""
+        return self.retrieve_batch([query], top_k_min, top_k_max)[0]
+
+    def retrieve_batch(self, queries: List[str], top_k_min: int, top_k_max: int) -> List[List[dict]]:
+        """
+        Retrieve documents for several queries at once.
+
+        One top-k is drawn per query, in order, so the random stream matches the
+        per-query path. Queries sharing a top-k are scored in a single retrieve call.
+        """
+        if not queries:
+            return []
+
+        top_ks = [self._draw_top_k(top_k_min, top_k_max) for _ in queries]
+
+        groups = {}
+        for position, top_k in enumerate(top_ks):
+            groups.setdefault(top_k, []).append(position)
+
+        results = [None] * len(queries)
+        for top_k, positions in groups.items():
+            query_tokens = bm25s.tokenize([queries[position] for position in positions], show_progress=False)
+            docs, scores = self.retriever.retrieve(query_tokens, k=top_k, show_progress=False)
+            for position, doc_batch in zip(positions, docs):
+                results[position] = self._to_docs(doc_batch)
+        return results
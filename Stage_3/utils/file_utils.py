@@ -1,80 +1,34 @@
 # 文件处理相关工具
-import json
-import random
 from pathlib import Path
 from Stage_3.config.settings import TARGET_GENERAL_FILE
+from Stage_3.utils.tool_bank import get_tool_bank
 class FileProcessor:
     @staticmethod
     def load_tool_definitions(tools_dir):
         """
         Load all tool definitions from JSONL files in the specified tools directory.
+        Served from the process-wide ToolBank; files are only re-read when modified.
         
         Returns:
             dict: A mapping of {tool_name: tool_definition}.
         """
-        tool_definitions = {}
-        
-        tools_path = Path(tools_dir)
-        if not tools_path.exists():
+        if not Path(tools_dir).exists():
             print(f"Tool directory not found: {tools_dir}")
-            return tool_definitions
-        
-        # Iterate through all JSONL files in the directory
-        for jsonl_file in tools_path.glob("*.jsonl"):
-            try:
-                with open(jsonl_file, 'r', encoding='utf-8') as f:
-                    for line_num, line in enumerate(f, 1):
-                        line = line.strip()
-                        if not line:
-                            continue
-                        
-                        try:
-                            tool_data = json.loads(line)
-                            if 'name' in tool_data:
-                                tool_name = tool_data['name']
-                                tool_definitions[tool_name] = tool_data
-                            else:
-                                print(f"Warning: Missing 'name' field in {jsonl_file.name}, line {line_num}")
-                        
-                        except json.JSONDecodeError as e:
-                            print(f"Warning: Failed to parse JSON in {jsonl_file.name}, line {line_num}: {e}")
-                            continue
-            
-            except Exception as e:
-                print(f"Error reading file {jsonl_file}: {e}")
-        
-        # print(f"Total tools loaded: {len(tool_definitions)}")
-        return tool_definitions
+            return {}
+        return get_tool_bank(tools_dir).definitions()
 
 
     @staticmethod
     def _extract_random_tool_from_file(file_path):
         """Randomly extract a single tool definition from a JSONL file."""
-        try:
-            tools_in_file = []
-            with open(file_path, 'r', encoding='utf-8') as f:
-                for line_num, line in enumerate(f, 1):
-                    line = line.strip()
-                    if line:
-                        try:
-                            tool = json.loads(line)
-                            tools_in_file.append(tool)
-                        except json.JSONDecodeError as e:
-                            print(f"Warning: Failed to parse JSON in {file_path}, line {line_num}: {e}")
-                            continue
-            
-            if tools_in_file:
-                selected_tool = random.choice(tools_in_file)
-                
-                # print(f"Selected tool from {file_path}: {selected_tool.get('name', 'Unknown')}")
-                return selected_tool
-            else:
-                print(f"Warning: {file_path} is empty or contains no valid tools.")
-                return None
-                
-        except Exception as e:
-            print(f"Error: Failed to read {file_path}: {e}")
+        file_path = Path(file_path)
+        if not file_path.is_file():
+            print(f"Error: Failed to read {file_path}: file not found")
             return None
+        selected_tool = get_tool_bank(file_path.parent).sample(file_path.stem)
+        if selected_tool is None:
+            print(f"Warning: {file_path} is empty or contains no valid tools.")
+        return selected_tool
 
     @staticmethod
     def load_random_tools_excluding_good_tools(tool_bank_dir, good_tool_content):
@@ -112,11 +66,9 @@ class FileProcessor:
         # Target general tool file path
         target_general_file = TARGET_GENERAL_FILE
         
-        # Collect all JSONL files
-        all_jsonl_files = []
-        for file_path in Path(tool_bank_dir).glob("*.jsonl"):
-            if file_path.is_file():
-                all_jsonl_files.append(file_path)
+        # Collect all JSONL files from the in-memory tool bank
+        tool_bank = get_tool_bank(tool_bank_dir)
+        all_jsonl_files = [tool_bank.path(stem) for stem in tool_bank.stems()]
         
         if not all_jsonl_files:
             print(f"Warning: No JSONL files found in {tool_bank_dir}")
@@ -163,7 +115,7 @@ class FileProcessor:
         random_tools = []
         if available_files:
             for file_path in available_files:
-                tool = FileProcessor._extract_random_tool_from_file(file_path)
+                tool = tool_bank.sample(file_path.stem)
                 if tool:
                     random_tools.append(tool)
                     # Check if this file is the general tool file
@@ -183,7 +135,7 @@ class FileProcessor:
         
         if good_tool_files:
             for file_path in good_tool_files:
-                tool = FileProcessor._extract_random_tool_from_file(file_path)
+                tool = tool_bank.sample(file_path.stem)
                 if tool:
                     good_tools_list.append(tool)
                     
@@ -0,0 +1,152 @@
+"""Persistent LLM response cache"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+CACHE_MODES = ("off", "readwrite", "readonly", "replay")
+# Hits only refresh last_access in memory; they are written in one statement every this many hits
+ACCESS_FLUSH_EVERY = 256
+
+
+class ResponseCache:
+    """
+    Content-addressed on-disk cache of LLM responses, backed by SQLite.
+
+    Entries are keyed by a hash of (model, messages, temperature, max_tokens) and
+    evicted least-recently-used once the stored text exceeds max_bytes.
+
+    Modes:
+        readwrite: serve hits, store new responses
+        readonly:  serve hits, call the API on misses but never write
+        replay:    serve hits only; misses return None without calling the API
+    """
+
+    def __init__(self, path: str, mode: str = "readwrite", max_bytes: int = 2 * 1024 ** 3):
+        if mode not in CACHE_MODES or mode == "off":
+            raise ValueError(f"Unsupported cache mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._accessed = {}
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, response TEXT NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON responses(last_access)")
+        self._conn.commit()
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional["ResponseCache"]:
+        """Build a cache from a {"path", "mode", "max_bytes"} config, or None when disabled"""
+        mode = config.get("mode", "off")
+        if not config.get("path") or mode == "off":
+            return None
+        return cls(config["path"], mode, config.get("max_bytes", 2 * 1024 ** 3))
+
+    @staticmethod
+    def make_key(model: str, messages: List[Dict[str, Any]], temperature: float, max_tokens: int) -> str:
+        payload = json.dumps(
+            {"model": model, "messages": messages, "temperature": temperature, "max_tokens": max_tokens},
+            sort_keys=True, ensure_ascii=False, separators=(",", ":"),
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @property
+    def writable(self) -> bool:
+        return self.mode == "readwrite"
+
+    @property
+    def offline(self) -> bool:
+        """In replay mode, misses must not reach the network"""
+        return self.mode == "replay"
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            if self.writable:
+                self._accessed[key] = time.time()
+                if len(self._accessed) >= ACCESS_FLUSH_EVERY:
+                    self._flush_access()
+                    self._conn.commit()
+            return row[0]
+
+    def _flush_access(self):
+        """Write the buffered last_access times of cache hits"""
+        if self._accessed:
+            self._conn.executemany(
+                "UPDATE responses SET last_access = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._accessed.items()],
+            )
+            self._accessed.clear()
+
+    def put(self, key: str, response: Optional[str]):
+        """Store a successful response (None / empty responses are never cached)"""
+        if not self.writable or not response:
+            return
+        size = len(response.encode("utf-8"))
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, response, size, time.time()),
+            )
+            self._accessed.pop(key, None)
+            self._total_bytes += size - (old[0] if old else 0)
+            self.writes += 1
+            # Eviction orders by last_access, so buffered hits must be visible first
+            self._flush_access()
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY last_access ASC LIMIT 64"
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                if self._total_bytes <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._total_bytes -= size
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "mode": self.mode,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "bytes": self._total_bytes,
+        }
+
+    def close(self):
+        with self._lock:
+            if self.writable:
+                self._flush_access()
+                self._conn.commit()
+            self._conn.close()
@@ -0,0 +1,118 @@
+# In-memory tool bank shared by the whole process
+import json
+import os
+import random
+import threading
+from pathlib import Path
+
+
+class ToolBank:
+    """
+    Parsed view of a tool_bank directory (one JSONL file per domain).
+
+    Every file is parsed once into a per-file list and a global name index.
+    A file is re-parsed only when its mtime (or size) changes, so repeated
+    lookups cost a few stat calls instead of re-reading every JSONL file.
+    Returned tool dicts are shared between callers and must be treated as read-only.
+    Use get_tool_bank() to obtain the shared, already refreshed instance.
+    """
+    def __init__(self, tools_dir):
+        self.tools_dir = Path(tools_dir)
+        self._files = {}        # file stem -> {"path", "signature", "tools"}
+        self._by_name = {}      # tool name -> tool definition
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _parse_file(file_path):
+        tools = []
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                for line_num, line in enumerate(f, 1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        tools.append(json.loads(line))
+                    except json.JSONDecodeError as e:
+                        print(f"Warning: Failed to parse JSON in {file_path.name}, line {line_num}: {e}")
+        except Exception as e:
+            print(f"Error reading file {file_path}: {e}")
+        return tools
+
+    def refresh(self):
+        """Re-parse new or modified files and drop removed ones"""
+        with self._lock:
+            if not self.tools_dir.exists():
+                if self._files:
+                    self._files, self._by_name = {}, {}
+                return
+
+            changed = False
+            files = {}
+            for file_path in self.tools_dir.glob("*.jsonl"):
+                if not file_path.is_file():
+                    continue
+                stat = file_path.stat()
+                signature = (stat.st_mtime_ns, stat.st_size)
+                entry = self._files.get(file_path.stem)
+                if entry is None or entry["signature"] != signature:
+                    entry = {"path": file_path, "signature": signature, "tools": self._parse_file(file_path)}
+                    changed = True
+                files[file_path.stem] = entry
+
+            if changed or files.keys() != self._files.keys():
+                by_name = {}
+                for entry in files.values():
+                    for line_num, tool in enumerate(entry["tools"], 1):
+                        if 'name' in tool:
+                            by_name[tool['name']] = tool
+                        else:
+                            print(f"Warning: Missing 'name' field in {entry['path'].name}, entry {line_num}")
+                self._by_name = by_name
+            self._files = files
+
+    def stems(self):
+        """File stems (domain names) in directory order"""
+        return list(self._files.keys())
+
+    def path(self, stem):
+        entry = self._files.get(stem)
+        return entry["path"] if entry else None
+
+    def tools(self, stem):
+        """All tools parsed from one domain file"""
+        entry = self._files.get(stem)
+        return entry["tools"] if entry else []
+
+    def sample(self, stem):
+        """Randomly pick one tool from a domain file, or None if the file is missing or empty"""
+        tools = self.tools(stem)
+        return random.choice(tools) if tools else None
+
+    def sample_excluding(self, excluded_stems):
+        """Randomly pick one tool from every domain file whose stem is not excluded"""
+        excluded = set(excluded_stems)
+        return [tool for tool in (self.sample(stem) for stem in self.stems() if stem not in excluded) if tool]
+
+    def get(self, name):
+        """Look up a tool definition by name"""
+        return self._by_name.get(name)
+
+    def definitions(self):
+        """Mapping of {tool_name: tool_definition} across all files"""
+        return self._by_name
+
+
+_TOOL_BANKS = {}
+_TOOL_BANKS_LOCK = threading.Lock()
+
+
+def get_tool_bank(tools_dir):
+    """Return the process-wide ToolBank for tools_dir, refreshed against file mtimes"""
+    key = os.path.abspath(tools_dir)
+    with _TOOL_BANKS_LOCK:
+        bank = _TOOL_BANKS.get(key)
+        if bank is None:
+            bank = _TOOL_BANKS[key] = ToolBank(key)
+    bank.refresh()
+    return bank
@@ -10,6 +10,14 @@ API_CONFIG = {
     "max_tokens": 8192,
 }
 
+# LLM response cache (opt-in), shared by Stage 3 generation and Stage 4 judging
+# mode: off / readwrite / readonly (never writes) / replay (hits only, misses are not sent)
+CACHE_CONFIG = {
+    "path": os.getenv("LLM_CACHE_PATH", "output/cache/llm_responses.sqlite"),
+    "mode": os.getenv("LLM_CACHE_MODE", "off"),
+    "max_bytes": int(os.getenv("LLM_CACHE_MAX_BYTES", str(2 * 1024 ** 3))),
+}
+
 # File path configuration
 FILE_PATHS = {
     "input_file": "The output file obtained at the generate stage",
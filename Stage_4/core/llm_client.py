@@ -5,18 +5,21 @@ import asyncio
 import itertools
 import random
 from typing import List, Dict, Optional
+from Stage_4.utils.response_cache import ResponseCache
 
 
 class AsyncLLMGenerateLabel:
     """Asynchronous LLM label generator"""
     
-    def __init__(self, api_keys: List[str], api_url: str, model: str, temperature: int, max_tokens: int):
+    def __init__(self, api_keys: List[str], api_url: str, model: str, temperature: int, max_tokens: int,
+                 cache: Optional[ResponseCache] = None):
         self.api_keys = api_keys
         self.api_url = api_url
         self.model = model
         self.temperature = temperature
         self.max_tokens = max_tokens
         self.api_key_cycle = itertools.cycle(self.api_keys)
+        self.cache = cache
         
     def get_next_api_key(self) -> str:
         """Retrieve the next API key in rotation"""
@@ -24,7 +27,21 @@ class AsyncLLMGenerateLabel:
     
     async def call_llm_api(self, session: aiohttp.ClientSession, messages: List[Dict[str, str]], 
                           max_retries: int = 5) -> Optional[str]:
-        """Call the LLM API asynchronously"""
+        """Call the LLM API asynchronously, serving byte-identical requests from the cache when enabled"""
+        cache_key = None
+        if self.cache:
+            cache_key = ResponseCache.make_key(self.model, messages, self.temperature, self.max_tokens)
+            cached = self.cache.get(cache_key)
+            if cached is not None or self.cache.offline:
+                return cached
+
+        result = await self._request(session, messages, max_retries)
+        if self.cache:
+            self.cache.put(cache_key, result)
+        return result
+
+    async def _request(self, session: aiohttp.ClientSession, messages: List[Dict[str, str]],
+                       max_retries: int) -> Optional[str]:
         for attempt in range(max_retries):
             try:
                 current_api_key = self.get_next_api_key()